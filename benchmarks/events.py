@@ -0,0 +1,87 @@
+"""
+Compares the throughput of EventManager.publish against the previous linear
+scan over every registered event class.
+
+    python benchmarks/events.py [publishes] [extra event classes]
+"""
+import asyncio
+import sys
+import time
+from typing import Any
+
+from pycord.events import Event, EventManager
+from pycord.state import State
+
+PUBLISHES = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+EXTRA = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+# what a busy bot mostly receives, nearly none of which anything listens to
+DISPATCHES: list[tuple[str, dict[str, Any]]] = [
+    ('TYPING_START', {'channel_id': '2', 'user_id': '3', 'timestamp': 0}),
+    ('PRESENCE_UPDATE', {'user': {'id': '3'}, 'guild_id': '1', 'status': 'online'}),
+    ('MESSAGE_REACTION_ADD', {'channel_id': '2', 'message_id': '4', 'user_id': '3'}),
+    ('CHANNEL_PINS_UPDATE', {'channel_id': '2', 'guild_id': '1'}),
+    ('CUSTOM_0', {}),
+]
+
+
+class LegacyEventManager(EventManager):
+    async def publish(self, event_str: str, data: dict[str, Any]) -> None:
+        items = list(self.events.items())
+
+        for event, funcs in items:
+            if event._name == event_str:
+                eve = event()
+                dispatch = await eve._is_publishable(data, self._state)
+
+                if dispatch is False:
+                    continue
+                else:
+                    await eve._async_load(data, self._state)
+
+                eve._state = self._state
+
+                for func in funcs:
+                    task = asyncio.create_task(func(eve))
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+
+                wait_fors = self.wait_fors.get(event)
+
+                if wait_fors is not None:
+                    for wait_for in wait_fors:
+                        wait_for.set_result(eve)
+                    self.wait_fors.pop(event)
+
+
+async def listener(event: Event) -> None:
+    pass
+
+
+async def run(cls: type[EventManager]) -> None:
+    state = State()
+    base = state.event_manager._base_events
+    manager = state.event_manager = cls(base, state)
+
+    # stand-ins for the event every application command and gear registers
+    for idx in range(EXTRA):
+        event = type(f'Custom{idx}', (Event,), {'_name': f'CUSTOM_{idx}'})
+        manager.add_event(event, listener)
+
+    start = time.perf_counter()
+    for idx in range(PUBLISHES):
+        await manager.publish(*DISPATCHES[idx % len(DISPATCHES)])
+    await manager.drain()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f'{"linear scan" if cls is LegacyEventManager else "dispatch table":>14}: '
+        f'{PUBLISHES / elapsed:>10,.0f} publishes/s, '
+        f'{elapsed / PUBLISHES * 1e6:.2f}us each'
+    )
+
+
+if __name__ == '__main__':
+    print(f'{PUBLISHES} publishes, {len(DISPATCHES)} event names, {EXTRA} extra events')
+    asyncio.run(run(LegacyEventManager))
+    asyncio.run(run(EventManager))
@@ -0,0 +1,101 @@
+"""
+Compares the CPU and event loop overhead of heartbeating many shards
+through one HeartbeatScheduler against the previous task-per-shard approach.
+
+    python benchmarks/heartbeats.py [shards] [seconds]
+"""
+import asyncio
+import sys
+import time
+from random import random
+
+from pycord.gateway.heartbeat import HeartbeatScheduler
+
+SHARDS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+DURATION = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+# scaled down from Discord's ~41.25s so a short run still fires plenty of heartbeats
+INTERVAL = 1.0
+
+
+class FakeShard:
+    def __init__(self, id: int) -> None:
+        self.id = id
+        self._heartbeat_interval = INTERVAL
+        self._awaiting_ack = False
+        self.beats = 0
+
+    async def send_heartbeat(self) -> None:
+        self._awaiting_ack = True
+        self.beats += 1
+        # Discord acknowledges straight away
+        asyncio.get_running_loop().call_soon(setattr, self, '_awaiting_ack', False)
+
+
+class LegacyShard(FakeShard):
+    """The per-shard sleep, future and task churn shards used to do."""
+
+    async def heartbeat(self, jitter: bool = False) -> None:
+        if jitter:
+            await asyncio.sleep(self._heartbeat_interval * random())
+        else:
+            await asyncio.sleep(self._heartbeat_interval)
+        self._hb_received = asyncio.Future()
+        self.beats += 1
+        asyncio.get_running_loop().call_soon(self._hb_received.set_result, None)
+        await asyncio.wait_for(self._hb_received, 5)
+        self._task = asyncio.create_task(self.heartbeat())
+
+
+async def measure_lag(stop: asyncio.Event, lags: list[float]) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(0.01)
+        lags.append(loop.time() - start - 0.01)
+
+
+async def run(legacy: bool) -> None:
+    stop = asyncio.Event()
+    lags: list[float] = []
+    probe = asyncio.create_task(measure_lag(stop, lags))
+
+    if legacy:
+        shards = [LegacyShard(i) for i in range(SHARDS)]
+        for shard in shards:
+            shard._task = asyncio.create_task(shard.heartbeat(jitter=True))
+    else:
+        scheduler = HeartbeatScheduler()
+        shards = [FakeShard(i) for i in range(SHARDS)]
+        for shard in shards:
+            scheduler.add(shard)
+
+    cpu = time.process_time()
+    await asyncio.sleep(DURATION)
+    cpu = time.process_time() - cpu
+    tasks = len(asyncio.all_tasks())
+
+    stop.set()
+    await probe
+
+    if legacy:
+        for shard in shards:
+            shard._task.cancel()
+    else:
+        for shard in shards:
+            scheduler.remove(shard)
+
+    lags.sort()
+    print(
+        f'{"task per shard" if legacy else "timer wheel":>14}: '
+        f'{sum(s.beats for s in shards):>6} heartbeats, '
+        f'{cpu / DURATION * 100:5.1f}% cpu, '
+        f'{tasks:>5} tasks alive, '
+        f'loop lag p50 {lags[len(lags) // 2] * 1000:.2f}ms '
+        f'p99 {lags[int(len(lags) * 0.99)] * 1000:.2f}ms'
+    )
+
+
+if __name__ == '__main__':
+    print(f'{SHARDS} shards, {INTERVAL}s interval, {DURATION}s')
+    asyncio.run(run(legacy=True))
+    asyncio.run(run(legacy=False))
@@ -0,0 +1,186 @@
+"""
+Compares decoding hot gateway payloads into dicts against decoding them
+into msgspec Structs, including building the models from them.
+
+    python benchmarks/payloads.py [iterations] [members per guild]
+"""
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+from pycord.guild import Guild
+from pycord.interaction import Interaction
+from pycord.member import Member
+from pycord.message import Message
+from pycord.state import State
+from pycord.types.structs import decode_payload
+from pycord.utils import loads
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+MEMBERS = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+
+def user(id: int) -> dict:
+    return {
+        'id': str(id),
+        'username': f'user{id}',
+        'discriminator': '0',
+        'global_name': None,
+        'avatar': 'a' * 32,
+        'public_flags': 0,
+    }
+
+
+def member(id: int) -> dict:
+    return {
+        'user': user(id),
+        'nick': None,
+        'avatar': None,
+        'roles': [str(id + 1), str(id + 2)],
+        'joined_at': '2023-01-01T00:00:00.000000+00:00',
+        'premium_since': None,
+        'deaf': False,
+        'mute': False,
+        'flags': 0,
+        'pending': False,
+        'communication_disabled_until': None,
+    }
+
+
+MESSAGE = {
+    'id': '1100000000000000000',
+    'channel_id': '1000000000000000000',
+    'guild_id': '900000000000000000',
+    'author': user(1),
+    'member': {k: v for k, v in member(1).items() if k != 'user'},
+    'content': 'hello ' * 20,
+    'timestamp': '2023-01-01T00:00:00.000000+00:00',
+    'edited_timestamp': None,
+    'tts': False,
+    'mention_everyone': False,
+    'mentions': [user(2), user(3)],
+    'mention_roles': [],
+    'attachments': [],
+    'embeds': [],
+    'pinned': False,
+    'type': 0,
+    'flags': 0,
+    'components': [],
+    'nonce': '1100000000000000000',
+}
+INTERACTION = {
+    'id': '1100000000000000001',
+    'application_id': '800000000000000000',
+    'type': 2,
+    'data': {'id': '700000000000000000', 'name': 'ping', 'type': 1},
+    'guild_id': '900000000000000000',
+    'channel_id': '1000000000000000000',
+    'member': {**member(1), 'permissions': '0'},
+    'token': 't' * 200,
+    'version': 1,
+    'app_permissions': '0',
+    'locale': 'en-US',
+    'guild_locale': 'en-US',
+}
+GUILD = {
+    'id': '900000000000000000',
+    'name': 'guild',
+    'icon': None,
+    'splash': None,
+    'discovery_splash': None,
+    'owner_id': '1',
+    'afk_channel_id': None,
+    'afk_timeout': 300,
+    'verification_level': 0,
+    'default_message_notifications': 0,
+    'explicit_content_filter': 0,
+    'roles': [],
+    'emojis': [],
+    'features': [],
+    'mfa_level': 0,
+    'application_id': None,
+    'system_channel_id': None,
+    'system_channel_flags': 0,
+    'rules_channel_id': None,
+    'vanity_url_code': None,
+    'description': None,
+    'banner': None,
+    'premium_tier': 0,
+    'preferred_locale': 'en-US',
+    'public_updates_channel_id': None,
+    'nsfw_level': 0,
+    'premium_progress_bar_enabled': False,
+    'stickers': [],
+    'members': [member(id) for id in range(MEMBERS)],
+    'channels': [],
+    'threads': [],
+}
+
+
+def frame(t: str, d: dict) -> str:
+    return json.dumps({'op': 0, 's': 1, 't': t, 'd': d})
+
+
+def guild_create(data, state: State) -> None:
+    guild = Guild(data, state)
+    for m in data['members']:
+        Member(m, state, guild_id=guild.id)
+
+
+CASES = [
+    ('MESSAGE_CREATE', frame('MESSAGE_CREATE', MESSAGE), Message, ITERATIONS),
+    (
+        'INTERACTION_CREATE',
+        frame('INTERACTION_CREATE', INTERACTION),
+        Interaction,
+        ITERATIONS,
+    ),
+    (
+        'GUILD_CREATE',
+        frame('GUILD_CREATE', GUILD),
+        guild_create,
+        max(1, ITERATIONS // MEMBERS),
+    ),
+]
+
+
+async def run(name: str, raw: str, build, iterations: int, decode) -> None:
+    state = State()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode(raw)
+    decoded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        build(decode(raw)['d'], state)
+    built = time.perf_counter() - start
+    # messages look their channel up in a task
+    await asyncio.sleep(0)
+
+    tracemalloc.start()
+    payload = decode(raw)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del payload
+
+    print(
+        f'{name:>18} {decode.__name__:>14}: '
+        f'decode {decoded / iterations * 1e6:8.1f}us, '
+        f'decode + model {built / iterations * 1e6:8.1f}us, '
+        f'payload {size / 1024:8.1f} KiB'
+    )
+
+
+async def main() -> None:
+    print(f'{ITERATIONS} iterations, {MEMBERS} members per GUILD_CREATE')
+    for name, raw, build, iterations in CASES:
+        await run(name, raw, build, iterations, loads)
+        await run(name, raw, build, iterations, decode_payload)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
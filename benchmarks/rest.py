@@ -0,0 +1,74 @@
+"""
+Measures how many requests HTTPClient gets through against a local mock of the
+REST API rate limiting like Discord, spread across channels so per channel
+buckets, the global rate limit and, optionally, injected failures all matter.
+
+    python benchmarks/rest.py [requests] [channels] [failure rate]
+"""
+import asyncio
+import sys
+import time
+
+from pycord import HTTPClient
+from pycord.api import RouteMetrics
+from pycord.api.execution import RetryPolicy
+from pycord.testing import FakeREST, Fault
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+CHANNELS = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+FAILURES = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+SEND = 'POST /channels/{channel_id}/messages'
+
+
+async def run(name: str, latency: float) -> None:
+    faults = [Fault(503, probability=FAILURES)] if FAILURES else []
+    rest = FakeREST(latency=latency, faults=faults)
+    channels = [rest.add_channel()['id'] for _ in range(CHANNELS)]
+    metrics = RouteMetrics()
+
+    async with rest:
+        api = HTTPClient(
+            'token',
+            base_url=rest.url,
+            metrics=metrics,
+            retry_policy=RetryPolicy(base=0.05, budget=1),
+        )
+        # the first request per channel learns its bucket, which isn't measured
+        await asyncio.gather(
+            *(api.create_message(channel, content='warm up') for channel in channels)
+        )
+        metrics.reset()
+        before = rest.requests
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                api.create_message(channels[idx % CHANNELS], content=str(idx))
+                for idx in range(REQUESTS)
+            ),
+            return_exceptions=True,
+        )
+        elapsed = time.perf_counter() - start
+        await api.close_session()
+
+    stats = metrics.snapshot()[SEND]
+    latency = stats['latency']
+    print(
+        f'{name:>12}: {stats["requests"] / elapsed:7.1f} req/s, '
+        f'{rest.requests - before} sent for {REQUESTS}, '
+        f"429s {rest.rate_limited}, {stats['retries']} retries, "
+        f'p50 {latency["p50"] * 1000:.1f}ms p99 {latency["p99"] * 1000:.1f}ms'
+    )
+
+
+def main() -> None:
+    print(
+        f'{REQUESTS} messages across {CHANNELS} channels, '
+        f'{FAILURES:.0%} of requests failing'
+    )
+    asyncio.run(run('no latency', 0))
+    asyncio.run(run('50ms latency', 0.05))
+
+
+if __name__ == '__main__':
+    main()
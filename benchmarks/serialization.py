@@ -0,0 +1,147 @@
+"""
+Compares the allocations of the REST and gateway send paths when payloads
+make a round trip through str, as they used to, against passing bytes through.
+
+    python benchmarks/serialization.py [iterations] [kilobytes per payload]
+"""
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+from aiohttp import ClientSession, WSMsgType, web
+
+from pycord import HTTPClient, Route
+from pycord.utils import dumps_bytes
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+SIZE = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+KIB = 1024
+
+PAYLOAD = {
+    'content': 'x' * 2000,
+    'embeds': [
+        {'title': f'embed {idx}', 'description': 'y' * 4000}
+        for idx in range(max(SIZE * KIB // 4096, 1))
+    ],
+}
+
+
+def legacy_dumps(data):
+    return msgspec.json.encode(data).decode('utf-8') if msgspec else json.dumps(data)
+
+
+def legacy_loads(data):
+    return msgspec.json.decode(data.encode()) if msgspec else json.loads(data)
+
+
+async def echo(request: web.Request) -> web.Response:
+    return web.Response(body=await request.read(), content_type='application/json')
+
+
+async def discard(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse(max_msg_size=0)
+    await ws.prepare(request)
+    async for _ in ws:
+        pass
+    return ws
+
+
+async def legacy_rest(url: str):
+    async with ClientSession() as session:
+
+        async def send():
+            async with session.post(
+                f'{url}/channels/1/messages',
+                data=legacy_dumps(PAYLOAD),
+                headers={'Content-Type': 'application/json'},
+            ) as r:
+                # the debug log decoded every response on its own
+                await r.text()
+                return await r.json(loads=legacy_loads)
+
+        yield send
+
+
+async def bytes_rest(url: str):
+    # the global rate limit would otherwise be all that's measured
+    api = HTTPClient('token', base_url=url, global_limit=ITERATIONS * 10)
+    route = Route('/channels/{channel_id}/messages', channel_id=1)
+
+    async def send():
+        return await api.request('POST', route, PAYLOAD)
+
+    yield send
+    await api.close_session()
+
+
+async def legacy_gateway(url: str):
+    async with ClientSession() as session:
+        async with session.ws_connect(f'{url}/gateway') as ws:
+
+            async def send():
+                await ws.send_str(legacy_dumps(PAYLOAD))
+
+            yield send
+
+
+async def bytes_gateway(url: str):
+    async with ClientSession() as session:
+        async with session.ws_connect(f'{url}/gateway') as ws:
+            # what Shard.send does once it's past its rate limiter
+            async def send():
+                await ws.send_frame(dumps_bytes(PAYLOAD), WSMsgType.TEXT)
+
+            yield send
+
+
+async def run(name: str, path) -> None:
+    app = web.Application(client_max_size=0)
+    app.router.add_post('/channels/1/messages', echo)
+    app.router.add_get('/gateway', discard)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    senders = path(f'http://127.0.0.1:{port}')
+    send = await anext(senders)
+    # connections and sessions are set up before anything is measured
+    await send()
+
+    tracemalloc.start()
+    peaks = 0
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        await send()
+        peaks += tracemalloc.get_traced_memory()[1] - current
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    await anext(senders, None)
+    await runner.cleanup()
+    print(
+        f'{name:>15}: peak {peaks / ITERATIONS / KIB:8.1f} KiB per send, '
+        f'{elapsed / ITERATIONS * 1000:.3f}ms'
+    )
+
+
+def main() -> None:
+    print(f'{ITERATIONS} payloads of {len(dumps_bytes(PAYLOAD)) // KIB} KiB')
+    asyncio.run(run('rest (str)', legacy_rest))
+    asyncio.run(run('rest (bytes)', bytes_rest))
+    asyncio.run(run('gateway (str)', legacy_gateway))
+    asyncio.run(run('gateway (bytes)', bytes_gateway))
+
+
+if __name__ == '__main__':
+    main()
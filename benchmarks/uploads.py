@@ -0,0 +1,100 @@
+"""
+Compares the peak memory of uploading large files by reading them into
+memory first, as HTTPClient used to, against streaming them from disk.
+
+    python benchmarks/uploads.py [files] [megabytes per file]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from aiohttp import ClientSession, FormData, web
+
+from pycord import HTTPClient, Route
+from pycord.file import SysFile
+
+FILES = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+SIZE = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+CHUNK = 1024 * 1024
+
+
+async def discard(request: web.Request) -> web.Response:
+    reader = await request.multipart()
+    received = 0
+
+    async for part in reader:
+        while chunk := await part.read_chunk():
+            received += len(chunk)
+
+    return web.json_response({'received': received})
+
+
+async def legacy(url: str, paths: list[str]) -> None:
+    form = FormData(quote_fields=False)
+
+    for idx, path in enumerate(paths):
+        with open(path, 'rb') as f:
+            form.add_field(
+                f'files[{idx}]',
+                f.read(),
+                filename=os.path.basename(path),
+                content_type='application/octet-stream',
+            )
+
+    async with ClientSession() as session:
+        async with session.post(f'{url}/channels/1/messages', data=form) as r:
+            await r.read()
+
+
+async def streaming(url: str, paths: list[str]) -> None:
+    api = HTTPClient('token', base_url=url)
+    await api.request(
+        'POST',
+        Route('/channels/{channel_id}/messages', channel_id=1),
+        {'content': 'uploads'},
+        files=[SysFile(path) for path in paths],
+    )
+    await api.close_session()
+
+
+async def run(name: str, upload, paths: list[str]) -> None:
+    app = web.Application(client_max_size=FILES * SIZE * CHUNK * 2)
+    app.router.add_post('/channels/{channel_id}/messages', discard)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    await upload(f'http://127.0.0.1:{port}', paths)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    await runner.cleanup()
+    print(f'{name:>9}: peak {peak / CHUNK:8.1f} MiB, {elapsed:.2f}s')
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+
+        for idx in range(FILES):
+            path = os.path.join(directory, f'upload-{idx}.bin')
+            with open(path, 'wb') as f:
+                for _ in range(SIZE):
+                    f.write(os.urandom(CHUNK))
+            paths.append(path)
+
+        print(f'{FILES} files of {SIZE} MiB')
+        asyncio.run(run('buffered', legacy, paths))
+        asyncio.run(run('streaming', streaming, paths))
+
+
+if __name__ == '__main__':
+    main()
@@ -6,25 +6,53 @@ Implementation of the Discord API.
 :copyright: 2021-present Pycord Development
 :license: MIT
 """
+import asyncio
 import logging
 import sys
-from typing import Any, Sequence
+from functools import partial
+from itertools import count
+from typing import Any, AsyncIterator, Callable, Iterable, Sequence
 
 from aiohttp import BasicAuth, ClientSession, FormData, __version__ as aiohttp_version
 
 from pycord._about import __version__
 
-from .. import utils
 from ..errors import BotException, Forbidden, HTTPException, InternalError, NotFound
 from ..file import File
-from ..utils import dumps
-from .execution import Executer
+from ..snowflake import Snowflake
+from ..utils import dumps_bytes, loads
+from .broadcast import BroadcastResult, broadcast
+from .cache import RequestCache
+from .coalescer import EditCoalescer
+from .execution import BaseRateLimiter, CircuitBreaker, RateLimiter, RetryPolicy
+from .metrics import MetricsSink, RequestTrace, RouteMetrics
+from .mutations import MutationResult, ReactionQueue, RoleQueue
+from .pool import ConnectionPool
 from .route import BaseRoute, Route
 from .routers import *
 from .routers.scheduled_events import ScheduledEvents
 from .routers.user import Users
 
-__all__: Sequence[str] = ('Route', 'BaseRoute', 'HTTPClient')
+try:
+    from ..types.structs import decode_response
+except ImportError:
+    decode_response = None
+
+__all__: Sequence[str] = (
+    'Route',
+    'BaseRoute',
+    'HTTPClient',
+    'BroadcastResult',
+    'RequestCache',
+    'EditCoalescer',
+    'MutationResult',
+    'ReactionQueue',
+    'RoleQueue',
+    'ConnectionPool',
+    'MetricsSink',
+    'RequestTrace',
+    'RouteMetrics',
+)
 
 _log = logging.getLogger(__name__)
 
@@ -48,6 +76,14 @@ class HTTPClient(
         proxy: str | None = None,
         proxy_auth: BasicAuth | None = None,
         verbose: bool = False,
+        global_limit: int = 50,
+        rate_limiter: BaseRateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        cache: RequestCache | None = None,
+        typed_payloads: bool = False,
+        pool: ConnectionPool | None = None,
+        retry_policy: RetryPolicy | None = None,
+        metrics: MetricsSink | None = None,
     ) -> None:
         self.base_url = base_url
         self._proxy = proxy
@@ -62,25 +98,174 @@ class HTTPClient(
         self.verbose = verbose
 
         self._session: None | ClientSession = None
-        self._executers: list[Executer] = []
+        self._rate_limiter = rate_limiter or RateLimiter(global_limit=global_limit)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.metrics = metrics
+        # called with a RequestTrace before every attempt is sent, and once it's done
+        self.request_hooks: list[Callable[[RequestTrace], Any]] = []
+        self.response_hooks: list[Callable[[RequestTrace], Any]] = []
+        self.cache = cache
+        self.edits = EditCoalescer(self)
+        self.reactions = ReactionQueue(self)
+        self.roles = RoleQueue(self)
+        if typed_payloads and decode_response is None:
+            raise RuntimeError('msgspec must be installed to use typed payloads.')
+        self.typed_payloads = typed_payloads
+        self.pool = pool or ConnectionPool()
+        self._owns_pool = pool is None
 
     async def create_session(self) -> None:
-        self._session = ClientSession()
+        self._session = self.pool.session()
 
     async def close_session(self) -> None:
         await self._session.close()
         self._session = None
+        if self._owns_pool:
+            await self.pool.close()
+
+    async def warm_up(self, connections: int | None = None) -> int:
+        """
+        Opens keep-alive connections to Discord before they're needed,
+        so the first interaction responses don't wait on new connections.
+
+        Parameters
+        ----------
+        connections: :class:`int` | None
+            How many connections to open.
+
+            Defaults to `None`, which opens the pool's ``warm_connections``.
+
+        Returns
+        -------
+        :class:`int`
+            How many connections the pool is keeping open.
+        """
+        if self._session is None:
+            await self.create_session()
+
+        return await self.pool.warm_up(
+            self._session,
+            f'{self.base_url}/gateway',
+            connections,
+            headers={'User-Agent': self._headers['User-Agent']},
+            proxy=self._proxy,
+            proxy_auth=self._proxy_auth,
+        )
+
+    def broadcast(
+        self,
+        channel_ids: Iterable[Snowflake],
+        payload: dict[str, Any],
+        *,
+        concurrency: int | None = None,
+        completed: Iterable[Snowflake] = (),
+    ) -> AsyncIterator[BroadcastResult]:
+        """
+        Sends the same message to many channels, yielding results as they come in.
+
+        Every channel is in its own rate limit bucket, so sends are spread across
+        ``concurrency`` workers paced by the global rate limit, with channels
+        whose buckets are exhausted put off until last. ``payload`` is only
+        serialized once. Failing to send to a channel doesn't stop the broadcast,
+        its :class:`.BroadcastResult` holds the error instead.
+
+        Cancelling the task iterating, or closing the iterator, stops the broadcast.
+        Sends which were in flight may or may not have gone through.
+
+        Parameters
+        ----------
+        channel_ids: Iterable[:class:`.Snowflake`]
+            The channels to send to, each once.
+        payload: dict[:class:`str`, Any]
+            The message to send, as for :meth:`create_message`.
+        concurrency: :class:`int` | None
+            How many sends may be in flight at once.
+
+            Defaults to `None`, which is the rate limiter's ``global_limit``.
+        completed: Iterable[:class:`.Snowflake`]
+            Channels to skip, such as those successfully sent to by a broadcast
+            which was stopped, to resume it.
+
+            Defaults to none.
+        """
+        return broadcast(
+            self,
+            channel_ids,
+            payload,
+            concurrency=concurrency,
+            completed=completed,
+        )
 
     async def request(
         self,
         method: str,
         route: BaseRoute,
-        data: dict[str, Any] | None = None,
+        data: dict[str, Any] | bytes | None = None,
+        files: list[File] | None = None,
+        form: list[dict[str, Any]] | None = None,
+        *,
+        reason: str | None = None,
+        query_params: dict[str, str] | None = None,
+        priority: int = 0,
+        deadline: float | None = None,
+    ) -> REQUEST_RETURN:
+        """
+        Makes a request to the Discord API.
+
+        Parameters
+        ----------
+        data: dict[:class:`str`, Any] | :class:`bytes` | None
+            The JSON body of the request, or the body already serialized to JSON.
+
+            Defaults to `None`.
+        priority: :class:`int`
+            Requests with a higher priority go first when waiting on rate limits,
+            and are shed last, see :class:`.CircuitBreaker`. Interaction responses
+            use :data:`.INTERACTION_PRIORITY`.
+
+            Defaults to 0.
+        deadline: :class:`float` | None
+            The :meth:`loop.time() <asyncio.loop.time>` by which the request must
+            have been sent, after which :exc:`.DeadlineExceeded` is raised instead.
+
+            Defaults to `None`.
+        """
+        request = partial(
+            self._request,
+            method,
+            route,
+            data,
+            files,
+            form,
+            reason=reason,
+            query_params=query_params,
+            priority=priority,
+            deadline=deadline,
+        )
+
+        if self.cache is None:
+            return await request()
+        elif method == 'GET':
+            return await self.cache.fetch(route, query_params, request)
+
+        ret = await request()
+        # whatever was changed might be cached
+        self.cache.invalidate_route(route)
+        return ret
+
+    async def _request(
+        self,
+        method: str,
+        route: BaseRoute,
+        data: dict[str, Any] | bytes | None = None,
         files: list[File] | None = None,
         form: list[dict[str, Any]] | None = None,
         *,
         reason: str | None = None,
         query_params: dict[str, str] | None = None,
+        priority: int = 0,
+        deadline: float | None = None,
     ) -> REQUEST_RETURN:
         endpoint = route.merge(self.base_url)
 
@@ -92,83 +277,183 @@ class HTTPClient(
         if reason:
             headers['X-Audit-Log-Reason'] = reason
 
-        if data:
-            data: str = dumps(data=data)
-            headers.update({'Content-Type': 'application/json'})
-
-        if form and data:
-            form.append({'name': 'payload_json', 'value': data})
+        body: bytes | FormData | None = None
 
-        if files:
-            if not form:
-                form = []
+        if isinstance(data, bytes):
+            # already serialized, such as by broadcast
+            body = data
+        elif data:
+            body = dumps_bytes(data)
 
-            for idx, file in enumerate(files):
+        multipart = bool(form or files)
+        if multipart:
+            form = list(form or [])
+            if body:
                 form.append(
                     {
-                        'name': f'files[{idx}]',
-                        'value': file.file.read(),
-                        'filename': file.filename,
-                        'content_type': 'application/octet-stream',
+                        'name': 'payload_json',
+                        # aiohttp turns bytes fields into files
+                        'value': body.decode('utf-8'),
+                        'content_type': 'application/json',
                     }
                 )
 
-        _log.debug(f'Requesting to {endpoint} with {data}, {headers}')
+            for file in files or []:
+                await file.open()
+        elif body:
+            headers.update({'Content-Type': 'application/json'})
+
+        _log.debug('Requesting to %s with %s, %s', endpoint, body, headers)
+        self.retry_policy.started()
+        loop = asyncio.get_running_loop()
+        tracing = bool(
+            self.metrics is not None or self.request_hooks or self.response_hooks
+        )
 
-        for executer in self._executers:
-            if executer.is_global or executer.route == route:
-                _log.debug(f'Pausing request to {endpoint}: Found rate limit executer')
-                await executer.wait()
+        for try_ in count():
+            if multipart:
+                # a FormData can only be sent once
+                body = FormData(quote_fields=False)
+                for params in form:
+                    body.add_field(**params)
 
-        for try_ in range(5):
-            if files:
-                for file in files:
+                # files are streamed into the body while it's being sent,
+                # from where they were before the first attempt
+                for idx, file in enumerate(files or []):
                     file.reset(try_)
+                    body.add_field(
+                        f'files[{idx}]',
+                        file.file,
+                        filename=file.filename,
+                        content_type='application/octet-stream',
+                    )
 
-            if form:
-                data = FormData(quote_fields=False)
-                for params in form:
-                    data.add_field(**params)
-
-            r = await self._session.request(
-                method,
-                endpoint,
-                data=data,
-                headers=headers,
-                proxy=self._proxy,
-                proxy_auth=self._proxy_auth,
-                params=query_params,
+            self.circuit_breaker.check(method, route, priority)
+            queued_at = loop.time()
+            try:
+                bucket = await self._rate_limiter.acquire(
+                    method, route, priority, deadline
+                )
+            except BaseException:
+                self.circuit_breaker.release(method, route)
+                raise
+
+            if tracing:
+                sent_at = loop.time()
+                trace = RequestTrace(
+                    method,
+                    route,
+                    try_,
+                    queued=sent_at - queued_at,
+                    sent=len(body) if isinstance(body, bytes) else None,
+                )
+                self._trace(self.request_hooks, trace)
+
+            r = None
+            try:
+                r = await self._session.request(
+                    method,
+                    endpoint,
+                    data=body,
+                    headers=headers,
+                    proxy=self._proxy,
+                    proxy_auth=self._proxy_auth,
+                    params=query_params,
+                )
+                self._rate_limiter.update(method, route, bucket, r.headers)
+                # the body is decoded exactly once, straight from bytes,
+                # and it can still be cut off after the headers arrived
+                raw = await r.read()
+            except BaseException as exc:
+                if r is None:
+                    bucket.cancel()
+                self.circuit_breaker.release(method, route)
+                if tracing:
+                    trace.latency = loop.time() - sent_at
+                    trace.error = exc
+                    self._traced(trace)
+
+                delay = self.retry_policy.retry(method, route, try_, exc)
+
+                if delay is None or (
+                    deadline is not None and loop.time() + delay > deadline
+                ):
+                    raise
+
+                _log.debug(f'Request to {endpoint} failed with {exc!r}, retrying')
+                await asyncio.sleep(delay)
+                continue
+
+            _log.debug('Received back %s', raw)
+
+            if r.content_type != 'application/json':
+                data = raw.decode('utf-8')
+            elif self.typed_payloads and r.ok:
+                data = decode_response(method, route.path, raw)
+            else:
+                data = loads(raw)
+            self.circuit_breaker.record(
+                method, route, r.status, r.headers.get('X-RateLimit-Scope')
             )
-            _log.debug(f'Received back {await r.text()}')
 
-            data = await utils._text_or_json(cr=r)
+            if tracing:
+                trace.latency = loop.time() - sent_at
+                trace.status = r.status
+                trace.scope = r.headers.get('X-RateLimit-Scope')
+                trace.bucket = r.headers.get('X-RateLimit-Bucket')
+                trace.received = len(raw)
+                self._traced(trace)
 
             if r.status == 429:
                 _log.debug(f'Request to {endpoint} failed: Request returned rate limit')
-                executer = Executer(route=route)
-
-                self._executers.append(executer)
-                await executer.executed(
-                    reset_after=data['retry_after'],
-                    is_global=r.headers.get('X-RateLimit-Scope') == 'global',
-                    limit=int(r.headers.get('X-RateLimit-Limit', 10)),
+                retry_after = (
+                    data['retry_after']
+                    if isinstance(data, dict)
+                    else float(r.headers.get('Retry-After', 1))
                 )
-                self._executers.remove(executer)
+                self._rate_limiter.rate_limited(
+                    method,
+                    route,
+                    bucket,
+                    retry_after,
+                    r.headers.get('X-RateLimit-Scope'),
+                )
+            elif r.ok:
+                return data
+
+            delay = self.retry_policy.retry(method, route, try_, r.status)
+            if delay is not None and (
+                deadline is None or loop.time() + delay <= deadline
+            ):
+                _log.debug(f'Request to {endpoint} failed with {r.status}, retrying')
+                await asyncio.sleep(delay)
                 continue
 
-            elif r.status == 403:
+            if r.status == 403:
                 raise Forbidden(resp=r, data=data)
             elif r.status == 404:
                 raise NotFound(resp=r, data=data)
-            elif r.status == 500:
+            elif r.status >= 500:
                 raise InternalError(resp=r, data=data)
-            elif r.ok:
-                return data
+            elif self.verbose:
+                raise BotException(r, data)
             else:
-                if self.verbose:
-                    raise BotException(r, data)
-                else:
-                    raise HTTPException(resp=r, data=data)
+                raise HTTPException(resp=r, data=data)
+
+    def _trace(
+        self, hooks: Sequence[Callable[[RequestTrace], Any]], trace: RequestTrace
+    ) -> None:
+        for hook in hooks:
+            try:
+                hook(trace)
+            except Exception:
+                # tracing must never fail the request itself
+                _log.exception(f'request hook {hook!r} failed')
+
+    def _traced(self, trace: RequestTrace) -> None:
+        self._trace(self.response_hooks, trace)
+        if self.metrics is not None:
+            self._trace((self.metrics.record,), trace)
 
     async def get_gateway_bot(self) -> dict[str, Any]:
         return await self.request('GET', Route('/gateway/bot'))
@@ -0,0 +1,162 @@
+# cython: language_level=3
+# Copyright (c) 2022-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import aclosing
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Sequence,
+    TypeVar,
+)
+
+from ..utils import dumps_bytes
+from .execution import BACKGROUND_PRIORITY, RateLimiter
+from .route import Route
+
+if TYPE_CHECKING:
+    from ..snowflake import Snowflake
+    from . import HTTPClient
+
+__all__: Sequence[str] = ('BroadcastResult',)
+
+T = TypeVar('T')
+
+
+class BroadcastResult:
+    """
+    The outcome of sending a broadcast to one channel.
+
+    Attributes
+    ----------
+    channel_id: :class:`.Snowflake`
+        The channel sent to.
+    message: Any | None
+        The message sent, or `None` if sending failed.
+    error: :class:`Exception` | None
+        Why sending failed, if it did.
+    """
+
+    __slots__ = ('channel_id', 'message', 'error')
+
+    def __init__(
+        self,
+        channel_id: Snowflake,
+        message: Any | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        self.channel_id = channel_id
+        self.message = message
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return f'<BroadcastResult channel_id={self.channel_id} ok={self.ok}>'
+
+
+def _route(channel_id: Snowflake) -> Route:
+    return Route('/channels/{channel_id}/messages', channel_id=channel_id)
+
+
+async def broadcast(
+    http: HTTPClient,
+    channel_ids: Iterable[Snowflake],
+    payload: dict[str, Any],
+    *,
+    concurrency: int | None = None,
+    completed: Iterable[Snowflake] = (),
+) -> AsyncIterator[BroadcastResult]:
+    # the body is the same for every channel, so it's only serialized once
+    body = dumps_bytes(payload)
+    # snowflakes don't hash like the ints they equal, so compare as ints
+    skip = {int(id) for id in completed}
+    pending: deque[Snowflake] = deque(
+        dict.fromkeys(id for id in channel_ids if int(id) not in skip)
+    )
+    limiter = http._rate_limiter
+    if concurrency is None:
+        concurrency = getattr(limiter, 'global_limit', 50)
+
+    def next_channel() -> Snowflake:
+        if isinstance(limiter, RateLimiter):
+            # channels whose buckets are exhausted go last, instead of holding
+            # up a worker which could be sending to another channel meanwhile
+            for _ in range(len(pending)):
+                if not limiter.delay('POST', _route(pending[0])):
+                    break
+                pending.rotate(-1)
+        return pending.popleft()
+
+    async def send(channel_id: Snowflake) -> Any:
+        return await http.request(
+            'POST', _route(channel_id), body, priority=BACKGROUND_PRIORITY
+        )
+
+    async with aclosing(stream(pending, send, concurrency, next_channel)) as results:
+        async for channel_id, message, error in results:
+            yield BroadcastResult(channel_id, message, error)
+
+
+async def stream(
+    pending: deque[T],
+    run: Callable[[T], Awaitable[Any]],
+    concurrency: int,
+    take: Callable[[], T] | None = None,
+) -> AsyncIterator[tuple[T, Any, Exception | None]]:
+    """
+    Runs ``run`` for everything in ``pending`` across ``concurrency`` workers,
+    yielding ``(item, result, error)`` as each completes. Closing the iterator
+    cancels whatever is still running.
+    """
+    take = take or pending.popleft
+    results: asyncio.Queue[tuple[T, Any, Exception | None] | None] = asyncio.Queue()
+
+    async def worker() -> None:
+        while pending:
+            item = take()
+            try:
+                result = await run(item)
+            except Exception as exc:
+                results.put_nowait((item, None, exc))
+            else:
+                results.put_nowait((item, result, None))
+
+    async def workers() -> None:
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(pending)))))
+        results.put_nowait(None)
+
+    runner = asyncio.create_task(workers())
+
+    try:
+        while (result := await results.get()) is not None:
+            yield result
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
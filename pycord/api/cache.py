@@ -0,0 +1,316 @@
+# cython: language_level=3
+# Copyright (c) 2022-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Sequence
+
+from ..errors import NotFound
+
+if TYPE_CHECKING:
+    from .route import BaseRoute
+
+__all__: Sequence[str] = ('RequestCache',)
+
+# gateway events which make cached responses stale,
+# as (major parameter, key of the event's data holding it)
+INVALIDATED_BY: dict[str, tuple[tuple[str, str], ...]] = {
+    'GUILD_UPDATE': (('guild_id', 'id'),),
+    'GUILD_DELETE': (('guild_id', 'id'),),
+    'GUILD_ROLE_CREATE': (('guild_id', 'guild_id'),),
+    'GUILD_ROLE_UPDATE': (('guild_id', 'guild_id'),),
+    'GUILD_ROLE_DELETE': (('guild_id', 'guild_id'),),
+    'GUILD_MEMBER_ADD': (('guild_id', 'guild_id'),),
+    'GUILD_MEMBER_UPDATE': (('guild_id', 'guild_id'),),
+    'GUILD_MEMBER_REMOVE': (('guild_id', 'guild_id'),),
+    'GUILD_BAN_ADD': (('guild_id', 'guild_id'),),
+    'GUILD_BAN_REMOVE': (('guild_id', 'guild_id'),),
+    'GUILD_EMOJIS_UPDATE': (('guild_id', 'guild_id'),),
+    'GUILD_STICKERS_UPDATE': (('guild_id', 'guild_id'),),
+    'CHANNEL_CREATE': (('guild_id', 'guild_id'),),
+    'CHANNEL_UPDATE': (('channel_id', 'id'), ('guild_id', 'guild_id')),
+    'CHANNEL_DELETE': (('channel_id', 'id'), ('guild_id', 'guild_id')),
+    'CHANNEL_PINS_UPDATE': (('channel_id', 'channel_id'),),
+    'THREAD_CREATE': (('guild_id', 'guild_id'),),
+    'THREAD_UPDATE': (('channel_id', 'id'), ('guild_id', 'guild_id')),
+    'THREAD_DELETE': (('channel_id', 'id'), ('guild_id', 'guild_id')),
+    'MESSAGE_UPDATE': (('channel_id', 'channel_id'),),
+    'MESSAGE_DELETE': (('channel_id', 'channel_id'),),
+    'MESSAGE_DELETE_BULK': (('channel_id', 'channel_id'),),
+    'WEBHOOKS_UPDATE': (('channel_id', 'channel_id'), ('guild_id', 'guild_id')),
+}
+MAJOR_PARAMETERS = ('guild_id', 'channel_id', 'webhook_id')
+
+Key = tuple[str, tuple[tuple[str, Any], ...]]
+
+
+class _CachedNotFound:
+    # only what's needed to raise the 404 again, rather than the exception
+    # itself, whose traceback would grow with every raise and which keeps
+    # its response alive
+    __slots__ = ('status', 'reason', 'data')
+
+    def __init__(self, exc: NotFound) -> None:
+        self.status = exc.status
+        self.reason = exc._response.reason
+        self.data = {
+            'code': getattr(exc, 'code', 0),
+            'message': getattr(exc, 'error_message', ''),
+        }
+
+    def error(self) -> NotFound:
+        return NotFound(resp=self, data=self.data)
+
+
+class RequestCache:
+    """
+    Coalesces and caches GET requests.
+
+    Identical GETs made while one is already in flight wait for its response
+    instead of being requested again. Responses are then cached for a while,
+    404s included, until they expire or a gateway event or a request made
+    through the same :class:`.HTTPClient` changes what they're about.
+
+    .. WARNING::
+        Cached responses are shared between callers, so shouldn't be modified.
+
+    Parameters
+    ----------
+    ttl: :class:`float`
+        How many seconds responses are cached for.
+
+        Defaults to 5.
+    ttls: dict[:class:`str`, :class:`float`] | None
+        Per-route overrides of ``ttl``, by route path, such as
+        ``{'/guilds/{guild_id}/roles': 60}``. A ttl of 0 only coalesces.
+
+        Defaults to `None`.
+    negative_ttl: :class:`float`
+        How many seconds 404s are cached for.
+
+        Defaults to 30.
+    max_items: :class:`int`
+        The maximum amount of responses to cache, the oldest being dropped first.
+
+        Defaults to 1024.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 5,
+        ttls: dict[str, float] | None = None,
+        negative_ttl: float = 30,
+        max_items: int = 1024,
+    ) -> None:
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.negative_ttl = negative_ttl
+        self.max_items = max_items
+        self.hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+        # key -> (expires at, response or 404, (major parameter, id) labels)
+        self._entries: dict[Key, tuple[float, Any, tuple[tuple[str, str], ...]]] = {}
+        self._labels: dict[tuple[str, str], set[Key]] = {}
+        # key -> (the request's task, its labels)
+        self._in_flight: dict[
+            Key, tuple[asyncio.Task[Any], tuple[tuple[str, str], ...]]
+        ] = {}
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'size': len(self._entries),
+        }
+
+    @staticmethod
+    def _labels_of(route: BaseRoute) -> tuple[tuple[str, str], ...]:
+        return tuple(
+            (name, str(getattr(route, name)))
+            for name in MAJOR_PARAMETERS
+            if getattr(route, name) is not None
+        )
+
+    async def fetch(
+        self,
+        route: BaseRoute,
+        query_params: dict[str, Any] | None,
+        request: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Gets a GET's response from cache, or from ``request``.
+
+        Parameters
+        ----------
+        route: :class:`.BaseRoute`
+            The route being requested.
+        query_params: dict[:class:`str`, Any] | None
+            The query parameters of the request.
+        request: Callable[[], Awaitable[Any]]
+            Makes the request, if it needs to be made.
+
+        Raises
+        ------
+        :exc:`.NotFound`
+            The route responded, or recently responded, with a 404.
+        """
+        key: Key = (
+            route.merge(''),
+            tuple(sorted(query_params.items())) if query_params else (),
+        )
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            if entry[0] > monotonic():
+                self.hits += 1
+
+                if isinstance(entry[1], _CachedNotFound):
+                    raise entry[1].error()
+                return entry[1]
+
+            self._discard(key)
+
+        in_flight = self._in_flight.get(key)
+
+        if in_flight is None:
+            self.misses += 1
+            task = asyncio.create_task(self._fill(key, route, request))
+            self._in_flight[key] = (task, self._labels_of(route))
+        else:
+            self.coalesced += 1
+            task = in_flight[0]
+
+        # one caller being cancelled mustn't cancel the request for the rest
+        return await asyncio.shield(task)
+
+    def _is_current(self, key: Key) -> bool:
+        in_flight = self._in_flight.get(key)
+        return in_flight is not None and in_flight[0] is asyncio.current_task()
+
+    async def _fill(
+        self, key: Key, route: BaseRoute, request: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        try:
+            data = await request()
+        except NotFound as exc:
+            if self._is_current(key):
+                self._store(key, route, _CachedNotFound(exc), self.negative_ttl)
+            raise
+        else:
+            # invalidated while in flight, so this response may already be stale
+            if self._is_current(key):
+                self._store(key, route, data, self.ttls.get(route.path, self.ttl))
+            return data
+        finally:
+            if self._is_current(key):
+                del self._in_flight[key]
+
+    def _store(self, key: Key, route: BaseRoute, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+
+        while len(self._entries) >= self.max_items:
+            self._discard(next(iter(self._entries)))
+
+        labels = self._labels_of(route)
+        self._entries[key] = (monotonic() + ttl, value, labels)
+
+        for label in labels:
+            self._labels.setdefault(label, set()).add(key)
+
+    def _discard(self, key: Key) -> None:
+        entry = self._entries.pop(key, None)
+
+        if entry is None:
+            return
+
+        for label in entry[2]:
+            keys = self._labels.get(label)
+
+            if keys is not None:
+                keys.discard(key)
+
+                if not keys:
+                    del self._labels[label]
+
+    def invalidate(self, **major_parameters: Any) -> None:
+        """
+        Drops every cached response of a guild, channel or webhook.
+
+        Parameters
+        ----------
+        **major_parameters
+            Which ``guild_id``, ``channel_id`` or ``webhook_id`` to drop.
+        """
+        for name, id in major_parameters.items():
+            if id is None:
+                continue
+
+            for key in self._labels.pop((name, str(id)), ()):
+                self._discard(key)
+
+            # requests in flight for it would cache what might be stale by now
+            for key in [
+                key
+                for key, (_, labels) in self._in_flight.items()
+                if (name, str(id)) in labels
+            ]:
+                del self._in_flight[key]
+
+    def invalidate_path(self, path: str) -> None:
+        """Drops the cached responses of a formatted path, such as ``/users/@me``."""
+        for key in [key for key in self._entries if key[0] == path]:
+            self._discard(key)
+
+        for key in [key for key in self._in_flight if key[0] == path]:
+            del self._in_flight[key]
+
+    def invalidate_route(self, route: BaseRoute) -> None:
+        """Drops what a request changing ``route`` could have made stale."""
+        labels = self._labels_of(route)
+
+        if labels:
+            self.invalidate(**dict(labels))
+        else:
+            self.invalidate_path(route.merge(''))
+
+    def dispatched(self, event: str, data: Any) -> None:
+        """Drops what a gateway event made stale."""
+        if event == 'USER_UPDATE':
+            self.invalidate_path('/users/@me')
+            return
+
+        fields = INVALIDATED_BY.get(event)
+
+        if fields is None or data is None:
+            return
+
+        self.invalidate(
+            **{
+                name: data.get(field)
+                for name, field in fields
+                if data.get(field) is not None
+            }
+        )
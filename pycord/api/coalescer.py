@@ -0,0 +1,145 @@
+# cython: language_level=3
+# Copyright (c) 2022-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Sequence
+
+from .execution import RateLimiter
+from .route import Route
+
+if TYPE_CHECKING:
+    from ..snowflake import Snowflake
+    from . import HTTPClient
+
+__all__: Sequence[str] = ('EditCoalescer',)
+
+
+class _PendingEdit:
+    __slots__ = ('data', 'waiting', 'task')
+
+    def __init__(self) -> None:
+        # the fields of every edit not sent yet, later edits overwriting earlier ones
+        self.data: dict[str, Any] = {}
+        self.waiting: list[asyncio.Future[Any]] = []
+        self.task: asyncio.Task[None] | None = None
+
+
+class EditCoalescer:
+    """
+    Coalesces edits to the same message, such as a progress bar updated many times
+    a second, into as few requests as its rate limit bucket allows.
+
+    Only one edit per message is in flight at a time. Edits made meanwhile are
+    merged, later fields overwriting earlier ones, and sent together once the
+    bucket lets another request through. Every edit resolves with the message
+    as it is after the request it was sent in.
+
+    Parameters
+    ----------
+    http: :class:`.HTTPClient`
+        The client to edit messages with.
+    """
+
+    def __init__(self, http: HTTPClient) -> None:
+        self._http = http
+        self._edits: dict[tuple[int, int], _PendingEdit] = {}
+
+    @property
+    def pending(self) -> int:
+        """The amount of messages with edits waiting to be sent."""
+        return sum(bool(edit.waiting) for edit in self._edits.values())
+
+    async def edit(
+        self, channel_id: Snowflake, message_id: Snowflake, data: dict[str, Any]
+    ) -> Any:
+        """
+        Edits a message, coalesced with other edits to it.
+
+        Parameters
+        ----------
+        channel_id: :class:`.Snowflake`
+            The channel the message is in.
+        message_id: :class:`.Snowflake`
+            The message to edit.
+        data: dict[:class:`str`, Any]
+            The fields to edit, as sent to Discord.
+
+        Returns
+        -------
+        Any
+            The message after the last edit coalesced with this one.
+        """
+        # snowflakes don't hash like the ints they equal, so key by ints
+        key = (int(channel_id), int(message_id))
+        edit = self._edits.get(key)
+        if edit is None:
+            edit = self._edits[key] = _PendingEdit()
+
+        edit.data.update(data)
+        future = asyncio.get_running_loop().create_future()
+        edit.waiting.append(future)
+
+        if edit.task is None:
+            edit.task = asyncio.create_task(self._flush(key, edit))
+        return await future
+
+    async def _flush(self, key: tuple[int, int], edit: _PendingEdit) -> None:
+        route = Route(
+            '/channels/{channel_id}/messages/{message_id}',
+            channel_id=key[0],
+            message_id=key[1],
+        )
+        limiter = self._http._rate_limiter
+        waiting: list[asyncio.Future[Any]] = []
+
+        try:
+            while edit.waiting:
+                # wait for the bucket first, so the newest edits make it into the request
+                if isinstance(limiter, RateLimiter):
+                    delay = limiter.delay('PATCH', route)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                        continue
+
+                data, edit.data = edit.data, {}
+                waiting, edit.waiting = edit.waiting, []
+
+                try:
+                    message = await self._http.request('PATCH', route, data)
+                except Exception as exc:
+                    for future in waiting:
+                        if not future.done():
+                            future.set_exception(exc)
+                else:
+                    # resolved right away, edits made since can't keep them waiting
+                    for future in waiting:
+                        if not future.done():
+                            future.set_result(message)
+                waiting = []
+        except BaseException:
+            # the coalescer was shut down, such as by cancelling this task
+            for future in waiting + edit.waiting:
+                future.cancel()
+            raise
+        finally:
+            if self._edits.get(key) is edit:
+                del self._edits[key]
@@ -6,4 +6,7 @@ Rate Limit execution for the Discord API
 :copyright: 2021-present Pycord Development
 :license: MIT
 """
-from .executer import *
+from .breaker import *
+from .rate_limiter import *
+from .retry import *
+from .shared import *
@@ -0,0 +1,266 @@
+# cython: language_level=3
+# Copyright (c) 2022-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import logging
+from collections import deque
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from ...errors import CircuitOpen
+
+if TYPE_CHECKING:
+    from ..route import BaseRoute
+
+__all__ = ('CircuitBreaker',)
+
+_log = logging.getLogger(__name__)
+
+
+def _names_resource(route: BaseRoute) -> bool:
+    # whether the route is about something below its major parameters, such as
+    # a message or member, which a 404 only says is gone
+    return any(name != 'interaction_token' for name in route.parameters)
+
+
+class CircuitBreaker:
+    """
+    Keeps invalid requests under the limit Discord bans IPs for exceeding.
+
+    Discord counts every 401, 403 and 429 (besides shared 429s) as invalid,
+    and temporarily bans IPs which make 10,000 of them in 10 minutes.
+    As the count rises, low priority requests are shed and then everything
+    but high priority requests is.
+
+    Separately, routes which keep responding with 403 or 404 for the same method,
+    guild, channel or webhook are failed without being requested for a while.
+    404s for what's below those, such as a message or member, only mean that
+    one is gone, so aren't counted.
+
+    Parameters
+    ----------
+    per: :class:`float`
+        The length of the window invalid requests are counted over, in seconds.
+
+        Defaults to 600.
+    shed_threshold: :class:`int`
+        The amount of invalid requests in the window past which requests with a
+        priority below 0 are shed.
+
+        Defaults to 5000.
+    open_threshold: :class:`int`
+        The amount of invalid requests in the window past which requests without
+        a priority above 0 are shed.
+
+        Defaults to 9000.
+    route_failures: :class:`int`
+        How many 403s or 404s in a row a route may respond with before it's
+        failed without being requested.
+
+        Defaults to 3.
+    route_cooldown: :class:`float`
+        How long a route is failed for, in seconds. Afterwards a single request
+        is let through to see whether it still fails, reopening the route if it
+        does. Requests made while it's in flight are still failed.
+
+        Defaults to 60.
+    """
+
+    def __init__(
+        self,
+        per: float = 600,
+        shed_threshold: int = 5000,
+        open_threshold: int = 9000,
+        route_failures: int = 3,
+        route_cooldown: float = 60,
+    ) -> None:
+        if not 0 < shed_threshold <= open_threshold:
+            raise ValueError(
+                'shed_threshold must be positive and at most open_threshold'
+            )
+
+        self.per = per
+        self.shed_threshold = shed_threshold
+        self.open_threshold = open_threshold
+        self.route_failures = route_failures
+        self.route_cooldown = route_cooldown
+
+        # when each invalid request inside the window was made, oldest first
+        self._invalid: deque[float] = deque()
+        # (method, path, major parameters) -> (failures in a row, failing until,
+        # when the request probing whether it still fails was let through, or 0)
+        self._routes: dict[tuple[Any, ...], tuple[int, float, float]] = {}
+        self._next_sweep: int = 1024
+
+    def _purge(self, now: float) -> None:
+        while self._invalid and self._invalid[0] <= now - self.per:
+            self._invalid.popleft()
+
+    @property
+    def invalid(self) -> int:
+        """The amount of invalid requests made inside the window."""
+        self._purge(monotonic())
+        return len(self._invalid)
+
+    @property
+    def state(self) -> str:
+        """
+        ``closed`` normally, ``shedding`` while shedding low priority requests
+        and ``open`` while only letting high priority requests through.
+        """
+        invalid = self.invalid
+
+        if invalid >= self.open_threshold:
+            return 'open'
+        elif invalid >= self.shed_threshold:
+            return 'shedding'
+        return 'closed'
+
+    @property
+    def failing_routes(self) -> list[tuple[Any, ...]]:
+        """
+        The ``(method, path, major parameters)`` of every route currently being failed.
+        """
+        now = monotonic()
+        return [
+            key
+            for key, (failures, until, _) in self._routes.items()
+            if failures >= self.route_failures and until > now
+        ]
+
+    def check(self, method: str, route: BaseRoute, priority: int = 0) -> None:
+        """
+        Fails a request before it's made if it should be shed.
+
+        Parameters
+        ----------
+        method: :class:`str`
+            The method of the request.
+        route: :class:`.BaseRoute`
+            The route of the request.
+        priority: :class:`int`
+            The priority of the request.
+
+        Raises
+        ------
+        :exc:`.CircuitOpen`
+            The request should not be made.
+        """
+        state = self.state
+
+        if (state == 'open' and priority <= 0) or (
+            state == 'shedding' and priority < 0
+        ):
+            raise CircuitOpen(
+                f'{self.invalid} invalid requests made in the last {self.per} seconds, shedding requests with priority {priority}'
+            )
+
+        key = (method, route.path, route.major_parameters)
+        failing = self._routes.get(key)
+
+        if failing is None or failing[0] < self.route_failures:
+            return
+
+        failures, until, probed = failing
+        now = monotonic()
+
+        # a probe which never came back, such as one timed out waiting on
+        # rate limits, is given up on after a cooldown
+        if until > now or (probed and now - probed < self.route_cooldown):
+            raise CircuitOpen(
+                f'{method} {route.path} responded with {failures} 403s or 404s in a row for {route.major_parameters}'
+            )
+
+        # half open, this request sees whether the route still fails
+        self._routes[key] = (failures, until, now)
+
+    def release(self, method: str, route: BaseRoute) -> None:
+        """
+        Lets another request see whether a failing route still fails, after the
+        one let through failed without a response.
+
+        Parameters
+        ----------
+        method: :class:`str`
+            The method of the request.
+        route: :class:`.BaseRoute`
+            The route of the request.
+        """
+        key = (method, route.path, route.major_parameters)
+        failing = self._routes.get(key)
+
+        if failing is not None and failing[2]:
+            self._routes[key] = (failing[0], failing[1], 0)
+
+    def record(
+        self, method: str, route: BaseRoute, status: int, scope: str | None = None
+    ) -> None:
+        """
+        Counts a response towards the invalid request and route limits.
+
+        Parameters
+        ----------
+        method: :class:`str`
+            The method of the request.
+        route: :class:`.BaseRoute`
+            The route of the request.
+        status: :class:`int`
+            The status of the response.
+        scope: :class:`str` | None
+            The response's ``X-RateLimit-Scope``.
+        """
+        now = monotonic()
+
+        if status in (401, 403) or (status == 429 and scope != 'shared'):
+            self._purge(now)
+            self._invalid.append(now)
+
+            if len(self._invalid) == self.shed_threshold:
+                _log.warning(
+                    f'{len(self._invalid)} invalid requests made in the last {self.per} seconds, shedding low priority requests'
+                )
+
+        key = (method, route.path, route.major_parameters)
+
+        if status == 403 or (status == 404 and not _names_resource(route)):
+            failures = self._routes.get(key, (0, 0, 0))[0] + 1
+
+            if len(self._routes) >= self._next_sweep:
+                self._sweep(now)
+
+            # also reopens routes whose probe still failed
+            self._routes[key] = (failures, now + self.route_cooldown, 0)
+        elif status < 400:
+            self._routes.pop(key, None)
+        else:
+            # neither here nor there, such as a 429, 500 or a deleted message
+            self.release(method, route)
+
+    def _sweep(self, now: float) -> None:
+        for key, (failures, until, probed) in list(self._routes.items()):
+            # failing routes are kept half open for another cooldown
+            if failures >= self.route_failures:
+                until = max(until, probed) + self.route_cooldown
+
+            if until <= now:
+                del self._routes[key]
+
+        self._next_sweep = max(1024, len(self._routes) * 2)
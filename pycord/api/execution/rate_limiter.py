@@ -0,0 +1,616 @@
+# cython: language_level=3
+# Copyright (c) 2022-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import logging
+import os
+import time
+from asyncio import AbstractEventLoop, Future, TimerHandle, get_running_loop
+from heapq import heappop, heappush
+from itertools import count
+from math import inf
+from typing import TYPE_CHECKING, Any, Mapping
+
+from ...errors import DeadlineExceeded
+from ...utils import dumps_bytes, loads
+
+if TYPE_CHECKING:
+    from ..route import BaseRoute
+
+__all__ = (
+    'BaseRateLimiter',
+    'Bucket',
+    'GlobalBucket',
+    'RateLimiter',
+    'INTERACTION_PRIORITY',
+    'BACKGROUND_PRIORITY',
+)
+
+# interaction callbacks and followups have 3 seconds, they go before anything else
+INTERACTION_PRIORITY: int = 100
+# bulk work nobody is waiting on, the first to be shed by the CircuitBreaker
+BACKGROUND_PRIORITY: int = -10
+# bumped whenever what RateLimiter.export returns changes shape
+STATE_VERSION: int = 2
+_log = logging.getLogger(__name__)
+
+
+def _expire(future: Future[None]) -> None:
+    if not future.done():
+        future.set_exception(
+            DeadlineExceeded('The request could not be sent before its deadline')
+        )
+
+
+class Bucket:
+    """
+    A Discord rate limit bucket.
+
+    Requests take from ``remaining`` before being sent, so a bucket is never
+    exhausted by requests already in flight. Once it's empty, requests queue up
+    until the bucket resets, higher priorities first and otherwise in FIFO order.
+
+    A bucket's limits are unknown until its first response comes back, until
+    then only one request is let through at a time.
+    """
+
+    def __init__(self) -> None:
+        self.limit: float = 1
+        self.remaining: float = 1
+        self.reset_at: float | None = None
+        # whether a response has told us this bucket's limits yet
+        self.known: bool = False
+
+        self.loop: AbstractEventLoop = get_running_loop()
+        # (-priority, arrival, future), as a heap
+        self._waiters: list[tuple[int, int, Future[None]]] = []
+        self._arrivals = count()
+        self._timer: TimerHandle | None = None
+
+    @property
+    def pending(self) -> int:
+        """The amount of requests waiting for this bucket to reset."""
+        # expired and cancelled waiters are only dropped once they're reached
+        return sum(not future.done() for _, _, future in self._waiters)
+
+    @property
+    def idle(self) -> bool:
+        """Whether this bucket is fully reset with nothing waiting on it."""
+        self._reset(self.loop.time())
+        return self.known and not self._waiters and self.remaining >= self.limit
+
+    def _reset(self, now: float) -> None:
+        if self.reset_at is not None and now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = None
+
+    def _take(self) -> bool:
+        self._reset(self.loop.time())
+
+        if self.remaining >= 1:
+            self.remaining -= 1
+            return True
+        return False
+
+    async def acquire(self, priority: int = 0, deadline: float | None = None) -> None:
+        """
+        Waits until a request may be sent in this bucket.
+
+        Parameters
+        ----------
+        priority: :class:`int`
+            Waiting requests with a higher priority are let through first.
+
+            Defaults to 0.
+        deadline: :class:`float` | None
+            The :meth:`loop.time() <asyncio.loop.time>` by which the request must
+            be let through, after which :exc:`.DeadlineExceeded` is raised instead.
+
+            Defaults to `None`.
+        """
+        if not self._waiters and self._take():
+            return
+
+        if deadline is not None and (self.reset_at or 0) > deadline:
+            # nothing is let through before the reset, which is already too late
+            raise DeadlineExceeded('The request could not be sent before its deadline')
+
+        future: Future[None] = self.loop.create_future()
+        heappush(self._waiters, (-priority, next(self._arrivals), future))
+        self._schedule()
+        expiry = (
+            None if deadline is None else self.loop.call_at(deadline, _expire, future)
+        )
+
+        try:
+            await future
+        except BaseException:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # we were let through right as we were cancelled, pass it on
+                self.remaining += 1
+                self._release()
+            raise
+        finally:
+            if expiry is not None:
+                expiry.cancel()
+
+    def cancel(self) -> None:
+        """Gives back a request's place if it failed before getting a response."""
+        if not self.known:
+            self.remaining += 1
+            self._release()
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """
+        Updates this bucket from a response's rate limit headers.
+
+        Parameters
+        ----------
+        headers: Mapping[:class:`str`, :class:`str`]
+            The response's headers.
+        """
+        if 'X-RateLimit-Remaining' not in headers:
+            # this route isn't limited beyond the global rate limit
+            if not self.known:
+                self.limit = self.remaining = inf
+                self.known = True
+                self._release()
+            return
+
+        limit = int(headers['X-RateLimit-Limit'])
+        remaining = int(headers['X-RateLimit-Remaining'])
+        reset_at = self.loop.time() + float(headers['X-RateLimit-Reset-After'])
+
+        if self.known:
+            # responses arrive out of order, so only ever trust the lowest count
+            self.remaining = min(self.remaining, remaining)
+        else:
+            self.remaining = remaining
+            self.known = True
+
+        self.limit = limit
+        self.reset_at = max(self.reset_at or reset_at, reset_at)
+        self._release()
+
+    def pause(self, retry_after: float) -> None:
+        """Empties this bucket for ``retry_after`` seconds after a 429."""
+        self.known = True
+        self.remaining = 0
+        reset_at = self.loop.time() + retry_after
+        self.reset_at = max(self.reset_at or reset_at, reset_at)
+        self._schedule()
+
+    def export(self) -> dict[str, Any] | None:
+        """
+        This bucket's window, with its reset as a unix timestamp, or `None`
+        if it has nothing worth keeping, being unknown or already reset.
+        """
+        now = self.loop.time()
+        self._reset(now)
+
+        if not self.known or self.reset_at is None or self.limit == inf:
+            return None
+
+        return {
+            'limit': self.limit,
+            'remaining': self.remaining,
+            'reset_at': time.time() + self.reset_at - now,
+        }
+
+    def restore(self, window: dict[str, Any]) -> bool:
+        """
+        Continues a window made by :meth:`export`, unless it has already reset.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether the window was restored.
+        """
+        reset_after = window['reset_at'] - time.time()
+        if reset_after <= 0:
+            return False
+
+        # requests already let through in this process count as well
+        remaining = window['remaining']
+        self.remaining = min(self.remaining, remaining) if self.known else remaining
+        self.known = True
+        self.limit = window['limit']
+        self.reset_at = self.loop.time() + reset_after
+        self._release()
+        return True
+
+    def _release(self) -> None:
+        while self._waiters:
+            if self._waiters[0][2].done():
+                heappop(self._waiters)
+                continue
+
+            if not self._take():
+                break
+
+            heappop(self._waiters)[2].set_result(None)
+
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        # without a reset time, the next response wakes waiters up instead
+        if self._waiters and self.reset_at is not None:
+            self._timer = self.loop.call_at(self.reset_at, self._release)
+
+
+class GlobalBucket(Bucket):
+    """
+    The bucket shared by every request, refilling every second.
+
+    Parameters
+    ----------
+    limit: :class:`int`
+        The amount of requests allowed per second.
+    """
+
+    def __init__(self, limit: int) -> None:
+        super().__init__()
+        self.limit = self.remaining = limit
+        self.known = True
+
+    def _take(self) -> bool:
+        if not super()._take():
+            return False
+
+        if self.reset_at is None:
+            self.reset_at = self.loop.time() + 1
+        return True
+
+
+class BaseRateLimiter:
+    """
+    Where :class:`.HTTPClient` keeps its rate limit state.
+
+    :meth:`acquire` returns a handle for the request, which must have a
+    ``cancel()`` method for requests which failed before getting a response.
+    """
+
+    async def acquire(
+        self,
+        method: str,
+        route: BaseRoute,
+        priority: int = 0,
+        deadline: float | None = None,
+    ) -> Any:
+        ...
+
+    def update(
+        self,
+        method: str,
+        route: BaseRoute,
+        bucket: Any,
+        headers: Mapping[str, str],
+    ) -> None:
+        ...
+
+    def rate_limited(
+        self,
+        method: str,
+        route: BaseRoute,
+        bucket: Any,
+        retry_after: float,
+        scope: str | None,
+    ) -> None:
+        ...
+
+
+class RateLimiter(BaseRateLimiter):
+    """
+    Rate limits requests to the Discord API before they're made.
+
+    Routes are sorted into buckets by their method, path and major parameters.
+    Discord tells us which routes share a bucket through
+    ``X-RateLimit-Bucket``, from then on those routes share one :class:`Bucket`.
+
+    Parameters
+    ----------
+    global_limit: :class:`int`
+        The amount of requests allowed per second across every route.
+
+        Defaults to 50.
+    """
+
+    def __init__(self, global_limit: int = 50) -> None:
+        self.global_limit = global_limit
+        # (method, path) -> the X-RateLimit-Bucket Discord said it uses
+        self._hashes: dict[tuple[str, str], str] = {}
+        self._buckets: dict[tuple[Any, tuple[Any, ...]], Bucket] = {}
+        self._global: GlobalBucket | None = None
+        self._next_sweep: int = 1024
+
+    def _key(self, method: str, route: BaseRoute) -> tuple[Any, tuple[Any, ...]]:
+        ident = (method, route.path)
+        return self._hashes.get(ident, ident), route.major_parameters
+
+    def get_bucket(self, method: str, route: BaseRoute) -> Bucket:
+        """Gets, or creates, the bucket requests to ``route`` go through."""
+        key = self._key(method, route)
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            if len(self._buckets) >= self._next_sweep:
+                self._sweep()
+            bucket = self._buckets[key] = Bucket()
+
+        return bucket
+
+    def delay(self, method: str, route: BaseRoute) -> float:
+        """
+        How many seconds until a request to ``route`` is let through by its bucket,
+        0 if right away or once a response in flight comes back.
+        """
+        bucket = self._buckets.get(self._key(method, route))
+        if bucket is None:
+            return 0
+
+        now = bucket.loop.time()
+        bucket._reset(now)
+        if (bucket.remaining >= 1 and not bucket._waiters) or bucket.reset_at is None:
+            return 0
+        return bucket.reset_at - now
+
+    def _sweep(self) -> None:
+        for key, bucket in list(self._buckets.items()):
+            if bucket.idle:
+                del self._buckets[key]
+
+        self._next_sweep = max(1024, len(self._buckets) * 2)
+
+    async def acquire(
+        self,
+        method: str,
+        route: BaseRoute,
+        priority: int = 0,
+        deadline: float | None = None,
+    ) -> Bucket:
+        """
+        Waits until a request to ``route`` may be made.
+
+        Parameters
+        ----------
+        method: :class:`str`
+            The method of the request.
+        route: :class:`.BaseRoute`
+            The route of the request.
+        priority: :class:`int`
+            Requests with a higher priority are let through first.
+
+            Defaults to 0.
+        deadline: :class:`float` | None
+            The :meth:`loop.time() <asyncio.loop.time>` by which the request must
+            be let through, after which :exc:`.DeadlineExceeded` is raised instead.
+
+            Defaults to `None`.
+
+        Returns
+        -------
+        :class:`Bucket`
+            The bucket the request was made in, to pass to :meth:`update`.
+        """
+        bucket = self.get_bucket(method, route)
+        await bucket.acquire(priority, deadline)
+
+        # interaction endpoints aren't bound to the global rate limit
+        if not route.path.startswith('/interactions'):
+            if self._global is None:
+                self._global = GlobalBucket(self.global_limit)
+
+            try:
+                await self._global.acquire(priority, deadline)
+            except BaseException:
+                bucket.cancel()
+                raise
+
+        return bucket
+
+    def update(
+        self,
+        method: str,
+        route: BaseRoute,
+        bucket: Bucket,
+        headers: Mapping[str, str],
+    ) -> None:
+        """
+        Updates the rate limits of ``route`` from a response's headers.
+
+        Parameters
+        ----------
+        method: :class:`str`
+            The method of the request.
+        route: :class:`.BaseRoute`
+            The route of the request.
+        bucket: :class:`Bucket`
+            The bucket returned by :meth:`acquire`.
+        headers: Mapping[:class:`str`, :class:`str`]
+            The response's headers.
+        """
+        bucket.update(headers)
+        bucket_hash = headers.get('X-RateLimit-Bucket')
+
+        if bucket_hash is None or self._hashes.get((method, route.path)) == bucket_hash:
+            return
+
+        old = self._key(method, route)
+        self._hashes[(method, route.path)] = bucket_hash
+        new = self._key(method, route)
+
+        if self._buckets.get(old) is bucket:
+            del self._buckets[old]
+        # another route may already share this bucket, in which case ours drains
+        # what's already queued on it and is then forgotten
+        self._buckets.setdefault(new, bucket)
+
+    def rate_limited(
+        self,
+        method: str,
+        route: BaseRoute,
+        bucket: Bucket,
+        retry_after: float,
+        scope: str | None,
+    ) -> None:
+        """
+        Handles a 429 response.
+
+        Parameters
+        ----------
+        method: :class:`str`
+            The method of the request.
+        route: :class:`.BaseRoute`
+            The route of the request.
+        bucket: :class:`Bucket`
+            The bucket returned by :meth:`acquire`.
+        retry_after: :class:`float`
+            How many seconds to wait before retrying.
+        scope: :class:`str` | None
+            The response's ``X-RateLimit-Scope``.
+        """
+        if scope == 'global':
+            if self._global is None:
+                self._global = GlobalBucket(self.global_limit)
+
+            self._global.pause(retry_after)
+        else:
+            bucket.pause(retry_after)
+
+    def export(self) -> dict[str, Any]:
+        """
+        Which bucket every route is in, and the windows of buckets which haven't
+        reset yet, for :meth:`load` to continue from in another process.
+        Buckets of routes with webhook or interaction tokens are left out.
+        """
+        buckets = []
+        for (key, major_parameters), bucket in self._buckets.items():
+            if any(isinstance(p, str) for p in major_parameters):
+                # webhook and interaction tokens are secrets, never written out
+                continue
+
+            window = bucket.export()
+
+            if window is not None:
+                buckets.append(
+                    {
+                        'key': key,
+                        'major_parameters': list(major_parameters),
+                        **window,
+                    }
+                )
+
+        return {
+            'version': STATE_VERSION,
+            'hashes': [
+                [method, path, bucket_hash]
+                for (method, path), bucket_hash in self._hashes.items()
+            ],
+            'buckets': buckets,
+            'global': None if self._global is None else self._global.export(),
+        }
+
+    def load(self, state: dict[str, Any]) -> int:
+        """
+        Continues from rate limit state made by :meth:`export`,
+        discarding windows which have reset since.
+
+        Parameters
+        ----------
+        state: dict[:class:`str`, Any]
+            What :meth:`export` returned.
+
+        Returns
+        -------
+        :class:`int`
+            The amount of bucket windows continued.
+        """
+        if state.get('version') != STATE_VERSION:
+            return 0
+
+        for method, path, bucket_hash in state['hashes']:
+            self._hashes[(method, path)] = bucket_hash
+
+        restored = 0
+        for window in state['buckets']:
+            key = window['key']
+            key = (
+                tuple(key) if isinstance(key, list) else key,
+                tuple(window['major_parameters']),
+            )
+            bucket = self._buckets.get(key) or Bucket()
+
+            if bucket.restore(window):
+                self._buckets[key] = bucket
+                restored += 1
+
+        if state.get('global') is not None:
+            if self._global is None:
+                self._global = GlobalBucket(self.global_limit)
+            self._global.restore(state['global'])
+
+        return restored
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """
+        Writes :meth:`export` to ``path``, such as when shutting down.
+
+        Parameters
+        ----------
+        path: :class:`str` | :class:`os.PathLike`
+            The file to write to, which is replaced all at once.
+        """
+        tmp = f'{os.fspath(path)}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(dumps_bytes(self.export()))
+        os.replace(tmp, path)
+
+    def restore(self, path: str | os.PathLike[str]) -> int:
+        """
+        Loads what :meth:`save` wrote to ``path``, such as when starting up.
+        Missing or unreadable files are ignored.
+
+        Parameters
+        ----------
+        path: :class:`str` | :class:`os.PathLike`
+            The file to read from.
+
+        Returns
+        -------
+        :class:`int`
+            The amount of bucket windows continued.
+        """
+        try:
+            with open(path, 'rb') as f:
+                state = loads(f.read())
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as exc:
+            _log.warning(f'could not read rate limit state from {path}: {exc!r}')
+            return 0
+
+        restored = self.load(state)
+        _log.debug(f'continued {restored} rate limit buckets from {path}')
+        return restored
@@ -0,0 +1,247 @@
+# cython: language_level=3
+# Copyright (c) 2022-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from random import uniform
+from time import monotonic
+from typing import TYPE_CHECKING, Callable
+
+from aiohttp import ClientConnectionError, ClientConnectorError, ClientPayloadError
+
+if TYPE_CHECKING:
+    from ..route import BaseRoute
+
+__all__ = ('RetryPolicy',)
+
+_log = logging.getLogger(__name__)
+
+# called with the method, route, attempt which failed, why it failed and the delay
+RetryHook = Callable[[str, 'BaseRoute', int, 'int | BaseException', float], None]
+
+
+class RetryPolicy:
+    """
+    Decides which failed REST requests are retried, and when.
+
+    Rate limited requests are always retried, as Discord never processed them.
+    Server errors, dropped connections and responses cut off partway are
+    retried with exponential backoff and full jitter, but only for idempotent
+    methods, since a ``POST`` which timed out may have gone through. Failing to
+    connect at all is safe to retry for any method.
+
+    Retries of failures are also limited to a share of requests made, so an
+    outage doesn't multiply the traffic sent to Discord.
+
+    Parameters
+    ----------
+    attempts: :class:`int`
+        The maximum amount of times a request is made, retries included.
+
+        Defaults to 5.
+    base: :class:`float`
+        The largest delay, in seconds, before the first retry.
+        It doubles with every retry afterwards.
+
+        Defaults to 0.5.
+    cap: :class:`float`
+        The largest delay, in seconds, between retries.
+
+        Defaults to 10.
+    statuses: frozenset[:class:`int`]
+        The response statuses worth retrying.
+
+        Defaults to 500, 502, 503 and 504.
+    idempotent: frozenset[:class:`str`]
+        The methods which are safe to retry after they may have been processed.
+
+        Defaults to ``GET``, ``HEAD``, ``OPTIONS``, ``PUT`` and ``DELETE``.
+    budget: :class:`float`
+        The share of requests made in the last ``per`` seconds which may be
+        retried after failing.
+
+        Defaults to 0.1.
+    min_retries: :class:`int`
+        Retries allowed in the last ``per`` seconds regardless of ``budget``,
+        so bots making few requests can still retry.
+
+        Defaults to 10.
+    per: :class:`float`
+        The length of the window retries are budgeted over, in seconds.
+
+        Defaults to 10.
+
+    Attributes
+    ----------
+    retries: :class:`int`
+        The amount of failed requests which were retried.
+    exhausted: :class:`int`
+        The amount of requests which failed after their last attempt.
+    over_budget: :class:`int`
+        The amount of retries which were skipped to stay within the budget.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 5,
+        base: float = 0.5,
+        cap: float = 10,
+        statuses: frozenset[int] = frozenset((500, 502, 503, 504)),
+        idempotent: frozenset[str] = frozenset(
+            ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+        ),
+        budget: float = 0.1,
+        min_retries: int = 10,
+        per: float = 10,
+    ) -> None:
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+        self.statuses = statuses
+        self.idempotent = idempotent
+        self.budget = budget
+        self.min_retries = min_retries
+        self.per = per
+        self.retries: int = 0
+        self.exhausted: int = 0
+        self.over_budget: int = 0
+        self.hooks: list[RetryHook] = []
+
+        # when each request and retry inside the window was made, oldest first
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        return {
+            'retries': self.retries,
+            'exhausted': self.exhausted,
+            'over_budget': self.over_budget,
+        }
+
+    def add_hook(self, hook: RetryHook) -> None:
+        """
+        Calls ``hook`` whenever a request is retried, with its method, route,
+        the attempt which failed, the status or exception it failed with
+        and how many seconds it's retried after.
+        """
+        self.hooks.append(hook)
+
+    def _purge(self, now: float) -> None:
+        for window in (self._requests, self._retries):
+            while window and window[0] <= now - self.per:
+                window.popleft()
+
+    def started(self) -> None:
+        """Counts a request towards the retry budget, before its first attempt."""
+        now = monotonic()
+        self._purge(now)
+        self._requests.append(now)
+
+    def backoff(self, attempt: int) -> float:
+        """The delay before retrying the ``attempt`` which failed, counting from 0."""
+        return uniform(0, min(self.cap, self.base * 2**attempt))
+
+    def retryable(self, method: str, reason: int | BaseException) -> bool:
+        """
+        Whether a request may be retried after failing for ``reason``.
+
+        Parameters
+        ----------
+        method: :class:`str`
+            The method of the request.
+        reason: :class:`int` | :class:`BaseException`
+            The status of the response, or what was raised while making the request.
+        """
+        if reason == 429 or isinstance(reason, ClientConnectorError):
+            # either way, Discord never processed the request
+            return True
+
+        if not (
+            reason in self.statuses
+            or isinstance(
+                reason,
+                (ClientConnectionError, ClientPayloadError, asyncio.TimeoutError),
+            )
+        ):
+            return False
+
+        return method in self.idempotent
+
+    def retry(
+        self, method: str, route: BaseRoute, attempt: int, reason: int | BaseException
+    ) -> float | None:
+        """
+        Decides whether to retry a failed attempt.
+
+        Parameters
+        ----------
+        method: :class:`str`
+            The method of the request.
+        route: :class:`.BaseRoute`
+            The route of the request.
+        attempt: :class:`int`
+            The attempt which failed, counting from 0.
+        reason: :class:`int` | :class:`BaseException`
+            The status of the response, or what was raised while making the request.
+
+        Returns
+        -------
+        :class:`float` | None
+            How many seconds to wait before retrying, or `None` to not retry.
+        """
+        if not self.retryable(method, reason):
+            return None
+
+        if attempt + 1 >= self.attempts:
+            self.exhausted += 1
+            return None
+
+        if reason == 429:
+            # the rate limiter already knows how long to wait
+            delay = 0.0
+        else:
+            now = monotonic()
+            self._purge(now)
+
+            if len(self._retries) >= max(
+                self.min_retries, self.budget * len(self._requests)
+            ):
+                self.over_budget += 1
+                _log.debug(
+                    f'not retrying {method} {route.path}, the retry budget is spent'
+                )
+                return None
+
+            self._retries.append(now)
+            self.retries += 1
+            delay = self.backoff(attempt)
+
+        for hook in self.hooks:
+            try:
+                hook(method, route, attempt, reason, delay)
+            except Exception:
+                # a broken hook must never stop the request being retried
+                _log.exception(f'retry hook {hook!r} failed')
+
+        return delay
@@ -0,0 +1,376 @@
+# cython: language_level=3
+# Copyright (c) 2022-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import struct
+from itertools import count
+from typing import TYPE_CHECKING, Any, Mapping
+
+from ...errors import DeadlineExceeded
+from ...utils import dumps_bytes, loads
+from .rate_limiter import BaseRateLimiter, Bucket, RateLimiter, _expire
+
+if TYPE_CHECKING:
+    from ..route import BaseRoute
+
+__all__ = ('RateLimitCoordinator', 'SharedRateLimiter')
+
+_log = logging.getLogger(__name__)
+_HEADER = struct.Struct('<I')
+# only these headers matter to rate limiting, the rest aren't sent over
+_HEADERS = (
+    'X-RateLimit-Bucket',
+    'X-RateLimit-Limit',
+    'X-RateLimit-Remaining',
+    'X-RateLimit-Reset-After',
+)
+# how long to rate limit locally before trying to reach the coordinator again
+_RECONNECT_AFTER = 5
+
+
+def _send(writer: asyncio.StreamWriter, message: list[Any]) -> None:
+    data = dumps_bytes(message)
+    writer.write(_HEADER.pack(len(data)) + data)
+
+
+async def _receive(reader: asyncio.StreamReader) -> list[Any]:
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return loads(await reader.readexactly(size))
+
+
+def _major(route: BaseRoute) -> list[str | None]:
+    # snowflakes are sent as strings, so every process ends up with the same keys
+    return [None if p is None else str(p) for p in route.major_parameters]
+
+
+class _RemoteRoute:
+    __slots__ = ('path', 'major_parameters')
+
+    def __init__(self, path: str, major_parameters: list[Any]) -> None:
+        self.path = path
+        self.major_parameters = tuple(major_parameters)
+
+
+class RateLimitCoordinator:
+    """
+    Keeps the rate limit state of every process sharing a bot token.
+
+    Processes connect to it through :class:`SharedRateLimiter`, and draw from
+    the same buckets and global rate limit as each other.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The path of the unix socket to serve on.
+    global_limit: :class:`int`
+        The amount of requests allowed per second across every process.
+
+        Defaults to 50.
+    """
+
+    def __init__(self, path: str, global_limit: int = 50) -> None:
+        self.path = path
+        self.limiter = RateLimiter(global_limit=global_limit)
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        self._server = await asyncio.start_unix_server(self._handle, self.path)
+        os.chmod(self.path, 0o600)
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def __aenter__(self) -> RateLimitCoordinator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        self.close()
+
+    async def _acquire(
+        self,
+        writer: asyncio.StreamWriter,
+        tickets: dict[int, Bucket],
+        id: int,
+        route: _RemoteRoute,
+        method: str,
+        priority: int,
+    ) -> None:
+        bucket = await self.limiter.acquire(method, route, priority)
+        tickets[id] = bucket
+        _send(writer, ['acquired', id])
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # buckets let through for requests which haven't gotten a response yet
+        tickets: dict[int, Bucket] = {}
+        waiting: dict[int, asyncio.Task[None]] = {}
+
+        try:
+            while True:
+                op, id, *args = await _receive(reader)
+
+                if op == 'acquire':
+                    method, path, major, priority = args
+                    task = asyncio.create_task(
+                        self._acquire(
+                            writer,
+                            tickets,
+                            id,
+                            _RemoteRoute(path, major),
+                            method,
+                            priority,
+                        )
+                    )
+                    waiting[id] = task
+                    task.add_done_callback(lambda _, id=id: waiting.pop(id, None))
+                elif op == 'update':
+                    method, path, major, headers = args
+                    # the request may have been cancelled meanwhile
+                    bucket = tickets.pop(id, None)
+                    if bucket is not None:
+                        self.limiter.update(
+                            method, _RemoteRoute(path, major), bucket, headers
+                        )
+                elif op == 'rate_limited':
+                    method, path, major, retry_after, scope = args
+                    route = _RemoteRoute(path, major)
+                    self.limiter.rate_limited(
+                        method,
+                        route,
+                        self.limiter.get_bucket(method, route),
+                        retry_after,
+                        scope,
+                    )
+                elif op == 'cancel':
+                    task = waiting.pop(id, None)
+                    if task is not None:
+                        task.cancel()
+                    bucket = tickets.pop(id, None)
+                    if bucket is not None:
+                        bucket.cancel()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            _log.debug('rate limit coordinator: process disconnected')
+        finally:
+            # a process going away must not leave its requests holding buckets
+            for task in waiting.values():
+                task.cancel()
+            for bucket in tickets.values():
+                bucket.cancel()
+            writer.close()
+
+
+class _Ticket:
+    __slots__ = ('_limiter', 'id')
+
+    def __init__(self, limiter: SharedRateLimiter, id: int) -> None:
+        self._limiter = limiter
+        self.id = id
+
+    def cancel(self) -> None:
+        self._limiter._send(['cancel', self.id])
+
+
+class SharedRateLimiter(BaseRateLimiter):
+    """
+    Rate limits requests through a :class:`RateLimitCoordinator`.
+
+    Use this in every local process running with the same bot token, so they
+    don't collectively exceed its rate limits. While the coordinator can't be
+    reached, requests are rate limited by a :class:`RateLimiter` of this
+    process' own instead of failing.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The path of the coordinator's unix socket.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._ids = count()
+        self._waiters: dict[int, asyncio.Future[None]] = {}
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._receive_task: asyncio.Task[None] | None = None
+        self._connecting: asyncio.Lock | None = None
+        # used while the coordinator can't be reached
+        self._local: RateLimiter | None = None
+        self._falling_back: bool = False
+        self._reconnect_at: float = 0
+
+    async def connect(self) -> None:
+        if self._connecting is None:
+            self._connecting = asyncio.Lock()
+
+        async with self._connecting:
+            if self._writer is not None:
+                return
+
+            self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+            self._receive_task = asyncio.create_task(self._receive())
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._receive_task.cancel()
+            self._writer.close()
+            self._writer = None
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                op, id = await _receive(self._reader)
+
+                if op == 'acquired':
+                    future = self._waiters.pop(id, None)
+                    if future is not None and not future.done():
+                        future.set_result(None)
+        except (asyncio.IncompleteReadError, ConnectionError) as exc:
+            _log.debug('lost connection to the rate limit coordinator')
+            self._writer = None
+
+            for future in self._waiters.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(exc))
+            self._waiters.clear()
+
+    def _send(self, message: list[Any]) -> None:
+        if self._writer is not None:
+            _send(self._writer, message)
+
+    def _fall_back(self, exc: BaseException) -> RateLimiter:
+        if self._local is None:
+            self._local = RateLimiter()
+
+        if not self._falling_back:
+            self._falling_back = True
+            _log.warning(
+                f'could not reach the rate limit coordinator at {self.path}, '
+                f'rate limiting locally: {exc!r}'
+            )
+        self._reconnect_at = asyncio.get_running_loop().time() + _RECONNECT_AFTER
+        return self._local
+
+    async def acquire(
+        self,
+        method: str,
+        route: BaseRoute,
+        priority: int = 0,
+        deadline: float | None = None,
+    ) -> _Ticket | Bucket:
+        if self._writer is None:
+            loop = asyncio.get_running_loop()
+            if self._local is not None and loop.time() < self._reconnect_at:
+                return await self._local.acquire(method, route, priority, deadline)
+
+            try:
+                await self.connect()
+            except OSError as exc:
+                return await self._fall_back(exc).acquire(
+                    method, route, priority, deadline
+                )
+
+            if self._falling_back:
+                self._falling_back = False
+                _log.info('reconnected to the rate limit coordinator')
+
+        id = next(self._ids)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiters[id] = future
+        _send(
+            self._writer, ['acquire', id, method, route.path, _major(route), priority]
+        )
+        # loop times mean nothing to other processes, so deadlines are kept here
+        expiry = None if deadline is None else loop.call_at(deadline, _expire, future)
+
+        try:
+            await future
+        except (asyncio.CancelledError, DeadlineExceeded):
+            self._waiters.pop(id, None)
+            self._send(['cancel', id])
+            raise
+        except ConnectionError as exc:
+            # the coordinator went away while this request was waiting on it
+            return await self._fall_back(exc).acquire(method, route, priority, deadline)
+        finally:
+            if expiry is not None:
+                expiry.cancel()
+
+        return _Ticket(self, id)
+
+    def update(
+        self,
+        method: str,
+        route: BaseRoute,
+        bucket: _Ticket | Bucket,
+        headers: Mapping[str, str],
+    ) -> None:
+        if isinstance(bucket, Bucket):
+            self._local.update(method, route, bucket, headers)
+            return
+
+        self._send(
+            [
+                'update',
+                bucket.id,
+                method,
+                route.path,
+                _major(route),
+                {name: headers[name] for name in _HEADERS if name in headers},
+            ]
+        )
+
+    def rate_limited(
+        self,
+        method: str,
+        route: BaseRoute,
+        bucket: _Ticket | Bucket,
+        retry_after: float,
+        scope: str | None,
+    ) -> None:
+        if isinstance(bucket, Bucket):
+            self._local.rate_limited(method, route, bucket, retry_after, scope)
+            return
+
+        self._send(
+            [
+                'rate_limited',
+                bucket.id,
+                method,
+                route.path,
+                _major(route),
+                retry_after,
+                scope,
+            ]
+        )
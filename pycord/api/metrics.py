@@ -0,0 +1,255 @@
+# cython: language_level=3
+# Copyright (c) 2022-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Sequence
+
+if TYPE_CHECKING:
+    from .route import BaseRoute
+
+__all__: Sequence[str] = ('RequestTrace', 'MetricsSink', 'RouteMetrics', 'Histogram')
+
+
+class RequestTrace:
+    """
+    One attempt at a request made by :class:`.HTTPClient`, as passed to its
+    request and response hooks and its :class:`MetricsSink`.
+
+    Attributes
+    ----------
+    method: :class:`str`
+        The method of the request.
+    route: :class:`.BaseRoute`
+        The route of the request.
+    attempt: :class:`int`
+        Which attempt this is, counting from 0, so anything above 0 is a retry.
+    queued: :class:`float`
+        How many seconds the request waited on rate limits before being sent.
+    latency: :class:`float` | None
+        How many seconds it took from sending the request to reading its response.
+    status: :class:`int` | None
+        The status of the response, `None` if the request raised.
+    error: :class:`BaseException` | None
+        What the request raised, if it did.
+    scope: :class:`str` | None
+        The ``X-RateLimit-Scope`` of the response.
+    bucket: :class:`str` | None
+        The ``X-RateLimit-Bucket`` of the response.
+    sent: :class:`int` | None
+        How many bytes the body of the request was, `None` for multipart bodies.
+    received: :class:`int`
+        How many bytes the body of the response was.
+    context: dict[:class:`str`, Any]
+        Free for hooks to keep things in between the request and its response,
+        such as a tracing span.
+    """
+
+    __slots__ = (
+        'method',
+        'route',
+        'attempt',
+        'queued',
+        'latency',
+        'status',
+        'error',
+        'scope',
+        'bucket',
+        'sent',
+        'received',
+        'context',
+    )
+
+    def __init__(
+        self,
+        method: str,
+        route: BaseRoute,
+        attempt: int,
+        queued: float,
+        sent: int | None,
+    ) -> None:
+        self.method = method
+        self.route = route
+        self.attempt = attempt
+        self.queued = queued
+        self.sent = sent
+        self.latency: float | None = None
+        self.status: int | None = None
+        self.error: BaseException | None = None
+        self.scope: str | None = None
+        self.bucket: str | None = None
+        self.received: int = 0
+        self.context: dict[str, Any] = {}
+
+
+class MetricsSink:
+    """Where :class:`.HTTPClient` records every attempt at a request, once it's done."""
+
+    def record(self, trace: RequestTrace) -> None:
+        ...
+
+
+class Histogram:
+    """
+    Counts values into exponentially growing buckets, so percentiles can be
+    estimated without keeping every value around.
+
+    Parameters
+    ----------
+    start: :class:`float`
+        The upper bound of the first bucket.
+
+        Defaults to 0.001.
+    factor: :class:`float`
+        How much larger every bucket's upper bound is than the last one's.
+
+        Defaults to 1.25.
+    buckets: :class:`int`
+        The amount of buckets, values past the last one are counted in an extra one.
+
+        Defaults to 56, which covers up to about 3 minutes with the defaults.
+    """
+
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'max')
+
+    def __init__(
+        self, start: float = 0.001, factor: float = 1.25, buckets: int = 56
+    ) -> None:
+        self.bounds: list[float] = [start * factor**idx for idx in range(buckets)]
+        self.counts: list[int] = [0] * (buckets + 1)
+        self.count: int = 0
+        self.total: float = 0
+        self.max: float = 0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent: float) -> float:
+        """The upper bound of the bucket holding the ``percent`` percentile."""
+        target = self.count * percent / 100
+        seen = 0
+
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return (
+                    min(self.bounds[idx], self.max)
+                    if idx < len(self.bounds)
+                    else self.max
+                )
+
+        return 0.0
+
+    def summary(self) -> dict[str, float]:
+        return {
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+            'mean': self.total / self.count if self.count else 0.0,
+        }
+
+
+class _RouteStats:
+    __slots__ = (
+        'requests',
+        'retries',
+        'errors',
+        'statuses',
+        'rate_limits',
+        'sent',
+        'received',
+        'latency',
+        'queued',
+    )
+
+    def __init__(self) -> None:
+        self.requests: int = 0
+        self.retries: int = 0
+        self.errors: int = 0
+        self.statuses: dict[int, int] = {}
+        # X-RateLimit-Scope -> 429s
+        self.rate_limits: dict[str, int] = {}
+        self.sent: int = 0
+        self.received: int = 0
+        self.latency = Histogram()
+        self.queued = Histogram()
+
+
+class RouteMetrics(MetricsSink):
+    """
+    Keeps metrics per method and route template, such as
+    ``POST /channels/{channel_id}/messages``, in memory.
+
+    Every attempt is counted, so ``requests`` includes ``retries``.
+    """
+
+    def __init__(self) -> None:
+        self.routes: dict[tuple[str, str], _RouteStats] = {}
+
+    def record(self, trace: RequestTrace) -> None:
+        key = (trace.method, trace.route.path)
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = _RouteStats()
+
+        stats.requests += 1
+        if trace.attempt:
+            stats.retries += 1
+        stats.queued.add(trace.queued)
+        stats.sent += trace.sent or 0
+        stats.received += trace.received
+
+        if trace.latency is not None:
+            stats.latency.add(trace.latency)
+
+        if trace.status is None:
+            stats.errors += 1
+            return
+
+        stats.statuses[trace.status] = stats.statuses.get(trace.status, 0) + 1
+        if trace.status == 429:
+            scope = trace.scope or 'unknown'
+            stats.rate_limits[scope] = stats.rate_limits.get(scope, 0) + 1
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Every route's metrics, by ``'METHOD /route/{template}'``."""
+        return {
+            f'{method} {path}': {
+                'requests': stats.requests,
+                'retries': stats.retries,
+                'errors': stats.errors,
+                'statuses': dict(stats.statuses),
+                'rate_limits': dict(stats.rate_limits),
+                'bytes_sent': stats.sent,
+                'bytes_received': stats.received,
+                'latency': stats.latency.summary(),
+                'queued': stats.queued.summary(),
+            }
+            for (method, path), stats in self.routes.items()
+        }
+
+    def reset(self) -> None:
+        self.routes.clear()
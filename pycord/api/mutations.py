@@ -0,0 +1,401 @@
+# cython: language_level=3
+# Copyright (c) 2022-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Sequence
+
+from .broadcast import stream
+from .execution import BACKGROUND_PRIORITY
+from .routers.messages import quote_emoji
+
+if TYPE_CHECKING:
+    from ..snowflake import Snowflake
+    from ..types import Emoji
+    from . import HTTPClient
+
+__all__: Sequence[str] = ('MutationResult', 'ReactionQueue', 'RoleQueue')
+
+
+def _settle(waiting: list[asyncio.Future[None]], error: Exception | None) -> None:
+    for future in waiting:
+        if future.done():
+            continue
+        elif error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
+
+
+class MutationResult:
+    """
+    The outcome of a mutation in a bulk operation.
+
+    Attributes
+    ----------
+    id: :class:`.Snowflake`
+        What was mutated, such as a member's user id.
+    error: :class:`Exception` | None
+        Why the mutation failed, if it did.
+    """
+
+    __slots__ = ('id', 'error')
+
+    def __init__(self, id: Snowflake, error: Exception | None = None) -> None:
+        self.id = id
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return f'<MutationResult id={self.id} ok={self.ok}>'
+
+
+class _PendingRoles:
+    __slots__ = ('changes', 'reason', 'priority', 'waiting', 'task')
+
+    def __init__(self) -> None:
+        # role id -> whether it's added, the last change to a role winning
+        self.changes: dict[int, bool] = {}
+        self.reason: str | None = None
+        # the highest priority of the changes merged together
+        self.priority: int | None = None
+        self.waiting: dict[int, list[asyncio.Future[None]]] = {}
+        self.task: asyncio.Task[None] | None = None
+
+
+class RoleQueue:
+    """
+    Merges role changes to the same member.
+
+    Changes made together, such as through :func:`asyncio.gather`, or while
+    others are in flight, are sent together, each through the add or remove
+    role routes. These only touch the one role, so roles changed in between by
+    anyone else are never overwritten. A role changed again before being sent,
+    such as added and then removed, is only sent once, as its last change.
+
+    Parameters
+    ----------
+    http: :class:`.HTTPClient`
+        The client to change roles with.
+    """
+
+    def __init__(self, http: HTTPClient) -> None:
+        self._http = http
+        self._pending: dict[tuple[int, int], _PendingRoles] = {}
+
+    async def add(
+        self,
+        guild_id: Snowflake,
+        user_id: Snowflake,
+        role_id: Snowflake,
+        *,
+        reason: str | None = None,
+    ) -> None:
+        """Adds a role to a member, merged with other changes to their roles."""
+        await self._change(guild_id, user_id, role_id, True, reason, 0)
+
+    async def remove(
+        self,
+        guild_id: Snowflake,
+        user_id: Snowflake,
+        role_id: Snowflake,
+        *,
+        reason: str | None = None,
+    ) -> None:
+        """Removes a role from a member, merged with other changes to their roles."""
+        await self._change(guild_id, user_id, role_id, False, reason, 0)
+
+    async def _change(
+        self,
+        guild_id: Snowflake,
+        user_id: Snowflake,
+        role_id: Snowflake,
+        add: bool,
+        reason: str | None,
+        priority: int,
+    ) -> None:
+        # snowflakes don't hash like the ints they equal, so key by ints
+        key = (int(guild_id), int(user_id))
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingRoles()
+
+        role_id = int(role_id)
+        pending.changes[role_id] = add
+        pending.reason = reason or pending.reason
+        if pending.priority is None or priority > pending.priority:
+            pending.priority = priority
+
+        future = asyncio.get_running_loop().create_future()
+        pending.waiting.setdefault(role_id, []).append(future)
+        if pending.task is None:
+            pending.task = asyncio.create_task(self._flush(key, pending))
+        await future
+
+    async def _flush(self, key: tuple[int, int], pending: _PendingRoles) -> None:
+        guild_id, user_id = key
+        http = self._http
+        waiting: dict[int, list[asyncio.Future[None]]] = {}
+
+        async def send(
+            role_id: int, add: bool, reason: str | None, priority: int
+        ) -> None:
+            if add:
+                await http.add_guild_member_role(
+                    guild_id, user_id, role_id, reason=reason, priority=priority
+                )
+            else:
+                await http.remove_guild_member_role(
+                    guild_id, user_id, role_id, reason=reason, priority=priority
+                )
+
+        try:
+            # changes made in the same iteration, such as by gather, join in
+            await asyncio.sleep(0)
+
+            while pending.changes:
+                changes, reason = pending.changes, pending.reason
+                priority, waiting = pending.priority or 0, pending.waiting
+                pending.changes, pending.waiting = {}, {}
+                pending.reason = pending.priority = None
+
+                results = await asyncio.gather(
+                    *(
+                        send(role_id, add, reason, priority)
+                        for role_id, add in changes.items()
+                    ),
+                    return_exceptions=True,
+                )
+                for role_id, result in zip(changes, results):
+                    _settle(
+                        waiting[role_id],
+                        result if isinstance(result, Exception) else None,
+                    )
+                waiting = {}
+        except BaseException:
+            for futures in (*waiting.values(), *pending.waiting.values()):
+                for future in futures:
+                    future.cancel()
+            raise
+        finally:
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+
+    def bulk(
+        self,
+        guild_id: Snowflake,
+        user_ids: Iterable[Snowflake],
+        *,
+        add: Iterable[Snowflake] = (),
+        remove: Iterable[Snowflake] = (),
+        reason: str | None = None,
+        concurrency: int = 10,
+        completed: Iterable[Snowflake] = (),
+    ) -> AsyncIterator[MutationResult]:
+        """
+        Changes the roles of many members, yielding a result for each as
+        they complete, for reporting progress.
+
+        Parameters
+        ----------
+        guild_id: :class:`.Snowflake`
+            The guild the members are in.
+        user_ids: Iterable[:class:`.Snowflake`]
+            The members to change the roles of.
+        add: Iterable[:class:`.Snowflake`]
+            The roles to add to every member.
+        remove: Iterable[:class:`.Snowflake`]
+            The roles to remove from every member.
+        reason: :class:`str` | None
+            The reason shown in the audit log.
+
+            Defaults to `None`.
+        concurrency: :class:`int`
+            How many members may be changed at once.
+
+            Defaults to 10.
+        completed: Iterable[:class:`.Snowflake`]
+            Members to skip, such as those successfully changed by a bulk change
+            which was stopped, to resume it.
+
+            Defaults to none.
+        """
+        add, remove = list(add), list(remove)
+        # snowflakes don't hash like the ints they equal, so compare as ints
+        skip = {int(id) for id in completed}
+        pending = deque(dict.fromkeys(id for id in user_ids if int(id) not in skip))
+
+        async def change(user_id: Snowflake) -> None:
+            # nobody's waiting on each member, so they're shed before anything else
+            await asyncio.gather(
+                *(
+                    self._change(
+                        guild_id, user_id, role, True, reason, BACKGROUND_PRIORITY
+                    )
+                    for role in add
+                ),
+                *(
+                    self._change(
+                        guild_id, user_id, role, False, reason, BACKGROUND_PRIORITY
+                    )
+                    for role in remove
+                ),
+            )
+
+        return self._results(stream(pending, change, concurrency))
+
+    @staticmethod
+    async def _results(
+        results: AsyncIterator[tuple[Snowflake, Any, Exception | None]]
+    ) -> AsyncIterator[MutationResult]:
+        async with aclosing(results):
+            async for id, _, error in results:
+                yield MutationResult(id, error)
+
+
+class _Reaction:
+    __slots__ = ('message_id', 'emoji', 'key', 'add', 'waiting')
+
+    def __init__(
+        self, message_id: Snowflake, emoji: str | Emoji, key: str, add: bool
+    ) -> None:
+        self.message_id = message_id
+        self.emoji = emoji
+        self.key = key
+        self.add = add
+        self.waiting: list[asyncio.Future[None]] = []
+
+
+class ReactionQueue:
+    """
+    Paces reactions added and removed by the bot.
+
+    Reactions are limited per channel, so every channel gets its own queue,
+    sent one reaction at a time in the order they were made, while queues of
+    other channels are sent in parallel. A reaction queued again before being
+    sent, such as added and then removed, is only sent once, as its last change.
+
+    Parameters
+    ----------
+    http: :class:`.HTTPClient`
+        The client to react with.
+    """
+
+    def __init__(self, http: HTTPClient) -> None:
+        self._http = http
+        self._queues: dict[int, deque[_Reaction]] = {}
+        # reactions which aren't in flight yet, by message and emoji
+        self._unsent: dict[tuple[int, str], _Reaction] = {}
+        self._drains: set[asyncio.Task[None]] = set()
+
+    @property
+    def pending(self) -> int:
+        """The amount of reactions waiting to be sent."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def add(
+        self, channel_id: Snowflake, message_id: Snowflake, emoji: str | Emoji
+    ) -> None:
+        """Reacts to a message."""
+        await self._queue(channel_id, message_id, emoji, True)
+
+    async def remove(
+        self, channel_id: Snowflake, message_id: Snowflake, emoji: str | Emoji
+    ) -> None:
+        """Removes the bot's reaction from a message."""
+        await self._queue(channel_id, message_id, emoji, False)
+
+    async def add_many(
+        self,
+        channel_id: Snowflake,
+        message_id: Snowflake,
+        emojis: Iterable[str | Emoji],
+    ) -> None:
+        """Reacts to a message with every emoji in ``emojis``, in order."""
+        await asyncio.gather(
+            *(self.add(channel_id, message_id, emoji) for emoji in emojis)
+        )
+
+    async def _queue(
+        self,
+        channel_id: Snowflake,
+        message_id: Snowflake,
+        emoji: str | Emoji,
+        add: bool,
+    ) -> None:
+        key = quote_emoji(emoji)
+        # snowflakes don't hash like the ints they equal, so key by ints
+        queue = self._queues.get(int(channel_id))
+        if queue is None:
+            queue = self._queues[int(channel_id)] = deque()
+            task = asyncio.create_task(self._drain(int(channel_id), queue))
+            self._drains.add(task)
+            task.add_done_callback(self._drains.discard)
+
+        reaction = self._unsent.get((int(message_id), key))
+        if reaction is not None:
+            # reacting is idempotent, so only the last change matters
+            reaction.add = add
+        else:
+            reaction = _Reaction(message_id, emoji, key, add)
+            self._unsent[int(message_id), key] = reaction
+            queue.append(reaction)
+
+        future = asyncio.get_running_loop().create_future()
+        reaction.waiting.append(future)
+        await future
+
+    async def _drain(self, channel_id: int, queue: deque[_Reaction]) -> None:
+        # let the reaction which created this queue be added to it first
+        await asyncio.sleep(0)
+
+        try:
+            while queue:
+                reaction = queue[0]
+                del self._unsent[int(reaction.message_id), reaction.key]
+                try:
+                    if reaction.add:
+                        await self._http.create_reaction(
+                            channel_id, reaction.message_id, reaction.emoji
+                        )
+                    else:
+                        await self._http.delete_own_reaction(
+                            channel_id, reaction.message_id, reaction.emoji
+                        )
+                except Exception as exc:
+                    _settle(reaction.waiting, exc)
+                else:
+                    _settle(reaction.waiting, None)
+                queue.popleft()
+        except BaseException:
+            for reaction in queue:
+                self._unsent.pop((int(reaction.message_id), reaction.key), None)
+                for future in reaction.waiting:
+                    future.cancel()
+            raise
+        finally:
+            if self._queues.get(channel_id) is queue:
+                del self._queues[channel_id]
@@ -0,0 +1,196 @@
+# cython: language_level=3
+# Copyright (c) 2022-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Sequence
+
+from aiohttp import ClientSession, TCPConnector
+
+__all__: Sequence[str] = ('ConnectionPool',)
+
+_log = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """
+    The connections shared by every REST and gateway session of a bot.
+
+    REST requests share a pool of keep-alive connections, limited by ``limit``
+    and ``limit_per_host``. Gateway websockets are held open for as long as their
+    shard is, so they get a connector of their own without limits, instead of
+    starving REST requests of connections. Both cache DNS lookups.
+
+    aiohttp already sets ``TCP_NODELAY`` on every connection.
+
+    Parameters
+    ----------
+    limit: :class:`int`
+        The maximum amount of REST connections open at once, 0 for no limit.
+
+        Defaults to 100.
+    limit_per_host: :class:`int`
+        The maximum amount of REST connections open to one host at once, 0 for no limit.
+
+        Defaults to 0.
+    keepalive_timeout: :class:`float`
+        How many seconds idle connections are kept open for.
+
+        Defaults to 30.
+    ttl_dns_cache: :class:`int` | None
+        How many seconds DNS lookups are cached for, `None` caching them forever.
+
+        Defaults to 300.
+    warm_connections: :class:`int`
+        How many connections :meth:`warm_up` opens by default.
+
+        Defaults to 2.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 30,
+        ttl_dns_cache: int | None = 300,
+        warm_connections: int = 2,
+    ) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.warm_connections = warm_connections
+        self.connector: TCPConnector | None = None
+        self.gateway_connector: TCPConnector | None = None
+
+    def _create_connector(self, limit: int, limit_per_host: int) -> TCPConnector:
+        return TCPConnector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+
+    def session(self, gateway: bool = False) -> ClientSession:
+        """
+        Creates a session using this pool's connections.
+
+        Closing the session leaves the connections open, see :meth:`close`.
+
+        Parameters
+        ----------
+        gateway: :class:`bool`
+            Whether the session is for gateway websockets.
+
+            Defaults to `False`.
+        """
+        if gateway:
+            if self.gateway_connector is None:
+                self.gateway_connector = self._create_connector(0, 0)
+            connector = self.gateway_connector
+        else:
+            if self.connector is None:
+                self.connector = self._create_connector(self.limit, self.limit_per_host)
+            connector = self.connector
+
+        return ClientSession(connector=connector, connector_owner=False)
+
+    async def warm_up(
+        self,
+        session: ClientSession,
+        url: str,
+        connections: int | None = None,
+        **kwargs: Any,
+    ) -> int:
+        """
+        Opens keep-alive connections to the host of ``url`` ahead of time,
+        so the first requests made to it don't wait on DNS, TCP and TLS.
+
+        Parameters
+        ----------
+        session: :class:`aiohttp.ClientSession`
+            A session made by :meth:`session`.
+        url: :class:`str`
+            Where to GET, ideally somewhere cheap and unauthenticated.
+        connections: :class:`int` | None
+            How many connections to open.
+
+            Defaults to `None`, which opens ``warm_connections``.
+        **kwargs
+            Passed on to :meth:`aiohttp.ClientSession.get`.
+
+        Returns
+        -------
+        :class:`int`
+            How many connections the pool is keeping open, to any host.
+        """
+        amount = self.warm_connections if connections is None else connections
+
+        async def touch() -> None:
+            async with session.get(url, **kwargs) as r:
+                await r.read()
+
+        # requests made at once can't reuse each other's connections
+        results = await asyncio.gather(
+            *(touch() for _ in range(amount)), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _log.debug(f'failed to warm up a connection to {url}: {result!r}')
+
+        return sum(usage['idle'] for usage in self.utilization.values())
+
+    @property
+    def utilization(self) -> dict[str, dict[str, int]]:
+        """REST connections by host, as how many are in use, idle and allowed."""
+        if self.connector is None:
+            return {}
+
+        hosts: dict[str, dict[str, int]] = {}
+
+        def usage(key: Any) -> dict[str, int]:
+            return hosts.setdefault(
+                f'{key.host}:{key.port}',
+                {
+                    'acquired': 0,
+                    'idle': 0,
+                    'limit': self.limit_per_host or self.limit,
+                },
+            )
+
+        # aiohttp doesn't expose these publicly
+        for key, protocols in self.connector._acquired_per_host.items():
+            usage(key)['acquired'] += len(protocols)
+        for key, idle in self.connector._conns.items():
+            usage(key)['idle'] += len(idle)
+
+        return hosts
+
+    async def close(self) -> None:
+        """Closes every connection, leaving sessions from :meth:`session` unusable."""
+        for connector in (self.connector, self.gateway_connector):
+            if connector is not None:
+                await connector.close()
+
+        self.connector = None
+        self.gateway_connector = None
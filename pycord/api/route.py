@@ -26,10 +26,12 @@ __all__: Sequence[str] = ('Route', 'BaseRoute')
 
 
 class BaseRoute:
+    path: str
     guild_id: int | None
     channel_id: int | None
     webhook_id: int | None
     webhook_token: str | None
+    parameters: dict[str, str | int]
 
     def __init__(
         self,
@@ -45,6 +47,10 @@ class BaseRoute:
     def merge(self, url: str) -> str:
         pass
 
+    @property
+    def major_parameters(self) -> tuple[int | str | None, ...]:
+        ...
+
 
 class Route(BaseRoute):
     def __init__(
@@ -75,10 +81,27 @@ class Route(BaseRoute):
             **self.parameters,
         )
 
-    def __eq__(self, route: 'Route') -> bool:
+    @property
+    def major_parameters(self) -> tuple[int | str | None, ...]:
+        """The parameters Discord separates rate limit buckets by."""
+        # ids are given as snowflakes, ints or strings, which all have to be equal
+        # and hash the same, while snowflakes don't hash like the ints they equal
         return (
-            route.channel_id == self.channel_id
-            or route.guild_id == self.guild_id
-            or route.webhook_id == self.webhook_id
-            or route.webhook_token == self.webhook_token
+            None if self.guild_id is None else int(self.guild_id),
+            None if self.channel_id is None else int(self.channel_id),
+            None if self.webhook_id is None else int(self.webhook_id),
+            self.webhook_token,
+            # interaction tokens are limited like webhook tokens are
+            self.parameters.get('interaction_token'),
         )
+
+    def __eq__(self, route: object) -> bool:
+        if not isinstance(route, Route):
+            return NotImplemented
+
+        return (
+            route.path == self.path and route.major_parameters == self.major_parameters
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.path, self.major_parameters))
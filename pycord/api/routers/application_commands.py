@@ -28,6 +28,7 @@ from ...types.application_commands import (
 )
 from ...types.interaction import InteractionResponse
 from ...utils import remove_undefined
+from ..execution import INTERACTION_PRIORITY
 from ..route import Route
 from .base import BaseRouter
 
@@ -309,6 +310,7 @@ class ApplicationCommands(BaseRouter):
         interaction_id: Snowflake,
         interaction_token: str,
         response: InteractionResponse,
+        deadline: float | None = None,
     ) -> None:
         await self.request(
             'POST',
@@ -318,6 +320,8 @@ class ApplicationCommands(BaseRouter):
                 interaction_token=interaction_token,
             ),
             data=response,
+            priority=INTERACTION_PRIORITY,
+            deadline=deadline,
         )
 
     async def get_original_interaction_response(
@@ -330,4 +334,5 @@ class ApplicationCommands(BaseRouter):
                 interaction_id=interaction_id,
                 interaction_token=interaction_token,
             ),
+            priority=INTERACTION_PRIORITY,
         )
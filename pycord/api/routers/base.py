@@ -31,11 +31,13 @@ class BaseRouter:
         self,
         method: str,
         route: BaseRoute,
-        data: dict[str, Any] | None = None,
+        data: dict[str, Any] | bytes | None = None,
         files: list[File] | None = None,
         form: list[dict[str, Any]] | None = None,
         *,
         reason: str | None = None,
         query_params: dict[str, str] | None = None,
+        priority: int = 0,
+        deadline: float | None = None,
     ) -> REQUEST_RETURN:
         ...
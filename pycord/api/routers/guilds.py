@@ -234,7 +234,7 @@ class Guilds(BaseRouter):
         )
 
     async def get_guild_member(
-        self, guild_id: Snowflake, user_id: Snowflake
+        self, guild_id: Snowflake, user_id: Snowflake, *, priority: int = 0
     ) -> GuildMember:
         return await self.request(
             'GET',
@@ -243,6 +243,7 @@ class Guilds(BaseRouter):
                 guild_id=guild_id,
                 user_id=user_id,
             ),
+            priority=priority,
         )
 
     async def list_guild_members(
@@ -320,6 +321,7 @@ class Guilds(BaseRouter):
         communication_disabled_until: datetime.datetime | None | MissingEnum = MISSING,
         flags: int | None | MissingEnum = MISSING,
         reason: str | None = None,
+        priority: int = 0,
     ) -> GuildMember:
         if communication_disabled_until:
             communication_disabled_until = communication_disabled_until.isoformat()
@@ -341,6 +343,7 @@ class Guilds(BaseRouter):
             ),
             remove_undefined(**payload),
             reason=reason,
+            priority=priority,
         )
 
     async def modify_current_member(
@@ -367,6 +370,7 @@ class Guilds(BaseRouter):
         role_id: Snowflake,
         *,
         reason: str | None = None,
+        priority: int = 0,
     ) -> None:
         await self.request(
             'PUT',
@@ -377,6 +381,7 @@ class Guilds(BaseRouter):
                 role_id=role_id,
             ),
             reason=reason,
+            priority=priority,
         )
 
     async def remove_guild_member_role(
@@ -386,6 +391,7 @@ class Guilds(BaseRouter):
         role_id: Snowflake,
         *,
         reason: str | None = None,
+        priority: int = 0,
     ) -> None:
         await self.request(
             'DELETE',
@@ -396,6 +402,7 @@ class Guilds(BaseRouter):
                 role_id=role_id,
             ),
             reason=reason,
+            priority=priority,
         )
 
     async def remove_guild_member(
@@ -33,7 +33,40 @@ from ..route import Route
 from .base import BaseRouter
 
 
+def quote_emoji(emoji: str | Emoji) -> str:
+    """Formats an emoji for a reaction route."""
+    # emojis are TypedDicts, which can't be checked with isinstance
+    if isinstance(emoji, dict):
+        emoji = (
+            emoji['name']
+            if emoji.get('id') is None
+            else f'{emoji["name"]}:{emoji["id"]}'
+        )
+    return quote(emoji)
+
+
 class Messages(BaseRouter):
+    async def get_channel_messages(
+        self,
+        channel_id: Snowflake,
+        *,
+        around: Snowflake | MissingEnum = MISSING,
+        before: Snowflake | MissingEnum = MISSING,
+        after: Snowflake | MissingEnum = MISSING,
+        limit: int | MissingEnum = MISSING,
+    ) -> list[Message]:
+        params = {
+            'around': around,
+            'before': before,
+            'after': after,
+            'limit': limit,
+        }
+        return await self.request(
+            'GET',
+            Route('/channels/{channel_id}/messages', channel_id=channel_id),
+            query_params=remove_undefined(**params),
+        )
+
     async def create_message(
         self,
         channel_id: Snowflake,
@@ -86,9 +119,7 @@ class Messages(BaseRouter):
         message_id: Snowflake,
         emoji: str | Emoji,
     ) -> None:
-        if isinstance(emoji, Emoji):
-            emoji = f'{emoji.name}:{emoji.id}'
-        emoji = quote(emoji)
+        emoji = quote_emoji(emoji)
         await self.request(
             'PUT',
             Route(
@@ -105,9 +136,7 @@ class Messages(BaseRouter):
         message_id: Snowflake,
         emoji: str | Emoji,
     ) -> None:
-        if isinstance(emoji, Emoji):
-            emoji = f'{emoji.name}:{emoji.id}'
-        emoji = quote(emoji)
+        emoji = quote_emoji(emoji)
         await self.request(
             'DELETE',
             Route(
@@ -125,9 +154,7 @@ class Messages(BaseRouter):
         emoji: str | Emoji,
         user_id: Snowflake,
     ) -> None:
-        if isinstance(emoji, Emoji):
-            emoji = f'{emoji.name}:{emoji.id}'
-        emoji = quote(emoji)
+        emoji = quote_emoji(emoji)
         await self.request(
             'DELETE',
             Route(
@@ -148,9 +175,7 @@ class Messages(BaseRouter):
         limit: int | MissingEnum = MISSING,
         after: Snowflake | MissingEnum = MISSING,
     ) -> list[User]:
-        if isinstance(emoji, Emoji):
-            emoji = f'{emoji.name}:{emoji.id}'
-        emoji = quote(emoji)
+        emoji = quote_emoji(emoji)
         params = {
             'limit': limit,
             'after': after,
@@ -186,9 +211,7 @@ class Messages(BaseRouter):
         message_id: Snowflake,
         emoji: str | Emoji,
     ) -> None:
-        if isinstance(emoji, Emoji):
-            emoji = f'{emoji.name}:{emoji.id}'
-        emoji = quote(emoji)
+        emoji = quote_emoji(emoji)
         await self.request(
             'DELETE',
             Route(
@@ -211,6 +234,7 @@ class Messages(BaseRouter):
         components: list[Component] | None | MissingEnum = MISSING,
         files: list[File] | None | MissingEnum = MISSING,
         attachments: list[Attachment] | None | MissingEnum = MISSING,
+        coalesce: bool = False,
     ) -> Message:
         data = {
             'content': content,
@@ -220,6 +244,14 @@ class Messages(BaseRouter):
             'components': components,
             'attachments': attachments,
         }
+        if coalesce:
+            # merged with edits made while another is in flight or rate limited
+            if files:
+                raise ValueError('Edits uploading files cannot be coalesced')
+            return await self.edits.edit(
+                channel_id, message_id, remove_undefined(**data)
+            )
+
         return await self.request(
             'PATCH',
             Route(
@@ -237,6 +269,7 @@ class Messages(BaseRouter):
         message_id: Snowflake,
         *,
         reason: str | None = None,
+        priority: int = 0,
     ) -> None:
         await self.request(
             'DELETE',
@@ -246,6 +279,7 @@ class Messages(BaseRouter):
                 message_id=message_id,
             ),
             reason=reason,
+            priority=priority,
         )
 
     async def bulk_delete_messages(
@@ -254,6 +288,7 @@ class Messages(BaseRouter):
         message_ids: list[Snowflake],
         *,
         reason: str | None = None,
+        priority: int = 0,
     ) -> None:
         await self.request(
             'POST',
@@ -265,6 +300,7 @@ class Messages(BaseRouter):
                 'messages': message_ids,
             },
             reason=reason,
+            priority=priority,
         )
 
     async def pin_message(
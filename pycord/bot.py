@@ -19,10 +19,15 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE
 import asyncio
-from typing import Any, AsyncGenerator, Type, TypeVar
+import logging
+import os
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Callable, Iterable, Type, TypeVar
 
 from aiohttp import BasicAuth
 
+from .api import BroadcastResult, ConnectionPool, MetricsSink, RequestCache
+from .api.execution import BaseRateLimiter, RateLimiter, RetryPolicy
 from .application_role_connection_metadata import ApplicationRoleConnectionMetadata
 from .audit_log import AuditLog
 from .commands import Group
@@ -36,9 +41,16 @@ from .errors import BotException, NoIdentifiesLeft, OverfilledShardsException
 from .events.event_manager import Event
 from .file import File
 from .flags import Intents, SystemChannelFlags
-from .gateway import PassThrough, ShardCluster, ShardManager
+from .gateway import (
+    HandoffServer,
+    PassThrough,
+    ReconnectPolicy,
+    ShardCluster,
+    ShardManager,
+)
 from .guild import Guild, GuildPreview
 from .interface import print_banner, start_logging
+from .message import Message
 from .missing import MISSING, Maybe, MissingEnum
 from .snowflake import Snowflake
 from .state import State
@@ -48,6 +60,7 @@ from .user import User
 from .utils import chunk, get_arg_defaults
 
 T = TypeVar('T')
+_log = logging.getLogger(__name__)
 
 
 class Bot:
@@ -65,7 +78,8 @@ class Bot:
 
         Defaults to `None`.
     max_messages: :class:`int`
-        The maximum amount of Messages to cache
+        The maximum amount of Messages to cache, or 0 to not cache or load
+        message events nothing listens for.
     shards: :class:`int` | list[:class:`int`]
         The amount of shards this bot should launch with.
 
@@ -79,6 +93,50 @@ class Bot:
     global_shard_status: :class:`int`
         The amount of shards globally deployed.
         Only supported on bots not using `.cluster`.
+    reconnect_policy: :class:`.ReconnectPolicy` | None
+        How to pace gateway reconnects across shards.
+
+        Defaults to `None`, which uses the default :class:`.ReconnectPolicy`.
+    handoff_path: :class:`str` | None
+        The unix socket path to hand shards over between deploys on.
+        If a previous process is serving on it, its shards are resumed instead
+        of identified, after which it exits. This process then serves on it
+        for the next deploy.
+
+        Defaults to `None`.
+    rate_limiter: :class:`.BaseRateLimiter` | None
+        Where to keep REST rate limit state, such as a :class:`.SharedRateLimiter`
+        for bots running across multiple processes.
+
+        Defaults to `None`, which keeps it in this process.
+    request_cache: :class:`.RequestCache` | None
+        Coalesces identical GET requests and caches their responses.
+
+        Defaults to `None`.
+    typed_payloads: :class:`bool`
+        Whether to decode the hottest gateway and REST payloads straight into
+        msgspec Structs, instead of into dicts. Requires msgspec.
+
+        Defaults to `False`.
+    connection_pool: :class:`.ConnectionPool` | None
+        The connections shared by REST requests and shards. Its ``warm_connections``
+        are opened to Discord on startup, before any interaction needs them.
+
+        Defaults to `None`, which uses the default :class:`.ConnectionPool`.
+    retry_policy: :class:`.RetryPolicy` | None
+        Which failed REST requests are retried, and when.
+
+        Defaults to `None`, which uses the default :class:`.RetryPolicy`.
+    metrics: :class:`.MetricsSink` | None
+        Where to record every REST request to, such as a :class:`.RouteMetrics`.
+
+        Defaults to `None`.
+    rate_limit_state: :class:`str` | None
+        The file to save REST rate limit buckets to on exit, and continue from
+        on startup, so a restarted bot keeps pacing the routes it was pacing.
+        Only used with the default :class:`.RateLimiter`.
+
+        Defaults to `None`.
 
     Attributes
     ----------
@@ -99,17 +157,38 @@ class Bot:
         proxy: str | None = None,
         proxy_auth: BasicAuth | None = None,
         verbose: bool = False,
+        reconnect_policy: ReconnectPolicy | None = None,
+        handoff_path: str | None = None,
+        rate_limiter: BaseRateLimiter | None = None,
+        request_cache: RequestCache | None = None,
+        typed_payloads: bool = False,
+        connection_pool: ConnectionPool | None = None,
+        retry_policy: RetryPolicy | None = None,
+        metrics: MetricsSink | None = None,
+        rate_limit_state: str | None = None,
     ) -> None:
         self.intents: Intents = intents
         self.max_messages: int = max_messages
         self._state: State = State(
-            intents=self.intents, max_messages=self.max_messages, verbose=verbose
+            intents=self.intents,
+            max_messages=self.max_messages,
+            verbose=verbose,
+            reconnect_policy=reconnect_policy,
+            rate_limiter=rate_limiter,
+            request_cache=request_cache,
+            typed_payloads=typed_payloads,
+            connection_pool=connection_pool,
+            retry_policy=retry_policy,
+            metrics=metrics,
         )
         self._shards = shards
         self._logging_flavor: int | str | dict[str, Any] = logging_flavor
         self._print_banner = print_banner_on_startup
         self._proxy = proxy
         self._proxy_auth = proxy_auth
+        self._handoff_path = handoff_path
+        self._handoff: HandoffServer | None = None
+        self._rate_limit_state = rate_limit_state
         if shards and not global_shard_status:
             if isinstance(shards, list):
                 self._global_shard_status = len(shards)
@@ -124,11 +203,23 @@ class Bot:
     def user(self) -> User:
         return self._state.user
 
+    @property
+    def reconnect_policy(self) -> ReconnectPolicy:
+        """The policy pacing gateway reconnects, which also holds reconnect metrics."""
+        return self._state.reconnect_policy
+
+    @property
+    def event_skip_ratio(self) -> float:
+        """The share of gateway events no event had to be built for, from 0 to 1."""
+        return self._state.event_manager.skip_ratio
+
     async def _run_async(self, token: str) -> None:
         start_logging(flavor=self._logging_flavor)
         self._state.bot_init(
             token=token, clustered=False, proxy=self._proxy, proxy_auth=self._proxy_auth
         )
+        self._restore_rate_limits()
+        await self._state.http.warm_up()
 
         info = await self._state.http.get_gateway_bot()
         session_start_limit = info['session_start_limit']
@@ -159,8 +250,20 @@ class Bot:
             proxy=self._proxy,
             proxy_auth=self._proxy_auth,
         )
+
+        if self._handoff_path is not None and os.path.exists(self._handoff_path):
+            try:
+                await sharder.take_over(self._handoff_path)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # nobody was serving anymore, or they stopped halfway
+                pass
+
         await sharder.start()
         self._state.shard_managers.append(sharder)
+
+        if self._handoff_path is not None:
+            self._handoff = HandoffServer(self._state, self._handoff_path)
+            await self._handoff.start()
         while not self._state.raw_user:
             self._state._raw_user_fut: asyncio.Future[None] = asyncio.Future()
             await self._state._raw_user_fut
@@ -183,19 +286,46 @@ class Bot:
 
         await self._run_until_exited()
 
+    def _restore_rate_limits(self) -> None:
+        limiter = self._state.http._rate_limiter
+        if self._rate_limit_state is not None and isinstance(limiter, RateLimiter):
+            limiter.restore(self._rate_limit_state)
+
+    def _save_rate_limits(self) -> None:
+        limiter = self._state.http._rate_limiter
+        if self._rate_limit_state is not None and isinstance(limiter, RateLimiter):
+            try:
+                limiter.save(self._rate_limit_state)
+            except OSError as exc:
+                # shutting down matters more than the next start's rate limits
+                _log.warning(
+                    f'could not save rate limit state to {self._rate_limit_state}: {exc!r}'
+                )
+
     async def _run_until_exited(self) -> None:
         try:
-            await asyncio.Future()
+            if self._handoff is not None:
+                # resolves once every shard was handed over to a new process
+                await self._handoff.done
+            else:
+                await asyncio.Future()
         except (asyncio.CancelledError, KeyboardInterrupt):
-            # most things are already handled by the asyncio.run function
-            # the only thing we have to worry about are aiohttp errors
-            await self._state.http.close_session()
-            for sm in self._state.shard_managers:
-                await sm.session.close()
+            pass
+
+        # most things are already handled by the asyncio.run function
+        # the only thing we have to worry about are aiohttp errors
+        if self._handoff is not None:
+            self._handoff.close()
 
-            if self._state._clustered:
-                for sc in self._state.shard_clusters:
-                    sc.keep_alive.set_result(None)
+        self._save_rate_limits()
+        await self._state.http.close_session()
+        for sm in self._state.shard_managers:
+            await sm.close()
+        await self._state.connection_pool.close()
+
+        if self._state._clustered:
+            for sc in self._state.shard_clusters:
+                sc.keep_alive.set_result(None)
 
     def run(self, token: str) -> None:
         """
@@ -218,6 +348,8 @@ class Bot:
         self._state.bot_init(
             token=token, clustered=True, proxy=self._proxy, proxy_auth=self._proxy_auth
         )
+        self._restore_rate_limits()
+        await self._state.http.warm_up()
 
         info = await self._state.http.get_gateway_bot()
         session_start_limit = info['session_start_limit']
@@ -361,8 +493,37 @@ class Bot:
 
         return wrapper
 
-    def wait_for(self, event: T) -> asyncio.Future[T]:
-        return self._state.event_manager.wait_for(event)
+    def wait_for(
+        self,
+        event: T,
+        *,
+        check: Callable[[T], bool] | None = None,
+        timeout: float | None = None,
+        **keys: Any,
+    ) -> asyncio.Future[T]:
+        """
+        Wait for the next event matching ``keys`` and ``check``
+
+        Parameters
+        ----------
+        event: :class:`Event`
+            The event to wait for.
+        check: Callable[[:class:`Event`], :class:`bool`] | None
+            Only resolve for events this returns `True` for.
+
+            Defaults to `None`.
+        timeout: :class:`float` | None
+            How long to wait before failing with :exc:`asyncio.TimeoutError`.
+
+            Defaults to `None`, which waits forever.
+        **keys
+            Any of ``message_id``, ``custom_id``, ``user_id`` and ``channel_id``
+            the event must be for, such as ``channel_id=channel.id, user_id=user.id``.
+            Prefer these over ``check`` when there are many waiters.
+        """
+        return self._state.event_manager.wait_for(
+            event, check=check, timeout=timeout, **keys
+        )
 
     def command(
         self,
@@ -411,7 +572,7 @@ class Bot:
 
     @property
     async def guilds(self) -> AsyncGenerator[Guild, None]:
-        return await (self._state.store.sift('guilds')).get_all()
+        return await self._state.store.sift('guilds').get_all()
 
     async def get_application_role_connection_metadata_records(
         self,
@@ -513,6 +674,53 @@ class Bot:
         )
         return Guild(data, self._state)
 
+    async def broadcast(
+        self,
+        channels: Iterable[Snowflake | Any],
+        payload: dict[str, Any],
+        *,
+        concurrency: int | None = None,
+        completed: Iterable[Snowflake] = (),
+    ) -> AsyncGenerator[BroadcastResult, None]:
+        """Send the same message to many channels, as fast as rate limits allow.
+
+        Results are yielded as each send completes, with the sent :class:`Message`,
+        or the error sending failed with. See :meth:`.HTTPClient.broadcast`.
+
+        Parameters
+        ----------
+        channels: Iterable[:class:`Snowflake` | :class:`.TextChannel`]
+            The channels, or channel ids, to send to.
+        payload: dict[:class:`str`, Any]
+            The message to send, such as ``{'content': 'Hello!'}``.
+        concurrency: :class:`int` | None
+            How many sends may be in flight at once.
+
+            Defaults to `None`, which is the global rate limit.
+        completed: Iterable[:class:`Snowflake`]
+            Channel ids to skip, to resume a broadcast which was stopped.
+
+            Defaults to none.
+
+        Yields
+        ------
+        :class:`.BroadcastResult`
+            The outcome of sending to a channel.
+        """
+        results = self._state.http.broadcast(
+            (getattr(channel, 'id', channel) for channel in channels),
+            payload,
+            concurrency=concurrency,
+            completed=completed,
+        )
+
+        # stopping this stops the broadcast itself too
+        async with aclosing(results):
+            async for result in results:
+                if result.message is not None:
+                    result.message = Message(result.message, self._state)
+                yield result
+
     async def get_guild(self, guild_id: Snowflake) -> Guild:
         """Get a guild.
 
@@ -20,17 +20,20 @@
 # SOFTWARE
 from __future__ import annotations
 
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta, timezone
 from functools import cached_property
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable
 
+from .api.execution import BACKGROUND_PRIORITY
 from .embed import Embed
 from .enums import ChannelType, OverwriteType, VideoQualityMode
-from .errors import ComponentException
+from .errors import ComponentException, NotFound
 from .file import File
 from .flags import ChannelFlags, Permissions
 from .member import Member
 from .message import AllowedMentions, Message, MessageReference
+from .message_iterator import MessageHistory
 from .missing import MISSING, Maybe, MissingEnum
 from .snowflake import Snowflake
 from .types import (
@@ -48,6 +51,10 @@ if TYPE_CHECKING:
     from .ui.house import House
 
 
+# bulk deletes are only allowed on messages younger than this
+BULK_DELETE_MAX_AGE = timedelta(days=14)
+
+
 class _Overwrite:
     __slots__ = ('id', 'type', 'allow', 'deny')
 
@@ -374,6 +381,130 @@ class MessageableChannel(Channel):
     ) -> None:
         await self._state.http.bulk_delete_messages(self.id, messages, reason=reason)
 
+    def history(
+        self,
+        limit: int | None = 100,
+        *,
+        before: datetime | Snowflake | None = None,
+        after: datetime | Snowflake | None = None,
+    ) -> MessageHistory:
+        """Lists the messages in this channel, newest first.
+
+        Parameters
+        ----------
+        limit: :class:`int` | None
+            The maximum number of messages to list, or `None` for every message.
+
+            Defaults to 100.
+        before: :class:`datetime.datetime` | :class:`Snowflake` | None
+            Only list messages sent before this time or message.
+        after: :class:`datetime.datetime` | :class:`Snowflake` | None
+            Only list messages sent after this time or message.
+
+        Returns
+        -------
+        :class:`MessageHistory`
+            An async iterator fetching messages a page at a time.
+        """
+        return MessageHistory(
+            self._state, self.id, limit=limit, before=before, after=after
+        )
+
+    async def purge(
+        self,
+        limit: int | None = 100,
+        *,
+        check: Callable[[Message], bool] | None = None,
+        before: datetime | Snowflake | None = None,
+        after: datetime | Snowflake | None = None,
+        reason: str | None = None,
+    ) -> list[Message]:
+        """Deletes many messages in this channel.
+
+        Messages under 14 days old are deleted 100 at a time by bulk deletes,
+        older ones are deleted one by one. Deletes start while the history is
+        still being listed and run in parallel, as fast as rate limits allow.
+
+        Parameters
+        ----------
+        limit: :class:`int` | None
+            The maximum number of messages to look through, or `None` for every message.
+
+            Defaults to 100.
+        check: Callable[[:class:`Message`], :class:`bool`] | None
+            Only delete messages for which this returns `True`.
+        before: :class:`datetime.datetime` | :class:`Snowflake` | None
+            Only delete messages sent before this time or message.
+        after: :class:`datetime.datetime` | :class:`Snowflake` | None
+            Only delete messages sent after this time or message.
+        reason: :class:`str` | None
+            The reason shown in the audit log.
+
+        Returns
+        -------
+        list[:class:`Message`]
+            The messages deleted, newest first.
+        """
+        http = self._state.http
+        # a minute of leeway, so messages don't age out while being purged
+        cutoff = Snowflake.from_datetime(
+            datetime.now(timezone.utc) - BULK_DELETE_MAX_AGE + timedelta(minutes=1)
+        )
+        deleted: list[Message] = []
+        chunk: list[Message] = []
+        tasks: list[asyncio.Task[None]] = []
+
+        async def delete_one(message: Message) -> None:
+            try:
+                await http.delete_message(
+                    self.id, message.id, reason=reason, priority=BACKGROUND_PRIORITY
+                )
+            except NotFound:
+                # someone else got to it first
+                return
+            deleted.append(message)
+
+        async def delete_bulk(messages: list[Message]) -> None:
+            await http.bulk_delete_messages(
+                self.id,
+                [message.id for message in messages],
+                reason=reason,
+                priority=BACKGROUND_PRIORITY,
+            )
+            deleted.extend(messages)
+
+        def flush() -> None:
+            # bulk deletes need at least two messages
+            if len(chunk) == 1:
+                tasks.append(asyncio.create_task(delete_one(chunk[0])))
+            elif chunk:
+                tasks.append(asyncio.create_task(delete_bulk(chunk.copy())))
+            chunk.clear()
+
+        try:
+            history = self.history(limit, before=before, after=after)
+            async for page in history.pages():
+                for message in page:
+                    if check is not None and not check(message):
+                        continue
+
+                    if message.id > cutoff:
+                        chunk.append(message)
+                        if len(chunk) == 100:
+                            flush()
+                    else:
+                        tasks.append(asyncio.create_task(delete_one(message)))
+
+            flush()
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        deleted.sort(key=lambda message: message.id, reverse=True)
+        return deleted
+
 
 class AudioChannel(GuildChannel):
     def __init__(self, data: DiscordChannel, state: State) -> None:
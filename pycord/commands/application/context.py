@@ -47,9 +47,24 @@ class Context(Interaction):
         Defer this interaction. Only defers if not deferred.
         """
 
+        await self.response._stop_auto_defer()
         if not self.response._deferred:
             await self.response.defer()
 
+    def auto_defer(self, after: float = 2.2) -> None:
+        """
+        Defers this interaction if it still wasn't responded to ``after`` seconds
+        after it was received. :meth:`send` then sends a followup instead.
+
+        Parameters
+        ----------
+        after: :class:`float`
+            How many seconds after receiving the interaction to defer it at.
+
+            Defaults to 2.2.
+        """
+        self.response.auto_defer(after)
+
     async def send(
         self,
         content: str | MissingEnum = MISSING,
@@ -77,6 +92,8 @@ class Context(Interaction):
             Whether to ephermalize this message or not.
         """
 
+        # an automatic defer on its way makes this a followup
+        await self.response._stop_auto_defer()
         if self.response.responded:
             if ephemeral:
                 if not isinstance(flags, MessageFlags):
@@ -57,6 +57,10 @@ class InvalidAuth(GatewayException):
     pass
 
 
+class RateLimitTimeout(GatewayException):
+    pass
+
+
 class HTTPException(PycordException):
     def __init__(self, resp: ClientResponse, data: dict[str, Any] | None) -> None:
         self._response = resp
@@ -77,6 +81,14 @@ class HTTPException(PycordException):
         super().__init__(f'{resp.status} {resp.reason} (code: {self.code}): {message}')
 
 
+class CircuitOpen(PycordException):
+    pass
+
+
+class DeadlineExceeded(PycordException):
+    pass
+
+
 class Forbidden(HTTPException):
     pass
 
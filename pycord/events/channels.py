@@ -33,6 +33,7 @@ if TYPE_CHECKING:
 
 class ChannelCreate(Event):
     _name = 'CHANNEL_CREATE'
+    _id_key = 'channel_id'
 
     async def _async_load(self, data: dict[str, Any], state: 'State') -> None:
         channel = identify_channel(data, state)
@@ -44,6 +45,7 @@ class ChannelCreate(Event):
 
 class ChannelUpdate(Event):
     _name = 'CHANNEL_UPDATE'
+    _id_key = 'channel_id'
 
     async def _async_load(self, data: dict[str, Any], state: 'State') -> None:
         channel = identify_channel(data, state)
@@ -57,6 +59,13 @@ class ChannelUpdate(Event):
 
 class ChannelDelete(Event):
     _name = 'CHANNEL_DELETE'
+    _id_key = 'channel_id'
+
+    @classmethod
+    async def _cache(cls, data: dict[str, Any], state: 'State') -> bool:
+        deps = [Snowflake(data['guild_id'])] if data.get('guild_id') else []
+        await (state.store.sift('channels')).discard(deps, Snowflake(data['id']))
+        return True
 
     async def _async_load(self, data: dict[str, Any], state: 'State') -> None:
         channel = identify_channel(data, state)
@@ -70,6 +79,7 @@ class ChannelDelete(Event):
 
 class ChannelPinsUpdate(_GuildAttr):
     _name = 'CHANNEL_PINS_UPDATE'
+    _stateless = True
 
     async def _async_load(self, data: dict[str, Any], state: 'State') -> None:
         self.channel_id: Snowflake = Snowflake(data.get('channel_id'))
@@ -81,6 +91,11 @@ PinsUpdate = ChannelPinsUpdate
 
 class MessageCreate(Event):
     _name = 'MESSAGE_CREATE'
+    _id_key = 'message_id'
+
+    @classmethod
+    def _caches(cls, state: 'State') -> bool:
+        return state.max_messages != 0
 
     async def _async_load(self, data: dict[str, Any], state: 'State') -> None:
         message = Message(data, state)
@@ -95,6 +110,11 @@ class MessageCreate(Event):
 
 class MessageUpdate(Event):
     _name = 'MESSAGE_UPDATE'
+    _id_key = 'message_id'
+
+    @classmethod
+    def _caches(cls, state: 'State') -> bool:
+        return state.max_messages != 0
 
     previous: Message | None
     message: Message
@@ -117,6 +137,11 @@ class MessageUpdate(Event):
 
 class MessageDelete(Event):
     _name = 'MESSAGE_DELETE'
+    _id_key = 'message_id'
+
+    @classmethod
+    def _caches(cls, state: 'State') -> bool:
+        return state.max_messages != 0
 
     async def _async_load(self, data: dict[str, Any], state: 'State') -> None:
         self.message_id: Snowflake = Snowflake(data['id'])
@@ -133,12 +158,15 @@ class MessageDelete(Event):
 class MessageBulkDelete(Event):
     _name = 'MESSAGE_DELETE_BULK'
 
+    @classmethod
+    def _caches(cls, state: 'State') -> bool:
+        return state.max_messages != 0
+
     async def _async_load(self, data: dict[str, Any], state: 'State') -> None:
         channel_id = Snowflake(data['channel_id'])
-        bulk: list[Message | int] = [
-            (await (state.store.sift('messages')).discard([channel_id], message_id))
-            or message_id
-            for message_id in (Snowflake(id) for id in data['ids'])
-        ]
+        ids = [Snowflake(id) for id in data['ids']]
+        # one pass over the cache for the whole batch, instead of one per message
+        cached = await (state.store.sift('messages')).discard_many([channel_id], ids)
+        bulk: list[Message | int] = [cached.get(id, id) for id in ids]
         self.deleted_messages = bulk
         self.length = len(bulk)
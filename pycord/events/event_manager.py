@@ -22,7 +22,7 @@
 
 import asyncio
 from asyncio import Future
-from typing import TYPE_CHECKING, Any, Type, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Type, TypeVar
 
 from ..types import AsyncFunc
 
@@ -32,10 +32,28 @@ if TYPE_CHECKING:
 
 T = TypeVar('T', bound='Event')
 
+# what waiters can be indexed by, most selective first
+WAIT_KEYS = ('message_id', 'custom_id', 'user_id', 'channel_id')
+
 
 class Event:
     _name: str
     _state: 'State'
+    # events which only build models for listeners, without touching the cache,
+    # aren't loaded at all when nothing listens or waits for them
+    _stateless: bool = False
+    # which of WAIT_KEYS the payload's own id is, if any
+    _id_key: str | None = None
+
+    @classmethod
+    def _caches(cls, state: 'State') -> bool:
+        """Whether the cache needs this loaded, even when nothing listens for it."""
+        return not cls._stateless
+
+    @classmethod
+    async def _cache(cls, data: dict[str, Any], state: 'State') -> bool:
+        """Does only the cache work of :meth:`_async_load`, if it can be done alone."""
+        return False
 
     async def _is_publishable(self, data: dict[str, Any], state: 'State') -> bool:
         return True
@@ -44,6 +62,60 @@ class Event:
         ...
 
 
+def _payload_keys(event: Type[Event], data: dict[str, Any]) -> dict[str, Any]:
+    keys = {}
+
+    if event._id_key is not None and data.get('id') is not None:
+        keys[event._id_key] = int(data['id'])
+
+    for key in ('channel_id', 'message_id', 'user_id'):
+        value = data.get(key)
+        if value is not None:
+            keys.setdefault(key, int(value))
+
+    member = data.get('member')
+    user = (
+        data.get('author')
+        or data.get('user')
+        or (member.get('user') if member is not None else None)
+    )
+    if user is not None:
+        keys.setdefault('user_id', int(user['id']))
+
+    # component interactions carry the message they're on
+    message = data.get('message')
+    if message is not None:
+        keys.setdefault('message_id', int(message['id']))
+
+    inner = data.get('data')
+    if inner is not None and inner.get('custom_id') is not None:
+        keys['custom_id'] = inner['custom_id']
+
+    return keys
+
+
+class _Waiter:
+    __slots__ = ('future', 'check', 'keys', 'index')
+
+    def __init__(
+        self,
+        future: Future,
+        check: Callable[[Any], bool] | None,
+        keys: dict[str, Any],
+    ) -> None:
+        self.future = future
+        self.check = check
+        self.keys = keys
+        self.index: tuple[str, Any] | None = next(
+            ((key, keys[key]) for key in WAIT_KEYS if key in keys), None
+        )
+
+
+def _expire(future: Future) -> None:
+    if not future.done():
+        future.set_exception(asyncio.TimeoutError())
+
+
 class EventManager:
     def __init__(self, base_events: list[Type[Event]], state: 'State') -> None:
         self._base_events = base_events
@@ -52,52 +124,202 @@ class EventManager:
         # structured like:
         # EventClass: [childrenfuncs]
         self.events: dict[Type[Event], list[AsyncFunc]] = {}
+        # gateway event name -> the event classes published for it, in the order added
+        self._dispatch: dict[str, list[Type[Event]]] = {}
 
         for event in self._base_events:
             # base_events is used for caching purposes
-            self.events[event] = []
+            self._register(event)
+
+        # EventClass: {(key, value) or None: waiters}
+        self.wait_fors: dict[
+            Type[Event], dict[tuple[str, Any] | None, dict[_Waiter, None]]
+        ] = {}
+        # handlers which are still running, used to drain before shutting down
+        self._running: set[asyncio.Task] = set()
+        # gateway events received, and how many of those no event was built for
+        self.dispatched: int = 0
+        self.skipped: int = 0
 
-        self.wait_fors: dict[Type[Event], list[Future]] = {}
+    def _register(self, event: Type[Event]) -> list[AsyncFunc]:
+        funcs = self.events.get(event)
+
+        if funcs is None:
+            funcs = self.events[event] = []
+            events = self._dispatch.setdefault(event._name, [])
+            if event not in events:
+                events.append(event)
+
+        return funcs
 
     def add_event(self, event: Type[Event], func: AsyncFunc) -> None:
-        try:
-            self.events[event].append(func)
-        except KeyError:
-            self.events[event] = [func]
+        self._register(event).append(func)
+
+    def wait_for(
+        self,
+        event: Type[T],
+        *,
+        check: Callable[[T], bool] | None = None,
+        timeout: float | None = None,
+        **keys: Any,
+    ) -> Future[T]:
+        """
+        Waits for the next ``event`` matching ``keys`` and ``check``.
+
+        Parameters
+        ----------
+        event: Type[:class:`Event`]
+            The event to wait for.
+        check: Callable[[:class:`Event`], :class:`bool`] | None
+            Only resolves for events this returns `True` for.
+
+            Defaults to `None`.
+        timeout: :class:`float` | None
+            How long to wait before failing with :exc:`asyncio.TimeoutError`.
+
+            Defaults to `None`, which waits forever.
+        **keys
+            Any of ``message_id``, ``custom_id``, ``user_id`` and ``channel_id``
+            the event's payload must have. These are checked before the event is
+            built, and are much cheaper than ``check`` with many waiters.
+
+        Returns
+        -------
+        :class:`asyncio.Future`
+            Resolves with the event. Cancelling it stops waiting.
+        """
+        for key in keys:
+            if key not in WAIT_KEYS:
+                raise TypeError(
+                    f'wait_for() got an unexpected keyword argument {key!r}'
+                )
 
-    def wait_for(self, event: Type[T]) -> Future[T]:
         fut = Future()
+        waiter = _Waiter(
+            fut,
+            check,
+            {k: v if k == 'custom_id' else int(v) for k, v in keys.items()},
+        )
+        self._register(event)
+        self.wait_fors.setdefault(event, {}).setdefault(waiter.index, {})[waiter] = None
+        # however it's done, resolved, timed out or cancelled, it's stopped waiting
+        fut.add_done_callback(lambda _: self._forget(event, waiter))
 
-        try:
-            self.wait_fors[event].append(fut)
-        except KeyError:
-            self.wait_fors[event] = [fut]
+        if timeout is not None:
+            handle = fut.get_loop().call_later(timeout, _expire, fut)
+            fut.add_done_callback(lambda _: handle.cancel())
 
         return fut
 
+    def _forget(self, event: Type[Event], waiter: _Waiter) -> None:
+        index = self.wait_fors.get(event)
+        if index is None:
+            return
+
+        waiters = index.get(waiter.index)
+        if waiters is not None:
+            waiters.pop(waiter, None)
+            if not waiters:
+                del index[waiter.index]
+                if not index:
+                    del self.wait_fors[event]
+
+    def _waiting(self, event: Type[Event], data: dict[str, Any]) -> list[_Waiter]:
+        """The waiters on ``event`` whose keys ``data`` matches."""
+        index = self.wait_fors.get(event)
+        if not index:
+            return []
+
+        waiters = list(index.get(None, ()))
+        keyed = len(index) - (None in index)
+
+        # payloads are only looked into when some waiter is keyed
+        if keyed:
+            keys = _payload_keys(event, data)
+
+            for key, value in keys.items():
+                matched = index.get((key, value))
+                if matched:
+                    waiters.extend(
+                        waiter
+                        for waiter in matched
+                        if all(keys.get(k) == v for k, v in waiter.keys.items())
+                    )
+
+        return waiters
+
+    async def drain(self, timeout: float | None = None) -> None:
+        """Waits for every running event handler to finish, or ``timeout`` to pass."""
+        if self._running:
+            await asyncio.wait(self._running, timeout=timeout)
+
     async def publish(self, event_str: str, data: dict[str, Any]) -> None:
+        http = self._state.http
+        if http is not None and http.cache is not None:
+            http.cache.dispatched(event_str, data)
+
+        self.dispatched += 1
+        events = self._dispatch.get(event_str)
+
+        if events is None:
+            self.skipped += 1
+            return
+
+        built = False
+
         # in certain cases, events may be inserted during runtime which breaks dispatching
-        items = list(self.events.items())
+        for event in tuple(events):
+            funcs = self.events.get(event)
+
+            # removed from events by hand
+            if funcs is None:
+                continue
+
+            waiters = self._waiting(event, data)
+
+            if not funcs and not waiters:
+                # nothing needs the event itself, at most the cache needs its data
+                if not event._caches(self._state):
+                    continue
+                elif await event._cache(data, self._state):
+                    continue
+
+            built = True
+            eve = event()
+            dispatch = await eve._is_publishable(data, self._state)
+
+            # used in cases like GUILD_AVAILABLE
+            if dispatch is False:
+                continue
+            else:
+                await eve._async_load(data, self._state)
+
+            eve._state = self._state
 
-        for event, funcs in items:
-            if event._name == event_str:
-                eve = event()
-                dispatch = await eve._is_publishable(data, self._state)
+            for func in funcs:
+                task = asyncio.create_task(func(eve))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
 
-                # used in cases like GUILD_AVAILABLE
-                if dispatch is False:
+            for waiter in waiters:
+                # already timed out, cancelled, or resolved by an earlier dispatch
+                if waiter.future.done():
                     continue
-                else:
-                    await eve._async_load(data, self._state)
 
-                eve._state = self._state
+                if waiter.check is not None:
+                    try:
+                        if not waiter.check(eve):
+                            continue
+                    except Exception as exc:
+                        waiter.future.set_exception(exc)
+                        continue
 
-                for func in funcs:
-                    asyncio.create_task(func(eve))
+                waiter.future.set_result(eve)
 
-                wait_fors = self.wait_fors.get(event)
+        if not built:
+            self.skipped += 1
 
-                if wait_fors is not None:
-                    for wait_for in wait_fors:
-                        wait_for.set_result(eve)
-                    self.wait_fors.pop(event)
+    @property
+    def skip_ratio(self) -> float:
+        """The share of gateway events which no event had to be built for."""
+        return self.skipped / self.dispatched if self.dispatched else 0.0
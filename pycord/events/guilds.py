@@ -171,6 +171,7 @@ class GuildDelete(Event):
 
 class GuildBanCreate(_GuildAttr):
     _name = 'GUILD_BAN_ADD'
+    _stateless = True
 
     async def _async_load(self, data: dict[str, Any], state: 'State') -> None:
         guild_id: Snowflake = Snowflake(data['guild_id'])
@@ -185,6 +186,7 @@ BanAdd = GuildBanCreate
 
 class GuildBanDelete(_GuildAttr):
     _name = 'GUILD_BAN_REMOVE'
+    _stateless = True
 
     async def _async_load(self, data: dict[str, Any], state: 'State') -> None:
         guild_id: Snowflake = Snowflake(data['guild_id'])
@@ -199,6 +201,10 @@ BanDelete = GuildBanDelete
 class GuildMemberAdd(_GuildAttr):
     _name = 'GUILD_MEMBER_ADD'
 
+    @classmethod
+    def _caches(cls, state: 'State') -> bool:
+        return state.cache_guild_members
+
     async def _async_load(self, data: dict[str, Any], state: 'State') -> None:
         guild_id = Snowflake(data['guild_id'])
         member = Member(data, state, guild_id=guild_id)
@@ -236,6 +242,18 @@ MemberEdit = GuildMemberUpdate
 class GuildMemberRemove(_GuildAttr):
     _name = 'GUILD_MEMBER_REMOVE'
 
+    @classmethod
+    def _caches(cls, state: 'State') -> bool:
+        return state.cache_guild_members
+
+    @classmethod
+    async def _cache(cls, data: dict[str, Any], state: 'State') -> bool:
+        guild_id = Snowflake(data['guild_id'])
+        await (state.store.sift('members')).discard(
+            [guild_id], Snowflake(data['user']['id'])
+        )
+        return True
+
     async def _async_load(self, data: dict[str, Any], state: 'State') -> None:
         self.guild_id: Snowflake = Snowflake(data['guild_id'])
         self.user_id: Snowflake = Snowflake(data['user']['id'])
@@ -105,6 +105,11 @@ class InteractionCreate(Event):
         """
         return self
 
+    @classmethod
+    def _caches(cls, state: 'State') -> bool:
+        # components and modals are invoked from here
+        return bool(state.components or state.modals)
+
     async def _async_load(self, data: dict[str, Any], state: 'State') -> None:
         interaction = self._interaction_object(data, state, True)
 
@@ -23,7 +23,7 @@
 import asyncio
 import pathlib
 from io import BytesIO
-from typing import BinaryIO, Protocol
+from typing import AsyncIterable, BinaryIO, Callable, Protocol
 
 
 def _open_file(path: pathlib.Path) -> BinaryIO:
@@ -36,6 +36,9 @@ class File(Protocol):
     file: BinaryIO
     spoiler: bool
 
+    async def open(self) -> None:
+        """Waits until this file can be read from."""
+
     def reset(self, seek: int | bool = True) -> None:
         ...
 
@@ -44,19 +47,26 @@ class File(Protocol):
 
 
 class SysFile(File):
+    """
+    A file on disk.
+
+    It's opened in an executor, and only read from in chunks while being
+    uploaded, so large files are never fully held in memory.
+    """
+
     def __init__(
         self, path: str, filename: str | None = None, spoiler: bool = False
     ) -> None:
         self.path = pathlib.Path(path)
         self.filename = filename
-        # assumes the event loop has already started
         self.spoiler = spoiler
-        asyncio.create_task(self._hook_file())
+        # assumes the event loop has already started
+        self._hooked = asyncio.create_task(self._hook_file())
 
     async def _hook_file(self) -> None:
         loop = asyncio.get_running_loop()
 
-        self.file = await loop.run_in_executor(None, _open_file, _open_file, self._path)
+        self.file = await loop.run_in_executor(None, _open_file, self.path)
 
         # assure we have control over closures
         self._closer = self.file.close
@@ -70,6 +80,9 @@ class SysFile(File):
 
         self._original_position = self.file.tell()
 
+    async def open(self) -> None:
+        await self._hooked
+
     def reset(self, seek: int | bool = True) -> None:
         if seek:
             self.file.seek(self._original_position)
@@ -80,9 +93,13 @@ class SysFile(File):
 
 
 class BytesFile(File):
-    def __init__(self, filename: str, io: bytes | BytesIO) -> None:
+    def __init__(
+        self, filename: str, io: bytes | BytesIO, spoiler: bool = False
+    ) -> None:
+        self.path = None
         self.filename = filename
-        self.file = BytesIO(io)
+        self.spoiler = spoiler
+        self.file = io if isinstance(io, BytesIO) else BytesIO(io)
 
         # assure we have control over closures
         self._closer = self.file.close
@@ -100,3 +117,43 @@ class BytesFile(File):
     def close(self) -> None:
         self.file.close = self._closer
         self._closer()
+
+
+class StreamFile(File):
+    """
+    A file uploaded from an async source of bytes, without buffering it.
+
+    Parameters
+    ----------
+    filename: :class:`str`
+        The name of the file.
+    source: Callable[[], AsyncIterable[:class:`bytes`]]
+        Returns the file's contents in chunks.
+        It's called again for every retried upload, which starts over.
+    spoiler: :class:`bool`
+        Whether this file is marked as a spoiler.
+
+        Defaults to `False`.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        source: Callable[[], AsyncIterable[bytes]],
+        spoiler: bool = False,
+    ) -> None:
+        self.path = None
+        self.filename = filename
+        self.spoiler = spoiler
+        self._source = source
+        self.file: AsyncIterable[bytes] = source()
+
+        if self.spoiler and not self.filename.startswith('SPOILER_'):
+            self.filename = f'SPOILER_{self.filename}'
+
+    def reset(self, seek: int | bool = True) -> None:
+        if seek:
+            self.file = self._source()
+
+    def close(self) -> None:
+        ...
@@ -8,7 +8,11 @@ Advanced Implementation of the Discord Gateway
 """
 from ..events.event_manager import *
 from .cluster import *
+from .handoff import *
+from .heartbeat import *
 from .manager import *
 from .notifier import *
 from .passthrough import *
+from .reconnect import *
+from .recorder import *
 from .shard import *
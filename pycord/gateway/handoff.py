@@ -0,0 +1,289 @@
+# cython: language_level=3
+# Copyright (c) 2021-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import os
+import pickle
+import struct
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Sequence
+
+if TYPE_CHECKING:
+    from ..state import State
+    from .manager import ShardManager
+    from .shard import Shard
+
+__all__: Sequence[str] = ('HandoffServer', 'shard_for')
+
+_log = logging.getLogger(__name__)
+_HEADER = struct.Struct('<I')
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def __init__(self, file: io.BytesIO, state: State) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._state = state
+
+    def persistent_id(self, obj: Any) -> str | None:
+        # cached models reference the process' state, which is swapped for the receiver's
+        return 'state' if obj is self._state else None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, state: State) -> None:
+        super().__init__(file)
+        self._state = state
+
+    def persistent_load(self, pid: str) -> Any:
+        if pid == 'state':
+            return self._state
+        raise pickle.UnpicklingError(f'unknown persistent id {pid}')
+
+
+def _dumps(state: State, obj: Any) -> bytes:
+    buf = io.BytesIO()
+    _SnapshotPickler(buf, state).dump(obj)
+    return buf.getvalue()
+
+
+def _picklable(state: State, entries: list[tuple[Any, ...]]) -> list[tuple[Any, ...]]:
+    ret = []
+
+    for entry in entries:
+        try:
+            _dumps(state, entry)
+        except Exception as exc:
+            _log.debug(f'not handing over cached {entry[2]!r}: {exc}')
+        else:
+            ret.append(entry)
+
+    return ret
+
+
+async def _send(writer: asyncio.StreamWriter, state: State, obj: Any) -> None:
+    data = _dumps(state, obj)
+    writer.write(_HEADER.pack(len(data)) + data)
+    await writer.drain()
+
+
+async def _receive(reader: asyncio.StreamReader, state: State) -> Any:
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return _SnapshotUnpickler(io.BytesIO(await reader.readexactly(size)), state).load()
+
+
+def shard_for(guild_id: int, amount: int) -> int:
+    """The shard a guild is on, given the total amount of shards."""
+    return (guild_id >> 22) % amount
+
+
+class HandoffServer:
+    """
+    Hands this process' shards over to a replacement process.
+
+    Once a process connects through :meth:`.ShardManager.take_over`, shards are
+    detached one identify bucket at a time, and their sessions are sent over
+    alongside the cached guilds on them for the other process to resume.
+    When every shard has been handed over, running event handlers are drained
+    and :attr:`done` is resolved, after which this process can exit.
+
+    Should the other process fail or stop responding partway through, the
+    bucket being handed over is resumed here again, along with every bucket
+    after it never having left, and this process keeps serving.
+
+    .. WARNING::
+        Snapshots are pickled, so only serve on paths other users can't access.
+
+    Parameters
+    ----------
+    state: :class:`.State`
+        The state whose shard managers to hand over.
+    path: :class:`str`
+        The path of the unix socket to serve on.
+    drain_timeout: :class:`float` | None
+        How long to wait for running event handlers before finishing.
+    ack_timeout: :class:`float`
+        How long the other process has to resume a bucket of shards before
+        they're taken back.
+    """
+
+    def __init__(
+        self,
+        state: State,
+        path: str,
+        drain_timeout: float | None = 30,
+        ack_timeout: float = 60,
+    ) -> None:
+        self._state = state
+        self.path = path
+        self.drain_timeout = drain_timeout
+        self.ack_timeout = ack_timeout
+        self.done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        self._server = await asyncio.start_unix_server(self._handle, self.path)
+        os.chmod(self.path, 0o600)
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def _buckets(self) -> list[list[tuple[ShardManager, Shard]]]:
+        limit = self._state._session_start_limit or {}
+        concurrency = limit.get('max_concurrency', 1)
+        buckets: defaultdict[int, list[tuple[ShardManager, Shard]]] = defaultdict(list)
+
+        for manager in self._state.shard_managers:
+            for shard in manager.shards:
+                buckets[shard.id % concurrency].append((manager, shard))
+
+        return [buckets[key] for key in sorted(buckets)]
+
+    async def _snapshot(
+        self, shards: list[tuple[ShardManager, Shard]]
+    ) -> dict[str, list[tuple[Any, ...]]]:
+        ids = {shard.id for _, shard in shards}
+        amount = shards[0][0].amount
+        guild_ids = {
+            guild.id
+            async for guild in self._state.store.sift('guilds').get_all()
+            if shard_for(guild.id, amount) in ids
+        }
+        cache = await self._state.store.export_parent(guild_ids)
+        # messages are only parented by their channel
+        channel_ids = {id for _, id, _ in cache.get('channels', [])}
+        for name, entries in (
+            await self._state.store.export_parent(channel_ids)
+        ).items():
+            known = {id for _, id, _ in cache.get(name, [])}
+            cache.setdefault(name, []).extend(e for e in entries if e[1] not in known)
+
+        return {
+            name: _picklable(self._state, entries) for name, entries in cache.items()
+        }
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        _log.info('handing shards over to another process')
+
+        ready = {
+            'user': self._state.raw_user,
+            'guilds': [{'id': str(id)} for id in self._state._available_guilds],
+        }
+        await _send(writer, self._state, ('ready', ready))
+
+        for bucket in self._buckets():
+            sessions: list[dict[str, Any]] = []
+
+            try:
+                cache = await self._snapshot(bucket)
+                for _, shard in bucket:
+                    sessions.append(await shard.detach())
+
+                await _send(
+                    writer,
+                    self._state,
+                    ('bucket', {'shards': sessions, 'cache': cache}),
+                )
+                # the other process has resumed this bucket
+                await asyncio.wait_for(
+                    _receive(reader, self._state), self.ack_timeout
+                )
+            except Exception:
+                _log.exception('failed to hand shards over, keeping them instead')
+                await self._reattach(bucket, sessions)
+                writer.close()
+                return
+
+            for manager, shard in bucket:
+                manager.remove_shard(shard)
+                if shard.recorder is not None:
+                    shard.recorder.close()
+
+            _log.debug(f'handed over shards {[s["id"] for s in sessions]}')
+
+        await self._state.event_manager.drain(self.drain_timeout)
+        await _send(writer, self._state, ('done', None))
+        writer.close()
+        await writer.wait_closed()
+        self.close()
+        _log.info('finished handing shards over')
+
+        if not self.done.done():
+            self.done.set_result(None)
+
+    async def _reattach(
+        self, bucket: list[tuple[ShardManager, Shard]], sessions: list[dict[str, Any]]
+    ) -> None:
+        # detached shards were never removed from their managers, only disconnected
+        await asyncio.gather(
+            *(
+                shard.resume(session, self._state.token)
+                for (_, shard), session in zip(bucket, sessions)
+            )
+        )
+
+
+async def receive_handoff(manager: ShardManager, path: str) -> list[int]:
+    state = manager._state
+    reader, writer = await asyncio.open_unix_connection(path)
+    taken: list[int] = []
+
+    try:
+        while True:
+            kind, payload = await _receive(reader, state)
+
+            if kind == 'done':
+                break
+            elif kind == 'ready':
+                # resumed shards never receive READY, so replay the old process'
+                if payload['user'] is not None:
+                    state.raw_user = payload['user']
+                    await state.event_manager.publish('READY', payload)
+                continue
+
+            await state.store.load(payload['cache'])
+            shards = []
+
+            for session in payload['shards']:
+                shard = manager.create_shard(session['id'])
+                manager.add_shard(shard)
+                shards.append(shard.resume(session, state.token))
+                taken.append(session['id'])
+
+            await asyncio.gather(*shards)
+            await _send(writer, state, ('resumed', None))
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+    return taken
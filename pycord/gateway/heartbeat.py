@@ -0,0 +1,168 @@
+# cython: language_level=3
+# Copyright (c) 2021-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import asyncio
+import logging
+from itertools import count
+from random import random
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .shard import Shard
+
+_log = logging.getLogger(__name__)
+
+_BEAT = 0
+_ACK = 1
+
+
+class _Timer:
+    __slots__ = ('shard', 'kind', 'generation', 'rounds')
+
+    def __init__(self, shard: Shard, kind: int, generation: int, rounds: int) -> None:
+        self.shard = shard
+        self.kind = kind
+        self.generation = generation
+        self.rounds = rounds
+
+
+class HeartbeatScheduler:
+    """
+    Heartbeats every shard added to it from a single hashed timer wheel.
+
+    Instead of each shard sleeping in its own task, one task ticks the wheel
+    and fires the heartbeats and ACK timeout checks which are due.
+
+    Parameters
+    ----------
+    tick: :class:`float`
+        The resolution of the wheel, in seconds.
+    slots: :class:`int`
+        The amount of slots in the wheel.
+        Timers further away than ``tick * slots`` take multiple rotations.
+    ack_timeout: :class:`float`
+        How long a shard has to acknowledge a heartbeat before it is
+        considered a zombie and reconnected.
+    """
+
+    def __init__(
+        self, tick: float = 0.25, slots: int = 256, ack_timeout: float = 5
+    ) -> None:
+        self.tick = tick
+        self.ack_timeout = ack_timeout
+        self._wheel: list[list[_Timer]] = [[] for _ in range(slots)]
+        self._cursor: int = 0
+        # a shard's timers only fire while it's still on the generation they were
+        # scheduled in, which are never reused, so timers from before it was
+        # last removed stay stale after it's added again
+        self._generations: dict[Shard, int] = {}
+        self._next_generation = count(1)
+        # heartbeats still being sent, a shard stuck sending mustn't hold up the rest
+        self._sending: set[asyncio.Task[None]] = set()
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._generations)
+
+    def add(self, shard: Shard, jitter: bool = True) -> None:
+        """Starts heartbeating ``shard`` every ``shard._heartbeat_interval`` seconds."""
+        generation = self._generations[shard] = next(self._next_generation)
+        interval = shard._heartbeat_interval
+        self._schedule(
+            shard, _BEAT, generation, interval * random() if jitter else interval
+        )
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def remove(self, shard: Shard) -> None:
+        """Stops heartbeating ``shard``."""
+        self._generations.pop(shard, None)
+
+    def _current(self, timer: _Timer) -> bool:
+        return self._generations.get(timer.shard) == timer.generation
+
+    def _schedule(self, shard: Shard, kind: int, generation: int, delay: float) -> None:
+        ticks = max(1, round(delay / self.tick))
+        slots = len(self._wheel)
+        self._wheel[(self._cursor + ticks) % slots].append(
+            _Timer(shard, kind, generation, (ticks - 1) // slots)
+        )
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+
+        while self._generations:
+            next_tick += self.tick
+            await asyncio.sleep(next_tick - loop.time())
+
+            self._cursor = (self._cursor + 1) % len(self._wheel)
+            slot = self._wheel[self._cursor]
+            self._wheel[self._cursor] = pending = []
+            due: list[_Timer] = []
+
+            for timer in slot:
+                if not self._current(timer):
+                    continue
+                elif timer.rounds:
+                    timer.rounds -= 1
+                    pending.append(timer)
+                else:
+                    due.append(timer)
+
+            for timer in due:
+                # the shard may have been removed by an earlier timer in this tick
+                if not self._current(timer):
+                    continue
+
+                try:
+                    self._fire(timer)
+                except Exception:
+                    _log.exception(f'shard:{timer.shard.id}: failed to heartbeat')
+
+        self._task = None
+
+    def _fire(self, timer: _Timer) -> None:
+        shard = timer.shard
+
+        if timer.kind == _ACK:
+            if shard._awaiting_ack:
+                _log.debug(
+                    f'shard:{shard.id}: heartbeat waiting timed out, reconnecting...'
+                )
+                self.remove(shard)
+                asyncio.create_task(shard.reconnect(code=1008))
+            return
+
+        self._schedule(shard, _BEAT, timer.generation, shard._heartbeat_interval)
+        self._schedule(shard, _ACK, timer.generation, self.ack_timeout)
+        task = asyncio.create_task(shard.send_heartbeat())
+        self._sending.add(task)
+        task.add_done_callback(lambda task: self._sent(shard, task))
+
+    def _sent(self, shard: Shard, task: asyncio.Task[None]) -> None:
+        self._sending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            _log.error(
+                f'shard:{shard.id}: failed to heartbeat', exc_info=task.exception()
+            )
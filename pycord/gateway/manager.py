@@ -30,8 +30,11 @@ from ..errors import NoIdentifiesLeft
 if TYPE_CHECKING:
     from ..state import State
 
+from .handoff import receive_handoff
+from .heartbeat import HeartbeatScheduler
 from .notifier import Notifier
 from .passthrough import PassThrough
+from .recorder import Recorder
 from .shard import Shard
 
 
@@ -43,6 +46,8 @@ class ShardManager:
         amount: int,
         proxy: str | None = None,
         proxy_auth: BasicAuth | None = None,
+        gateway_url: str | None = None,
+        record: str | None = None,
     ) -> None:
         self.shards: list[Shard] = []
         self.amount = amount
@@ -50,6 +55,31 @@ class ShardManager:
         self._state = state
         self.proxy = proxy
         self.proxy_auth = proxy_auth
+        self.gateway_url = gateway_url
+        # path format, e.g. `recordings/{shard_id}.bin`, to record frames to
+        self.record = record
+        self.heartbeats = HeartbeatScheduler()
+        self.session: ClientSession | None = None
+        self.notifier = Notifier(self)
+
+    def create_recorder(self, shard_id: int) -> Recorder | None:
+        if self.record is None:
+            return None
+
+        return Recorder(self.record.format(shard_id=shard_id))
+
+    def create_shard(self, shard_id: int) -> Shard:
+        if self.session is None:
+            self.session = self._state.connection_pool.session(gateway=True)
+
+        return Shard(
+            id=shard_id,
+            state=self._state,
+            session=self.session,
+            notifier=self.notifier,
+            gateway_url=self.gateway_url,
+            recorder=self.create_recorder(shard_id),
+        )
 
     def add_shard(self, shard: Shard) -> None:
         self.shards.insert(shard.id, shard)
@@ -62,18 +92,39 @@ class ShardManager:
 
     async def delete_shard(self, shard: Shard) -> None:
         shard._receive_task.cancel()
-        shard._hb_task.cancel()
+        self.heartbeats.remove(shard)
 
         await shard._ws.close()
+        if shard.recorder is not None:
+            shard.recorder.close()
         self.remove_shard(shard)
 
     async def delete_shards(self) -> None:
-        for shard in self.shards:
+        for shard in list(self.shards):
             await self.delete_shard(shard=shard)
 
+    async def take_over(self, path: str) -> list[int]:
+        """
+        Takes over shards from another process serving a :class:`.HandoffServer`.
+
+        Shards are resumed instead of identified, one identify bucket at a time.
+        Shards which weren't handed over are still started by :meth:`start`.
+
+        Parameters
+        ----------
+        path: :class:`str`
+            The path of the unix socket the other process is serving on.
+
+        Returns
+        -------
+        list[:class:`int`]
+            The ids of the shards which were taken over.
+        """
+        return await receive_handoff(self, path)
+
     async def start(self) -> None:
-        self.session = ClientSession()
-        notifier = Notifier(self)
+        if self.session is None:
+            self.session = self._state.connection_pool.session(gateway=True)
 
         if not self._state.shard_concurrency:
             info = await self._state.http.get_gateway_bot()
@@ -88,11 +139,14 @@ class ShardManager:
             self._state._session_start_limit = session_start_limit
 
         tasks = []
+        # shards taken over from another process are already running
+        running = {shard.id for shard in self.shards}
 
         for shard_id in self._shards:
-            shard = Shard(
-                id=shard_id, state=self._state, session=self.session, notifier=notifier
-            )
+            if shard_id in running:
+                continue
+
+            shard = self.create_shard(shard_id)
 
             tasks.append(shard.connect(token=self._state.token))
 
@@ -102,3 +156,12 @@ class ShardManager:
 
     async def shutdown(self) -> None:
         await self.delete_shards()
+
+    async def close(self) -> None:
+        """Closes the gateway session and the recordings of every shard."""
+        for shard in self.shards:
+            if shard.recorder is not None:
+                shard.recorder.close()
+
+        if self.session is not None:
+            await self.session.close()
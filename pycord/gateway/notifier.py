@@ -39,13 +39,17 @@ class Notifier:
         _log.debug(f'Shard {shard.id} died, restarting it')
         shard_id = shard.id
         self.manager.remove_shard(shard)
-        del shard
+        if shard.recorder is not None:
+            # the new shard appends to the same recording
+            shard.recorder.flush()
 
         new_shard = Shard(
             id=shard_id,
             state=self.manager._state,
             session=self.manager.session,
             notifier=self,
+            gateway_url=shard.gateway_url,
+            recorder=shard.recorder,
         )
         await new_shard.connect(token=self.manager._state.token)
         self.manager.add_shard(new_shard)
@@ -18,50 +18,179 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE
-import time
-from asyncio import AbstractEventLoop, Future, get_running_loop
+from __future__ import annotations
+
+from asyncio import AbstractEventLoop, Future, TimerHandle, get_running_loop
+from collections import deque
+
+from ..errors import RateLimitTimeout
 
 
 class PassThrough:
-    def __init__(self, concurrency: int, per: float | int) -> None:
+    """
+    A sliding-window rate limiter.
+
+    At most ``concurrency`` acquisitions are let through in any window of
+    ``per`` seconds. Waiters are served in FIFO order, with priority waiters
+    always going before normal ones.
+
+    Parameters
+    ----------
+    concurrency: :class:`int`
+        The amount of acquisitions allowed per window.
+    per: :class:`float` | :class:`int`
+        The length of the window, in seconds.
+    reserved: :class:`int`
+        How much of ``concurrency`` only priority acquisitions may use.
+        Normal acquisitions can never starve priority ones of these.
+
+        Defaults to 0.
+    """
+
+    def __init__(self, concurrency: int, per: float | int, reserved: int = 0) -> None:
+        if not 0 <= reserved < concurrency:
+            raise ValueError('reserved must be non-negative and less than concurrency')
+
         self.concurrency: int = concurrency
         self.per: float | int = per
+        self.reserved: int = reserved
 
-        self.current: int = self.concurrency
-        self._reserved: list[Future] = []
         self.loop: AbstractEventLoop = get_running_loop()
-        self.pending_reset: bool = False
+        # timestamps of every acquisition made inside the current window, oldest first
+        self._window: deque[float] = deque()
+        self._waiters: deque[Future[float]] = deque()
+        self._priority_waiters: deque[Future[float]] = deque()
+        self._timer: TimerHandle | None = None
 
-    async def __aenter__(self) -> 'PassThrough':
-        while self.current == 0:
-            future = self.loop.create_future()
-            self._reserved.append(future)
-            await future
+    @property
+    def current(self) -> int:
+        """The amount of normal acquisitions which could currently pass through."""
+        self._purge(self.loop.time())
+        return max(0, self.concurrency - self.reserved - len(self._window))
 
-        self.current -= 1
-
-        if not self.pending_reset:
-            self.pending_reset = True
-            self.loop.call_later(self.per, self.reset)
+    @property
+    def pending(self) -> int:
+        """The amount of acquisitions waiting for capacity."""
+        return len(self._waiters) + len(self._priority_waiters)
 
+    async def __aenter__(self) -> PassThrough:
+        await self.acquire()
         return self
 
     async def __aexit__(self, *_) -> None:
         ...
 
-    def reset(self) -> None:
-        current_time = time.time()
-        self.reset_at = current_time + self.per
-        self.current = self.concurrency
+    def _purge(self, now: float) -> None:
+        while self._window and self._window[0] <= now - self.per:
+            self._window.popleft()
+
+    def _limit(self, priority: bool) -> int:
+        return self.concurrency if priority else self.concurrency - self.reserved
+
+    def _next_free(self, priority: bool) -> float:
+        idx = len(self._window) - self._limit(priority)
+
+        if idx < 0:
+            return self.loop.time()
+
+        # when enough of the window expires for one more acquisition to pass
+        return self._window[idx] + self.per
+
+    async def acquire(
+        self, priority: bool = False, timeout: float | None = None
+    ) -> None:
+        """
+        Waits until this acquisition may pass through.
+
+        Parameters
+        ----------
+        priority: :class:`bool`
+            Whether this acquisition may use reserved capacity and skip
+            ahead of normal waiters.
+        timeout: :class:`float` | None
+            The maximum amount of seconds to wait.
+            ``0`` rejects immediately if there is no capacity.
 
-        for _ in range(self.concurrency):
-            try:
-                self._reserved.pop().set_result(None)
-            except IndexError:
-                break
+            Defaults to `None`, which waits indefinitely.
 
-        if len(self._reserved):
-            self.pending_reset = True
-            self.loop.call_later(self.per, self.reset)
+        Raises
+        ------
+        :exc:`.RateLimitTimeout`
+            Capacity did not free up within ``timeout``.
+        """
+        now = self.loop.time()
+        self._purge(now)
+
+        # only pass straight through if nobody is queued ahead of us
+        if len(self._window) < self._limit(priority) and not (
+            self._priority_waiters or (not priority and self._waiters)
+        ):
+            self._window.append(now)
+            return
+
+        if timeout is not None and timeout <= 0:
+            raise RateLimitTimeout('No capacity left in the rate limit window')
+
+        future: Future[float] = self.loop.create_future()
+        (self._priority_waiters if priority else self._waiters).append(future)
+        handle = (
+            self.loop.call_later(timeout, self._expire, future)
+            if timeout is not None
+            else None
+        )
+        self._schedule()
+
+        try:
+            await future
+        except BaseException:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # capacity was handed to us right as we were cancelled, give it back
+                self._window.remove(future.result())
+                self._release()
+            raise
+        finally:
+            if handle is not None:
+                handle.cancel()
+
+    def _expire(self, future: Future[float]) -> None:
+        if not future.done():
+            future.set_exception(
+                RateLimitTimeout('Timed out waiting for rate limit capacity')
+            )
+
+    def _release(self) -> None:
+        now = self.loop.time()
+        self._purge(now)
+
+        for waiters, priority in (
+            (self._priority_waiters, True),
+            (self._waiters, False),
+        ):
+            while waiters:
+                if waiters[0].done():
+                    waiters.popleft()
+                    continue
+
+                if len(self._window) >= self._limit(priority):
+                    # FIFO: normal waiters may not overtake queued priority ones
+                    self._schedule()
+                    return
+
+                self._window.append(now)
+                waiters.popleft().set_result(now)
+
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._priority_waiters:
+            when = self._next_free(True)
+        elif self._waiters:
+            when = self._next_free(False)
         else:
-            self.pending_reset = False
+            return
+
+        self._timer = self.loop.call_at(when, self._release)
@@ -0,0 +1,111 @@
+# cython: language_level=3
+# Copyright (c) 2021-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from random import uniform
+from typing import AsyncIterator
+
+
+class ReconnectPolicy:
+    """
+    Paces gateway reconnects across every shard in a process.
+
+    Failed connection attempts back off exponentially with decorrelated
+    jitter, and only ``concurrency`` connection attempts may be in flight
+    at once, so shards don't reconnect in lockstep during an outage.
+
+    Parameters
+    ----------
+    base: :class:`float`
+        The smallest delay, in seconds, between connection attempts.
+        Reconnects are also spread over this long before their first attempt.
+    cap: :class:`float`
+        The largest delay, in seconds, between connection attempts.
+    concurrency: :class:`int`
+        The maximum amount of simultaneous connection attempts.
+
+    Attributes
+    ----------
+    attempts: :class:`int`
+        The amount of connection attempts made.
+    failures: :class:`int`
+        The amount of connection attempts which failed.
+    reconnects: :class:`int`
+        The amount of times a shard had to reconnect.
+    connecting: :class:`int`
+        The amount of connection attempts currently in flight.
+    waiting: :class:`int`
+        The amount of connection attempts waiting for a free slot.
+    """
+
+    def __init__(self, base: float = 1, cap: float = 120, concurrency: int = 8) -> None:
+        self.base = base
+        self.cap = cap
+        self.concurrency = concurrency
+        self.attempts: int = 0
+        self.failures: int = 0
+        self.reconnects: int = 0
+        self.connecting: int = 0
+        self.waiting: int = 0
+        self._slots: asyncio.Semaphore | None = None
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        return {
+            'attempts': self.attempts,
+            'failures': self.failures,
+            'reconnects': self.reconnects,
+            'connecting': self.connecting,
+            'waiting': self.waiting,
+        }
+
+    def jitter(self) -> float:
+        """The delay before a reconnect's first attempt."""
+        return uniform(0, self.base)
+
+    def backoff(self, previous: float) -> float:
+        """The delay before the next attempt, given the previous delay."""
+        return min(self.cap, uniform(self.base, max(previous, self.base) * 3))
+
+    @asynccontextmanager
+    async def attempt(self) -> AsyncIterator[None]:
+        """Holds one of the connection slots for the duration of an attempt."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.attempts += 1
+        self.connecting += 1
+        try:
+            yield
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self.connecting -= 1
+            self._slots.release()
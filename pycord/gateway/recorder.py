@@ -0,0 +1,88 @@
+# cython: language_level=3
+# Copyright (c) 2021-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import os
+import struct
+import time
+from typing import BinaryIO, Iterator
+
+# every record is prefixed by the seconds since recording started and the payload length
+_RECORD = struct.Struct('<dI')
+
+
+class Recorder:
+    """
+    Records raw gateway frames into a compact append-only file.
+
+    Each record holds the (decompressed) frame as received alongside
+    the time it was received at, relative to when the recorder was opened.
+    Recordings can be read back using :func:`read_recording`.
+
+    Parameters
+    ----------
+    path: :class:`str` | :class:`os.PathLike`
+        The file to append frames to.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = path
+        self._file: BinaryIO = open(path, 'ab')
+        self._started = time.perf_counter()
+
+    def write(self, frame: bytes) -> None:
+        if self._file.closed:
+            # frames still arriving while shutting down aren't kept
+            return
+
+        self._file.write(
+            _RECORD.pack(time.perf_counter() - self._started, len(frame)) + frame
+        )
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_recording(path: str | os.PathLike[str]) -> Iterator[tuple[float, bytes]]:
+    """
+    Reads back a recording made by :class:`Recorder`.
+
+    Yields
+    ------
+    tuple[:class:`float`, :class:`bytes`]
+        The offset the frame was received at, and the frame.
+    """
+    with open(path, 'rb') as f:
+        while header := f.read(_RECORD.size):
+            if len(header) < _RECORD.size:
+                # the recorder was most likely killed mid-write
+                return
+
+            offset, size = _RECORD.unpack(header)
+            frame = f.read(size)
+
+            if len(frame) < size:
+                return
+
+            yield offset, frame
@@ -23,25 +23,31 @@ from __future__ import annotations
 import asyncio
 import logging
 import zlib
+from contextlib import nullcontext
 from platform import system
-from random import random
 from typing import TYPE_CHECKING, Any
 
 from aiohttp import (
     ClientConnectionError,
-    ClientConnectorError,
     ClientSession,
     ClientWebSocketResponse,
     WSMsgType,
+    WSServerHandshakeError,
 )
 
 from ..errors import DisallowedIntents, InvalidAuth, ShardingRequired
-from ..utils import dumps, loads
+from ..utils import dumps_bytes, loads
 from .passthrough import PassThrough
 
+try:
+    from ..types.structs import decode_payload
+except ImportError:
+    decode_payload = None
+
 if TYPE_CHECKING:
     from ..state import State
     from .notifier import Notifier
+    from .recorder import Recorder
 
 ZLIB_SUFFIX = b'\x00\x00\xff\xff'
 url = '{base}/?v={version}&encoding=json&compress=zlib-stream'
@@ -68,14 +74,18 @@ class Shard:
         session: ClientSession,
         notifier: Notifier,
         version: int = 10,
+        gateway_url: str | None = None,
+        recorder: Recorder | None = None,
     ) -> None:
         self.id = id
         self.session_id: str | None = None
         self.version = version
+        self.gateway_url = gateway_url or state.gateway_url
+        self.recorder = recorder
         self._token: str | None = None
-        # while the rate limit normally is 120, it'd be nice to leave out
-        # 10 for heartbeating
-        self._rate_limiter = PassThrough(110, 60)
+        # 10 of the 120 commands allowed per minute are held back so
+        # heartbeats, identifies and resumes can never be starved
+        self._rate_limiter = PassThrough(120, 60, reserved=10)
         self._notifier = notifier
         self._state = state
         self._session = session
@@ -84,52 +94,75 @@ class Shard:
         self._ws: ClientWebSocketResponse | None = None
         self._resume_gateway_url: str | None = None
         self._heartbeat_interval: float | None = None
-        self._hb_received: asyncio.Future[None] | None = None
+        self._awaiting_ack: bool = False
         self._receive_task: asyncio.Task[None] | None = None
         self._connection_alive: asyncio.Future[None] = asyncio.Future()
         self._hello_received: asyncio.Future[None] | None = None
-        self._hb_task: asyncio.Task[None] | None = None
 
     async def connect(self, token: str | None = None, resume: bool = False) -> None:
-        self._hello_received = asyncio.Future()
-        self._inflator = zlib.decompressobj()
+        policy = self._state.reconnect_policy
+        delay = 0.0
+        # only identifies count towards max_concurrency, resumes are free
+        identifying = not (resume and self._resume_gateway_url)
 
-        try:
-            async with self._state.shard_concurrency:
-                _log.debug(f'shard:{self.id}: connecting to gateway')
-                self._ws = await self._session.ws_connect(
-                    url=url.format(version=self.version, base=self._resume_gateway_url)
-                    if resume and self._resume_gateway_url
-                    else url.format(
-                        version=self.version, base='wss://gateway.discord.gg'
-                    ),
-                    proxy=self._notifier.manager.proxy,
-                    proxy_auth=self._notifier.manager.proxy_auth,
+        while True:
+            self._hello_received = asyncio.Future()
+            self._inflator = zlib.decompressobj()
+
+            try:
+                # waited on before taking a reconnect slot, so identifies queued
+                # behind max_concurrency can't hold every slot and starve resumes
+                async with (
+                    self._state.shard_concurrency if identifying else nullcontext()
+                ):
+                    async with policy.attempt():
+                        await self._open(resume)
+            except (
+                ClientConnectionError,
+                WSServerHandshakeError,
+                asyncio.TimeoutError,
+            ) as exc:
+                delay = policy.backoff(delay)
+                _log.debug(
+                    f'shard:{self.id}: failed to connect to discord due to {exc!r}, retrying in {delay:.2f} seconds'
                 )
-                _log.debug(f'shard:{self.id}: connected to gateway')
-        except (ClientConnectionError, ClientConnectorError):
-            _log.debug(
-                f'shard:{self.id}: failed to connect to discord due to connection errors, retrying in 10 seconds'
-            )
-            await asyncio.sleep(10)
-            await self.connect(token=token, resume=resume)
-            return
+                await asyncio.sleep(delay)
+            else:
+                break
+
+        self._receive_task = asyncio.create_task(self._recv())
+
+        if token:
+            await self._hello_received
+            self._token = token
+            if resume:
+                await self.send_resume()
+            else:
+                await self.send_identify()
+
+    async def _open(self, resume: bool) -> None:
+        if resume and self._resume_gateway_url:
+            gateway = url.format(version=self.version, base=self._resume_gateway_url)
         else:
-            self._receive_task = asyncio.create_task(self._recv())
-
-            if token:
-                await self._hello_received
-                self._token = token
-                if resume:
-                    await self.send_resume()
-                else:
-                    await self.send_identify()
-
-    async def send(self, data: dict[str, Any]) -> None:
-        async with self._rate_limiter:
-            d = dumps(data)
-            _log.debug(f'shard:{self.id}: sending {d}')
-            await self._ws.send_str(d)
+            gateway = url.format(version=self.version, base=self.gateway_url)
+
+        _log.debug(f'shard:{self.id}: connecting to gateway')
+        self._ws = await self._connect_ws(gateway)
+        _log.debug(f'shard:{self.id}: connected to gateway')
+
+    async def _connect_ws(self, gateway: str) -> ClientWebSocketResponse:
+        return await self._session.ws_connect(
+            url=gateway,
+            proxy=self._notifier.manager.proxy,
+            proxy_auth=self._notifier.manager.proxy_auth,
+        )
+
+    async def send(self, data: dict[str, Any], priority: bool = False) -> None:
+        await self._rate_limiter.acquire(priority=priority)
+        d = dumps_bytes(data)
+        _log.debug('shard:%s: sending %s', self.id, d)
+        # json has to go in text frames, send_str would only encode it again
+        await self._ws.send_frame(d, WSMsgType.TEXT)
 
     async def send_identify(self) -> None:
         await self.send(
@@ -147,7 +180,8 @@ class Shard:
                     'shard': [self.id, self._notifier.manager.amount],
                     'intents': self._state.intents.as_bit,
                 },
-            }
+            },
+            priority=True,
         )
 
     async def send_resume(self) -> None:
@@ -159,35 +193,76 @@ class Shard:
                     'session_id': self.session_id,
                     'seq': self._sequence,
                 },
-            }
+            },
+            priority=True,
         )
 
-    async def send_heartbeat(self, jitter: bool = False) -> None:
-        if jitter:
-            await asyncio.sleep(self._heartbeat_interval * random())
-        else:
-            await asyncio.sleep(self._heartbeat_interval)
-        self._hb_received = asyncio.Future()
+    async def send_heartbeat(self) -> None:
+        # heartbeats are timed by the manager's HeartbeatScheduler
+        self._awaiting_ack = True
         _log.debug(f'shard:{self.id}: sending heartbeat')
         try:
-            await self._ws.send_str(dumps({'op': 1, 'd': self._sequence}))
+            await self.send({'op': 1, 'd': self._sequence}, priority=True)
         except ConnectionResetError:
             _log.debug(
                 f'shard:{self.id}: failed to send heartbeat due to connection reset, reconnecting...'
             )
+            self._notifier.manager.heartbeats.remove(self)
+            asyncio.create_task(self.reconnect(code=1008))
+
+    async def reconnect(self, resume: bool = True, code: int = 1000) -> None:
+        """
+        Closes the current connection, if still open, and connects again.
+
+        Parameters
+        ----------
+        resume: :class:`bool`
+            Whether to resume the current session instead of identifying.
+        code: :class:`int`
+            The close code to close the current connection with.
+        """
+        self._notifier.manager.heartbeats.remove(self)
+
+        # reconnects started by the receive loop itself let it finish on its own
+        if self._receive_task is not asyncio.current_task():
             self._receive_task.cancel()
-            if not self._ws.closed:
-                await self._ws.close(code=1008)
-            await self.connect(self._token, bool(self._resume_gateway_url))
-            return
-        try:
-            await asyncio.wait_for(self._hb_received, 5)
-        except asyncio.TimeoutError:
-            _log.debug(f'shard:{self.id}: heartbeat waiting timed out, reconnecting...')
-            self._receive_task.cancel()
-            if not self._ws.closed:
-                await self._ws.close(code=1008)
-            await self.connect(self._token, bool(self._resume_gateway_url))
+        if not self._ws.closed:
+            await self._ws.close(code=code)
+
+        policy = self._state.reconnect_policy
+        policy.reconnects += 1
+        # spread out shards which lost their connections at the same time
+        await asyncio.sleep(policy.jitter())
+        await self.connect(self._token, resume=resume and self.session_id is not None)
+
+    async def detach(self) -> dict[str, Any]:
+        """
+        Disconnects this shard while keeping its session resumable.
+
+        Returns
+        -------
+        dict[str, Any]
+            What's needed to resume this session elsewhere, see :meth:`resume`.
+        """
+        self._notifier.manager.heartbeats.remove(self)
+        self._receive_task.cancel()
+        # closing with 1000 or 1001 would invalidate the session
+        if not self._ws.closed:
+            await self._ws.close(code=4000)
+
+        return {
+            'id': self.id,
+            'session_id': self.session_id,
+            'sequence': self._sequence,
+            'resume_gateway_url': self._resume_gateway_url,
+        }
+
+    async def resume(self, session: dict[str, Any], token: str) -> None:
+        """Resumes a session detached from another shard, possibly in another process."""
+        self.session_id = session['session_id']
+        self._sequence = session['sequence']
+        self._resume_gateway_url = session['resume_gateway_url']
+        await self.connect(token, resume=True)
 
     async def _recv(self) -> None:
         async for msg in self._ws:
@@ -198,7 +273,7 @@ class Shard:
                     continue
 
                 try:
-                    text_coded = self._inflator.decompress(msg.data).decode('utf-8')
+                    raw = self._inflator.decompress(msg.data)
                 except Exception as e:
                     # while being an edge case, the data could sometimes be corrupted.
                     _log.debug(
@@ -206,11 +281,18 @@ class Shard:
                     )
                     continue
 
-                _log.debug(f'shard:{self.id}: received message {text_coded}')
+                _log.debug('shard:%s: received message %s', self.id, raw)
 
-                data: dict[str, Any] = loads(text_coded)
+                if self.recorder is not None:
+                    self.recorder.write(raw)
 
-                self._sequence = data.get('s')
+                data: dict[str, Any] = (
+                    decode_payload(raw) if self._state.typed_payloads else loads(raw)
+                )
+
+                # only dispatches carry a sequence, the rest send null
+                if data.get('s') is not None:
+                    self._sequence = data['s']
 
                 op: int = data.get('op')
                 d: dict[str, Any] | int | None = data.get('d')
@@ -223,35 +305,29 @@ class Shard:
                         self._state.raw_user = d['user']
                     asyncio.create_task(self._state.event_manager.publish(t, d))
                 elif op == 1:
-                    await self._ws.send_str(dumps({'op': 1, 'd': self._sequence}))
+                    await self.send({'op': 1, 'd': self._sequence}, priority=True)
                 elif op == 10:
                     self._heartbeat_interval = d['heartbeat_interval'] / 1000
+                    self._awaiting_ack = False
 
-                    asyncio.create_task(self.send_heartbeat(jitter=True))
+                    self._notifier.manager.heartbeats.add(self, jitter=True)
                     self._hello_received.set_result(True)
                 elif op == 11:
-                    if not self._hb_received.done():
-                        self._hb_received.set_result(None)
-
-                        self._hb_task = asyncio.create_task(self.send_heartbeat())
+                    self._awaiting_ack = False
                 elif op == 7:
-                    await self._ws.close(code=1002)
-                    await self.connect(token=self._token, resume=True)
+                    await self.reconnect(code=1002)
                     return
                 elif op == 9:
-                    await self._ws.close()
-                    await self.connect(token=self._token)
+                    # d is whether the session may be resumed
+                    await self.reconnect(resume=d is True)
                     return
         await self.handle_close(self._ws.close_code)
 
     async def handle_close(self, code: int | None) -> None:
         _log.debug(f'shard:{self.id}: closed with code {code}')
-        if self._hb_task and not self._hb_task.done():
-            self._hb_task.cancel()
-        if code in RESUMABLE:
-            await self.connect(self._token, True)
-        elif code is None:
-            await self.connect(self._token, True)
+        self._notifier.manager.heartbeats.remove(self)
+        if code in RESUMABLE or code is None:
+            await self.reconnect()
         else:
             if code == 4004:
                 raise InvalidAuth('Authentication used in gateway is invalid')
@@ -266,4 +342,4 @@ class Shard:
                 await self._notifier.shard_died(self)
             else:
                 # the connection most likely died
-                await self.connect(self._token, resume=True)
+                await self.reconnect()
@@ -20,9 +20,10 @@
 # SOFTWARE
 from __future__ import annotations
 
-from functools import cached_property
+import asyncio
 from typing import TYPE_CHECKING
 
+from .api.execution import INTERACTION_PRIORITY
 from .embed import Embed
 from .errors import InteractionException
 from .flags import MessageFlags
@@ -85,6 +86,7 @@ class Interaction:
         'custom_id',
         'component_type',
         'values',
+        '_received_at',
     )
 
     def __init__(
@@ -95,6 +97,7 @@ class Interaction:
         save: bool = False,
     ) -> None:
         self._state = state
+        self._received_at: float = asyncio.get_running_loop().time()
         if response:
             self.response = InteractionResponse(self, save=save)
         self.id = Snowflake(data['id'])
@@ -156,18 +159,82 @@ class Interaction:
 
 
 class InteractionResponse:
-    __slots__ = ('_parent', '_deferred', '_save', 'responded', 'raw_response')
+    __slots__ = (
+        '_parent',
+        '_deferred',
+        '_save',
+        '_auto_defer',
+        '_auto_deferring',
+        'responded',
+        'raw_response',
+        '_followup',
+    )
 
     def __init__(self, parent: Interaction, save: bool) -> None:
         self._parent = parent
         self.responded: bool = False
         self._deferred: bool = False
         self._save = save
+        self._auto_defer: asyncio.Task[None] | None = None
+        self._auto_deferring: bool = False
         self.raw_response = None
+        self._followup: Webhook | None = None
 
-    @cached_property
+    @property
     def followup(self) -> Webhook:
-        return Webhook(self._parent.id, self._parent.token)
+        if self._followup is None:
+            # followups are executed on the application's webhook
+            self._followup = Webhook(
+                self._parent.application_id,
+                self._parent.token,
+                http=self._parent._state.http,
+                priority=INTERACTION_PRIORITY,
+            )
+        return self._followup
+
+    @property
+    def deadline(self) -> float:
+        """The :meth:`loop.time() <asyncio.loop.time>` Discord needs a response by."""
+        return self._parent._received_at + 3
+
+    def auto_defer(self, after: float = 2.2) -> None:
+        """
+        Defers this interaction if it still wasn't responded to ``after``
+        seconds after it was received, so slow handlers don't miss Discord's
+        3 second window. Once deferred, respond through :attr:`followup`.
+
+        Parameters
+        ----------
+        after: :class:`float`
+            How many seconds after receiving the interaction to defer it at.
+
+            Defaults to 2.2.
+        """
+        if self._auto_defer is None and not self.responded:
+            self._auto_defer = asyncio.create_task(self._defer_after(after))
+
+    async def _defer_after(self, after: float) -> None:
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(self._parent._received_at + after - loop.time())
+
+        if not self.responded:
+            self._auto_deferring = True
+            await self._defer()
+
+    async def _stop_auto_defer(self) -> None:
+        task, self._auto_defer = self._auto_defer, None
+        if task is None or task.done():
+            return
+
+        if not self._auto_deferring:
+            task.cancel()
+            return
+
+        # the defer is already on its way, the response has to come after it
+        try:
+            await asyncio.shield(task)
+        except Exception:
+            pass
 
     async def send(
         self,
@@ -176,6 +243,7 @@ class InteractionResponse:
         embeds: list[Embed] = [],
         flags: int | MessageFlags = 0,
     ) -> None:
+        await self._stop_auto_defer()
         if self.responded:
             raise InteractionException('This interaction has already been responded to')
 
@@ -207,33 +275,43 @@ class InteractionResponse:
                     'flags': flags,
                 },
             },
+            deadline=self.deadline,
         )
         self.responded = True
 
     async def defer(self) -> None:
+        await self._stop_auto_defer()
         if self._deferred or self.responded:
             raise InteractionException(
                 'This interaction has already been deferred or responded to'
             )
 
+        await self._defer()
+
+    async def _defer(self) -> None:
         await self._parent._state.http.create_interaction_response(
-            self._parent.id, self._parent.token, {'type': 5}
+            self._parent.id, self._parent.token, {'type': 5}, deadline=self.deadline
         )
 
         self._deferred = True
         self.responded = True
 
     async def send_modal(self, modal: Modal) -> None:
+        await self._stop_auto_defer()
         if self.responded:
             raise InteractionException('This interaction has already been responded to')
 
         await self._parent._state.http.create_interaction_response(
-            self._parent.id, self._parent.token, {'type': 9, 'data': modal._to_dict()}
+            self._parent.id,
+            self._parent.token,
+            {'type': 9, 'data': modal._to_dict()},
+            deadline=self.deadline,
         )
         self._parent._state.sent_modal(modal)
         self.responded = True
 
     async def autocomplete(self, choices: list[str]) -> None:
+        await self._stop_auto_defer()
         if self.responded:
             raise InteractionException('This interaction has already been responded to')
 
@@ -243,11 +321,12 @@ class InteractionResponse:
                 'data': {'choices': choices},
             }
 
-        await self._state.http.create_interaction_response(
+        await self._parent._state.http.create_interaction_response(
             self._parent.id,
             self._parent.token,
             {
                 'type': 8,
                 'data': {'choices': choices},
             },
+            deadline=self.deadline,
         )
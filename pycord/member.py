@@ -124,6 +124,9 @@ class Member:
     ) -> None:
         """Adds a role to the member.
 
+        Changes made to the member's roles at the same time are merged,
+        see :class:`.RoleQueue`.
+
         Parameters
         ----------
         role: :class:`Role`
@@ -131,9 +134,9 @@ class Member:
         reason: :class:`str` | None
             The reason for adding the role. Shows up in the audit log.
         """
-        await self._state.http.add_guild_member_role(
+        await self._state.http.roles.add(
             self._guild_id,
-            self.id,
+            self.user.id,
             role.id,
             reason=reason,
         )
@@ -146,6 +149,9 @@ class Member:
     ) -> None:
         """Removes a role from the member.
 
+        Changes made to the member's roles at the same time are merged,
+        see :class:`.RoleQueue`.
+
         Parameters
         ----------
         role: :class:`Role`
@@ -153,9 +159,9 @@ class Member:
         reason: :class:`str` | None
             The reason for removing the role. Shows up in the audit log.
         """
-        await self._state.http.remove_guild_member_role(
+        await self._state.http.roles.remove(
             self._guild_id,
-            self.id,
+            self.user.id,
             role.id,
             reason=reason,
         )
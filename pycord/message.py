@@ -209,6 +209,7 @@ class Message:
         'tts',
         'mentions',
         'mention_roles',
+        'mention_channels',
         'attachments',
         'embeds',
         'reactions',
@@ -364,7 +365,7 @@ class Message:
     async def add_reaction(self, emoji: Emoji | str) -> None:
         if isinstance(emoji, Emoji):
             emoji = {'id': emoji.id, 'name': emoji.name}
-        await self._state.http.create_reaction(
+        await self._state.http.reactions.add(
             self.channel_id,
             self.id,
             emoji,
@@ -373,7 +374,7 @@ class Message:
     async def remove_reaction(self, emoji: Emoji | str) -> None:
         if isinstance(emoji, Emoji):
             emoji = {'id': emoji.id, 'name': emoji.name}
-        await self._state.http.delete_own_reaction(
+        await self._state.http.reactions.remove(
             self.channel_id,
             self.id,
             emoji,
@@ -431,6 +432,7 @@ class Message:
         attachments: list[Attachment] | None | MissingEnum = MISSING,
         flags: MessageFlags | None | MissingEnum = MISSING,
         houses: list[House] | MissingEnum = MISSING,
+        coalesce: bool = False,
     ) -> Message:
         if houses:
             if len(houses) > 5:
@@ -452,6 +454,7 @@ class Message:
             attachments=attachments,
             components=components,
             flags=flags,
+            coalesce=coalesce,
         )
         return Message(data, self._state)
 
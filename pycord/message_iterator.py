@@ -18,9 +18,19 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, AsyncIterator
+
 from .message import Message
+from .missing import MISSING, MissingEnum
 from .pages import Page
 from .pages.paginator import Paginator
+from .snowflake import Snowflake
+
+if TYPE_CHECKING:
+    from .state import State
 
 
 class MessagePage(Page[Message]):
@@ -31,3 +41,87 @@ class MessagePage(Page[Message]):
 # Paginator but typed for MessagePage
 class MessagePaginator(Paginator[MessagePage]):
     ...
+
+
+def _to_snowflake(value: datetime | Snowflake) -> Snowflake:
+    return Snowflake.from_datetime(value) if isinstance(value, datetime) else value
+
+
+class MessageHistory:
+    """
+    Streams a channel's messages newest first, fetching them a page at a time.
+
+    Only the page being iterated over is kept, so whole channels can be walked
+    through without holding every message in memory.
+
+    Parameters
+    ----------
+    state: :class:`State`
+        The state to fetch messages with.
+    channel_id: :class:`Snowflake`
+        The channel to list the messages of.
+    limit: :class:`int` | None
+        The maximum number of messages to list, or `None` for every message.
+
+        Defaults to 100.
+    before: :class:`datetime.datetime` | :class:`Snowflake` | None
+        Only list messages sent before this time or message.
+
+        Defaults to `None`.
+    after: :class:`datetime.datetime` | :class:`Snowflake` | None
+        Only list messages sent after this time or message.
+
+        Defaults to `None`.
+    """
+
+    def __init__(
+        self,
+        state: State,
+        channel_id: Snowflake,
+        *,
+        limit: int | None = 100,
+        before: datetime | Snowflake | None = None,
+        after: datetime | Snowflake | None = None,
+    ) -> None:
+        self._state = state
+        self.channel_id = channel_id
+        self.limit = limit
+        self.before: Snowflake | None = (
+            _to_snowflake(before) if before is not None else None
+        )
+        self.after: Snowflake | None = (
+            _to_snowflake(after) if after is not None else None
+        )
+
+    async def pages(self) -> AsyncIterator[list[Message]]:
+        """Yields every page of messages as it's fetched, up to 100 at a time."""
+        remaining = self.limit
+        before: Snowflake | MissingEnum = (
+            self.before if self.before is not None else MISSING
+        )
+
+        while remaining is None or remaining > 0:
+            limit = min(remaining, 100) if remaining is not None else 100
+            # pages are walked newest first, so after only tells us when to stop
+            data = await self._state.http.get_channel_messages(
+                self.channel_id, before=before, limit=limit
+            )
+            page = [
+                Message(message, self._state)
+                for message in data
+                if self.after is None or int(message['id']) > self.after
+            ]
+
+            if page:
+                yield page
+            if len(page) < limit:
+                return
+
+            before = page[-1].id
+            if remaining is not None:
+                remaining -= len(page)
+
+    async def __aiter__(self) -> AsyncIterator[Message]:
+        async for page in self.pages():
+            for message in page:
+                yield message
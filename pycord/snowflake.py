@@ -51,4 +51,4 @@ class Snowflake(int):
 
     @classmethod
     def from_datetime(cls, dt: datetime) -> Snowflake:
-        return cls((int(dt.timestamp()) - DISCORD_EPOCH) << 22)
+        return cls((int(dt.timestamp() * 1000) - DISCORD_EPOCH) << 22)
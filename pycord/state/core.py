@@ -26,7 +26,7 @@ from typing import TYPE_CHECKING, Any, TypeVar
 
 from aiohttp import BasicAuth
 
-from ..api import HTTPClient
+from ..api import ConnectionPool, HTTPClient
 from ..commands.application import ApplicationCommand
 from ..events import GuildCreate
 from ..events.channels import (
@@ -54,6 +54,7 @@ from ..events.guilds import (
 )
 from ..events.other import InteractionCreate, Ready, UserUpdate
 from ..flags import Intents
+from ..gateway.reconnect import ReconnectPolicy
 from ..missing import MISSING
 from ..ui import Component
 from ..ui.house import House
@@ -61,6 +62,11 @@ from ..ui.text_input import Modal
 from ..user import User
 from .grouped_store import GroupedStore
 
+try:
+    from ..types.structs import decode_payload
+except ImportError:
+    decode_payload = None
+
 T = TypeVar('T')
 
 BASE_EVENTS = [
@@ -100,7 +106,18 @@ class State:
         self.options = options
         self.max_messages: int | None = options.get('max_messages', 1000)
         self.large_threshold: int = options.get('large_threshold', 250)
+        self.gateway_url: str = options.get('gateway_url', 'wss://gateway.discord.gg')
         self.shard_concurrency: PassThrough | None = None
+        self.http: HTTPClient | None = None
+        self.connection_pool: ConnectionPool = (
+            options.get('connection_pool') or ConnectionPool()
+        )
+        self.typed_payloads: bool = options.get('typed_payloads', False)
+        if self.typed_payloads and decode_payload is None:
+            raise RuntimeError('msgspec must be installed to use typed payloads.')
+        self.reconnect_policy: ReconnectPolicy = (
+            options.get('reconnect_policy') or ReconnectPolicy()
+        )
         self.intents: Intents = options.get('intents', Intents())
         self.user: User | None = None
         self.raw_user: dict[str, Any] | None = None
@@ -115,6 +132,7 @@ class State:
         # makes sure that multiple clusters don't start at once
         self._cluster_lock: asyncio.Lock = asyncio.Lock()
         self._ready: bool = False
+        self._available_guilds: list[int] = []
         self.application_commands: list[ApplicationCommand] = []
         self.update_commands: bool = options.get('update_commands', True)
         self.verbose: bool = options.get('verbose', False)
@@ -157,5 +175,11 @@ class State:
             proxy=proxy,
             proxy_auth=proxy_auth,
             verbose=self.verbose,
+            rate_limiter=self.options.get('rate_limiter'),
+            cache=self.options.get('request_cache'),
+            typed_payloads=self.typed_payloads,
+            pool=self.connection_pool,
+            retry_policy=self.options.get('retry_policy'),
+            metrics=self.options.get('metrics'),
         )
         self._clustered = clustered
@@ -19,6 +19,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE
 
+from typing import Any
 
 from .store import Store
 
@@ -57,3 +58,20 @@ class GroupedStore:
         self._stores.append(store)
         self._stores_dict[name] = store
         return store
+
+    async def export_parent(
+        self, parents: set[Any]
+    ) -> dict[str, list[tuple[set[Any], Any, Any]]]:
+        """Every entry, by store name, belonging to any of ``parents``."""
+        return {
+            name: await store.export_parent(parents)
+            for name, store in self._stores_dict.items()
+        }
+
+    async def load(self, entries: dict[str, list[tuple[set[Any], Any, Any]]]) -> None:
+        """Saves entries made by :meth:`export_parent` into their stores."""
+        for name, items in entries.items():
+            store = self.sift(name)
+
+            for parents, id, data in items:
+                await store.save(list(parents), id, data)
@@ -88,6 +88,22 @@ class Store:
                 self._store.remove(store)
                 return store
 
+    async def discard_many(self, parents: list[Any], ids: list[Any]) -> dict[Any, Any]:
+        """Discards every item in ``ids`` under ``parents`` at once, returning them by id."""
+        ps = set(parents)
+        wanted = set(ids)
+        discarded = {}
+        kept = set()
+
+        for store in self._store:
+            if store.id in wanted and store.parents & ps:
+                discarded[store.id] = store.storing
+            else:
+                kept.add(store)
+
+        self._store = kept
+        return discarded
+
     async def get_all(self):
         for store in self._store:
             yield store.storing
@@ -99,6 +115,13 @@ class Store:
             if store.parents & ps:
                 yield store.storing
 
+    async def export_parent(self, parents: set[Any]) -> list[tuple[set[Any], Any, Any]]:
+        return [
+            (store.parents, store.id, store.storing)
+            for store in self._store
+            if store.parents & parents
+        ]
+
     async def delete_all(self) -> None:
         self._store.clear()
 
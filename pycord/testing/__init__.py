@@ -0,0 +1,10 @@
+"""
+pycord.testing
+~~~~~~~~~~~~~~
+Local stand-ins for Discord, used for offline testing and benchmarking.
+
+:copyright: 2021-present Pycord Development
+:license: MIT
+"""
+from .gateway import *
+from .rest import *
@@ -0,0 +1,279 @@
+# cython: language_level=3
+# Copyright (c) 2021-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import asyncio
+import os
+import zlib
+from typing import Any, Iterable, Sequence
+
+from aiohttp import WSMsgType, web
+
+from ..gateway.recorder import read_recording
+from ..utils import dumps_bytes, loads
+
+__all__: Sequence[str] = ('FakeGateway', 'FakeGatewaySession')
+
+DEFAULT_USER: dict[str, Any] = {
+    'id': '1',
+    'username': 'pycord',
+    'discriminator': '0000',
+    'avatar': None,
+    'bot': True,
+}
+
+
+class FakeGatewaySession:
+    """A single websocket connection made to a :class:`FakeGateway`."""
+
+    def __init__(self, gateway: FakeGateway, ws: web.WebSocketResponse) -> None:
+        self.gateway = gateway
+        self.ws = ws
+        self.session_id: str | None = None
+        self.shard: list[int] | None = None
+        self.resumed: bool = False
+        self.heartbeats: int = 0
+        self.sequence: int = 0
+        self._position: int = 0
+        self._compressor = zlib.compressobj()
+        self._replay_task: asyncio.Task[None] | None = None
+
+    async def send(self, payload: dict[str, Any] | bytes) -> None:
+        if isinstance(payload, dict):
+            payload = dumps_bytes(payload)
+
+        await self.ws.send_bytes(
+            self._compressor.compress(payload)
+            + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        )
+
+    async def dispatch(self, t: str, d: Any) -> None:
+        self.sequence += 1
+        await self.send({'op': 0, 's': self.sequence, 't': t, 'd': d})
+
+    async def reconnect(self) -> None:
+        """Asks the client to reconnect and resume, like Discord's op 7."""
+        await self.send({'op': 7, 'd': None})
+
+    async def invalidate(self, resumable: bool = False) -> None:
+        """Invalidates the client's session, like Discord's op 9."""
+        if not resumable:
+            self.gateway._sessions.pop(self.session_id, None)
+        await self.send({'op': 9, 'd': resumable})
+
+    async def close(self, code: int = 1000) -> None:
+        await self.ws.close(code=code)
+
+    async def _handle(self, data: dict[str, Any]) -> None:
+        op = data.get('op')
+        d = data.get('d')
+
+        if op == 1:
+            self.heartbeats += 1
+            await self.send({'op': 11})
+        elif op == 2:
+            self.gateway.identifies += 1
+            self.gateway._session_count += 1
+            self.session_id = f'fake-{self.gateway._session_count}'
+            self.shard = d.get('shard')
+            self.gateway._sessions[self.session_id] = self
+
+            ready = dict(self.gateway.ready)
+            ready['session_id'] = self.session_id
+            ready['resume_gateway_url'] = self.gateway.url
+            ready['shard'] = self.shard
+            await self.dispatch('READY', ready)
+            self._start_replay()
+        elif op == 6:
+            self.gateway.resumes += 1
+
+            previous = self.gateway._sessions.get(d.get('session_id'))
+
+            if previous is None:
+                await self.send({'op': 9, 'd': False})
+                return
+
+            # carry on replaying where the previous connection stopped
+            self.session_id = previous.session_id
+            self.shard = previous.shard
+            self.sequence = previous.sequence
+            self._position = previous._position
+            self.gateway._sessions[self.session_id] = self
+            self.resumed = True
+            await self.dispatch('RESUMED', None)
+            self._start_replay()
+
+    def _start_replay(self) -> None:
+        if self._replay_task is None and self._position < len(self.gateway.dispatches):
+            self._replay_task = asyncio.create_task(self._replay())
+
+    async def _replay(self) -> None:
+        speed = self.gateway.speed
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        first: float | None = None
+
+        for offset, t, d in self.gateway.dispatches[self._position :]:
+            if speed is not None:
+                if first is None:
+                    first = offset
+
+                delay = started + (offset - first) / speed - loop.time()
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            if self.ws.closed:
+                return
+
+            await self.dispatch(t, d)
+            self._position += 1
+
+        self.gateway.replays_finished += 1
+
+
+class FakeGateway:
+    """
+    A local websocket server speaking the Discord Gateway protocol.
+
+    Speaks HELLO, IDENTIFY, RESUME, heartbeating and zlib-stream compression,
+    and replays a stream of recorded dispatches to every identified session.
+
+    Parameters
+    ----------
+    recording: :class:`str` | :class:`os.PathLike` | None
+        A file made by :class:`.Recorder` to replay dispatches from.
+        A recorded ``READY`` is used as the base of the synthesized one.
+    dispatches: Iterable[tuple[:class:`float`, :class:`str`, Any]] | None
+        Dispatches to replay as ``(offset, event name, data)``, instead of a recording.
+    speed: :class:`float` | None
+        The speed multiplier to replay at, relative to when the frames were recorded.
+        `None` replays at maximum throughput.
+
+        Defaults to 1.
+    heartbeat_interval: :class:`float`
+        The heartbeat interval, in seconds, to send in HELLO.
+    host: :class:`str`
+        The host to listen on.
+    port: :class:`int`
+        The port to listen on. 0 picks a free one.
+    """
+
+    def __init__(
+        self,
+        recording: str | os.PathLike[str] | None = None,
+        dispatches: Iterable[tuple[float, str, Any]] | None = None,
+        speed: float | None = 1.0,
+        heartbeat_interval: float = 41.25,
+        host: str = '127.0.0.1',
+        port: int = 0,
+    ) -> None:
+        self.speed = speed
+        self.heartbeat_interval = heartbeat_interval
+        self.host = host
+        self.port = port
+        self.ready: dict[str, Any] = {
+            'v': 10,
+            'user': DEFAULT_USER,
+            'guilds': [],
+            'application': {'id': DEFAULT_USER['id'], 'flags': 0},
+        }
+        self.dispatches: list[tuple[float, str, Any]] = list(dispatches or [])
+
+        if recording is not None:
+            self._load(recording)
+
+        self.sessions: list[FakeGatewaySession] = []
+        self.connections: int = 0
+        self.identifies: int = 0
+        self.resumes: int = 0
+        self.replays_finished: int = 0
+        self._sessions: dict[str, FakeGatewaySession] = {}
+        self._session_count: int = 0
+        self._runner: web.AppRunner | None = None
+
+    def _load(self, recording: str | os.PathLike[str]) -> None:
+        for offset, frame in read_recording(recording):
+            data = loads(frame)
+
+            if data.get('op') != 0:
+                continue
+
+            if data['t'] == 'READY':
+                self.ready.update(data['d'])
+            elif data['t'] != 'RESUMED':
+                self.dispatches.append((offset, data['t'], data['d']))
+
+    @property
+    def url(self) -> str:
+        return f'ws://{self.host}:{self.port}'
+
+    async def start(self) -> str:
+        """Starts the server, returning the url to connect shards to."""
+        app = web.Application()
+        app.router.add_get('/', self._connect)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self.url
+
+    async def close(self, code: int = 1001) -> None:
+        await self.close_sessions(code)
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def close_sessions(self, code: int = 1000) -> None:
+        """Closes every open connection with ``code``, e.g. to cause a reconnect storm."""
+        await asyncio.gather(*(session.close(code) for session in self.sessions))
+
+    async def __aenter__(self) -> FakeGateway:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def _connect(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+
+        session = FakeGatewaySession(self, ws)
+        self.sessions.append(session)
+
+        try:
+            await session.send(
+                {'op': 10, 'd': {'heartbeat_interval': self.heartbeat_interval * 1000}}
+            )
+
+            async for msg in ws:
+                if msg.type in (WSMsgType.TEXT, WSMsgType.BINARY):
+                    await session._handle(loads(msg.data))
+        finally:
+            if session._replay_task is not None:
+                session._replay_task.cancel()
+            self.sessions.remove(session)
+
+        return ws
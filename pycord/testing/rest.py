@@ -0,0 +1,898 @@
+# cython: language_level=3
+# Copyright (c) 2021-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from itertools import count
+from typing import Any, Awaitable, Callable, Sequence
+
+from aiohttp import web
+
+from ..utils import DISCORD_EPOCH, dumps_bytes, loads
+from .gateway import DEFAULT_USER
+
+__all__: Sequence[str] = ('FakeREST', 'Fault')
+
+Handler = Callable[[web.Request], Awaitable[Any]]
+
+# (method, route) -> (bucket, limit, per), routes sharing a bucket share its limits
+BUCKETS: dict[tuple[str, str], tuple[str, int, float]] = {
+    ('POST', '/channels/{channel_id}/messages'): ('messages', 5, 5),
+    ('PATCH', '/channels/{channel_id}/messages/{message_id}'): ('edits', 5, 5),
+    ('DELETE', '/channels/{channel_id}/messages/{message_id}'): ('deletes', 5, 1),
+    ('POST', '/channels/{channel_id}/messages/bulk-delete'): ('bulk-delete', 1, 1),
+    (
+        'PUT',
+        '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me',
+    ): ('reactions', 1, 0.25),
+    (
+        'DELETE',
+        '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me',
+    ): ('reactions', 1, 0.25),
+    ('PUT', '/guilds/{guild_id}/members/{user_id}/roles/{role_id}'): (
+        'member-roles',
+        10,
+        10,
+    ),
+    ('DELETE', '/guilds/{guild_id}/members/{user_id}/roles/{role_id}'): (
+        'member-roles',
+        10,
+        10,
+    ),
+    ('PATCH', '/channels/{channel_id}'): ('channel-edits', 2, 600),
+}
+DEFAULT_BUCKET: tuple[int, float] = (10, 1)
+MAJOR_PARAMETERS = (
+    'guild_id',
+    'channel_id',
+    'webhook_id',
+    'webhook_token',
+    'interaction_token',
+)
+# how long a message may be before it can't be bulk deleted anymore
+BULK_DELETE_AGE = 14 * 24 * 60 * 60
+
+
+class Fault:
+    """
+    A failure :class:`FakeREST` injects into requests it matches.
+
+    Parameters
+    ----------
+    status: :class:`int` | None
+        The status to respond with. `None` with ``drop`` unset only adds ``delay``.
+
+        Defaults to 503.
+    drop: :class:`bool`
+        Whether to drop the connection instead of responding.
+
+        Defaults to `False`.
+    delay: :class:`float`
+        How many seconds to wait before failing, or before responding normally.
+
+        Defaults to 0.
+    scope: :class:`str` | None
+        The ``X-RateLimit-Scope`` of injected 429s, such as ``shared``.
+
+        Defaults to ``shared``.
+    method: :class:`str` | None
+        Only fail requests with this method.
+
+        Defaults to `None`, which fails any method.
+    route: :class:`str` | None
+        Only fail requests to this route, such as ``/channels/{channel_id}/messages``.
+
+        Defaults to `None`, which fails any route.
+    probability: :class:`float`
+        The chance of failing a matching request.
+
+        Defaults to 1.
+    times: :class:`int` | None
+        How many requests to fail, after which this fault is removed.
+
+        Defaults to `None`, which fails requests until removed.
+    """
+
+    def __init__(
+        self,
+        status: int | None = 503,
+        drop: bool = False,
+        delay: float = 0,
+        scope: str | None = 'shared',
+        method: str | None = None,
+        route: str | None = None,
+        probability: float = 1,
+        times: int | None = None,
+    ) -> None:
+        self.status = status
+        self.drop = drop
+        self.delay = delay
+        self.scope = scope
+        self.method = method
+        self.route = route
+        self.probability = probability
+        self.times = times
+        self.injected: int = 0
+
+    def matches(self, method: str, route: str) -> bool:
+        return (
+            (self.method is None or self.method == method)
+            and (self.route is None or self.route == route)
+            and random.random() < self.probability
+        )
+
+
+class _APIError(Exception):
+    def __init__(self, status: int, data: dict[str, Any]) -> None:
+        self.status = status
+        self.data = data
+
+
+class _Window:
+    __slots__ = ('limit', 'per', 'remaining', 'reset_at')
+
+    def __init__(self, limit: int, per: float) -> None:
+        self.limit = limit
+        self.per = per
+        self.remaining = limit
+        self.reset_at = 0.0
+
+    def take(self, now: float) -> bool:
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.per
+
+        if self.remaining <= 0:
+            return False
+
+        self.remaining -= 1
+        return True
+
+
+class _TokenBucket:
+    __slots__ = ('rate', 'tokens', 'updated_at')
+
+    def __init__(self, rate: int) -> None:
+        self.rate = rate
+        self.tokens = float(rate)
+        self.updated_at = 0.0
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(
+            self.tokens + (now - self.updated_at) * self.rate, float(self.rate)
+        )
+        self.updated_at = now
+
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+
+class FakeREST:
+    """
+    A local HTTP server implementing the common routes of the Discord REST API,
+    to point :class:`.HTTPClient` at with ``base_url``.
+
+    Guilds, channels, members, roles, messages and reactions are kept in memory.
+    Every route is rate limited like Discord does it, with ``X-RateLimit-*``
+    headers, buckets shared between routes and per major parameter,
+    a global rate limit and 429 bodies, and :class:`Fault`\\ s can be injected.
+
+    Parameters
+    ----------
+    global_limit: :class:`int`
+        The amount of requests allowed per second across every route,
+        besides interaction callbacks and webhooks. Unlike route buckets,
+        which reset all at once, this refills continuously.
+
+        Defaults to 50.
+    buckets: dict[tuple[:class:`str`, :class:`str`], tuple[:class:`str`, :class:`int`, :class:`float`]] | None
+        Overrides of the buckets routes are in, by ``(method, route)``,
+        as ``(bucket, limit, per)``.
+
+        Defaults to `None`.
+    latency: :class:`float`
+        How many seconds every request takes to be responded to.
+
+        Defaults to 0.
+    faults: list[:class:`Fault`] | None
+        The faults to inject, see :meth:`inject`.
+
+        Defaults to `None`.
+    host: :class:`str`
+        The host to listen on.
+    port: :class:`int`
+        The port to listen on. 0 picks a free one.
+
+    Attributes
+    ----------
+    requests: :class:`int`
+        The amount of requests received.
+    statuses: dict[:class:`int`, :class:`int`]
+        How many responses were sent with every status.
+    rate_limited: dict[:class:`str`, :class:`int`]
+        How many 429s were sent, by scope.
+    """
+
+    def __init__(
+        self,
+        global_limit: int = 50,
+        buckets: dict[tuple[str, str], tuple[str, int, float]] | None = None,
+        latency: float = 0,
+        faults: list[Fault] | None = None,
+        host: str = '127.0.0.1',
+        port: int = 0,
+    ) -> None:
+        self.global_limit = global_limit
+        self.buckets = {**BUCKETS, **(buckets or {})}
+        self.latency = latency
+        self.faults: list[Fault] = list(faults or [])
+        self.host = host
+        self.port = port
+
+        self.user: dict[str, Any] = dict(DEFAULT_USER)
+        self.users: dict[str, dict[str, Any]] = {self.user['id']: self.user}
+        self.guilds: dict[str, dict[str, Any]] = {}
+        self.channels: dict[str, dict[str, Any]] = {}
+        # guild id -> user id -> member
+        self.members: dict[str, dict[str, dict[str, Any]]] = {}
+        # guild id -> role id -> role
+        self.roles: dict[str, dict[str, dict[str, Any]]] = {}
+        # channel id -> message id -> message, oldest first
+        self.messages: dict[str, dict[str, dict[str, Any]]] = {}
+        # (interaction id, token) -> responses, followups included
+        self.interaction_responses: dict[tuple[str, str], list[dict[str, Any]]] = {}
+
+        self.requests: int = 0
+        self.statuses: dict[int, int] = {}
+        self.rate_limited: dict[str, int] = {}
+        self._windows: dict[tuple[Any, ...], _Window] = {}
+        self._global = _TokenBucket(global_limit)
+        self._increment = count()
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    async def start(self) -> str:
+        """Starts the server, returning the url to use as ``base_url``."""
+        app = web.Application(middlewares=[self._middleware])
+        for method, path, handler in self._routes():
+            app.router.add_route(method, path, handler)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self.url
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> FakeREST:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    def inject(self, fault: Fault) -> Fault:
+        """Starts injecting ``fault``, remove it from :attr:`faults` to stop."""
+        self.faults.append(fault)
+        return fault
+
+    # state
+
+    def snowflake(self, age: float = 0) -> str:
+        """Makes a new id, as if it was made ``age`` seconds ago."""
+        ms = int((time.time() - age) * 1000) - DISCORD_EPOCH
+        return str(ms << 22 | next(self._increment) % 4096)
+
+    def add_guild(self, name: str = 'guild', channels: int = 1) -> dict[str, Any]:
+        """Adds a guild owned by the bot, with an @everyone role and ``channels`` text channels."""
+        id = self.snowflake()
+        guild = self.guilds[id] = {
+            'id': id,
+            'name': name,
+            'icon': None,
+            'splash': None,
+            'discovery_splash': None,
+            'owner_id': self.user['id'],
+            'afk_channel_id': None,
+            'afk_timeout': 300,
+            'verification_level': 0,
+            'default_message_notifications': 0,
+            'explicit_content_filter': 0,
+            'features': [],
+            'mfa_level': 0,
+            'application_id': None,
+            'system_channel_id': None,
+            'system_channel_flags': 0,
+            'rules_channel_id': None,
+            'vanity_url_code': None,
+            'description': None,
+            'banner': None,
+            'premium_tier': 0,
+            'preferred_locale': 'en-US',
+            'public_updates_channel_id': None,
+            'nsfw_level': 0,
+            'premium_progress_bar_enabled': False,
+            'emojis': [],
+            'stickers': [],
+        }
+        self.roles[id] = {}
+        self.members[id] = {}
+        self.add_role(id, '@everyone', role_id=id)
+        self.add_member(id, self.user)
+
+        for idx in range(channels):
+            self.add_channel(id, f'channel-{idx}')
+
+        guild['roles'] = list(self.roles[id].values())
+        return guild
+
+    def add_channel(
+        self, guild_id: str | None = None, name: str = 'channel'
+    ) -> dict[str, Any]:
+        """Adds a text channel to a guild, or a DM channel without ``guild_id``."""
+        id = self.snowflake()
+        channel = self.channels[id] = {
+            'id': id,
+            'type': 0 if guild_id else 1,
+            'name': name,
+            'position': len(self.channels),
+            'permission_overwrites': [],
+            'topic': None,
+            'nsfw': False,
+            'last_message_id': None,
+            'rate_limit_per_user': 0,
+            'parent_id': None,
+        }
+        if guild_id is not None:
+            channel['guild_id'] = guild_id
+        self.messages[id] = {}
+        return channel
+
+    def add_role(
+        self, guild_id: str, name: str = 'role', role_id: str | None = None
+    ) -> dict[str, Any]:
+        id = role_id or self.snowflake()
+        role = self.roles[guild_id][id] = {
+            'id': id,
+            'name': name,
+            'color': 0,
+            'hoist': False,
+            'position': len(self.roles[guild_id]),
+            'permissions': '0',
+            'managed': False,
+            'mentionable': False,
+        }
+        return role
+
+    def add_member(self, guild_id: str, user: dict[str, Any]) -> dict[str, Any]:
+        self.users[user['id']] = user
+        member = self.members[guild_id][user['id']] = {
+            'user': user,
+            'nick': None,
+            'roles': [],
+            'joined_at': self._now(),
+            'deaf': False,
+            'mute': False,
+            'flags': 0,
+        }
+        return member
+
+    def add_message(
+        self, channel_id: str, content: str = '', age: float = 0
+    ) -> dict[str, Any]:
+        """Adds a message sent by the bot ``age`` seconds ago."""
+        id = self.snowflake(age)
+        message = {
+            'id': id,
+            'channel_id': channel_id,
+            'author': self.user,
+            'content': content,
+            'timestamp': self._now(age),
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': [],
+            'reactions': [],
+            'pinned': False,
+            'type': 0,
+        }
+        guild_id = self.channels[channel_id].get('guild_id')
+        if guild_id is not None:
+            message['guild_id'] = guild_id
+
+        messages = self.messages[channel_id]
+        messages[id] = message
+        if age:
+            # keep messages ordered oldest first
+            self.messages[channel_id] = dict(
+                sorted(messages.items(), key=lambda item: int(item[0]))
+            )
+        self.channels[channel_id]['last_message_id'] = max(
+            messages, key=int, default=None
+        )
+        return message
+
+    @staticmethod
+    def _now(age: float = 0) -> str:
+        return datetime.fromtimestamp(time.time() - age, timezone.utc).isoformat()
+
+    # rate limits, faults and everything else every request goes through
+
+    @staticmethod
+    def _json(
+        data: Any, status: int = 200, headers: dict[str, str] | None = None
+    ) -> web.Response:
+        return web.Response(
+            body=dumps_bytes(data),
+            status=status,
+            headers=headers,
+            content_type='application/json',
+        )
+
+    @staticmethod
+    def _error(status: int, message: str, code: int = 0) -> _APIError:
+        return _APIError(status, {'message': message, 'code': code})
+
+    def _rate_limit(
+        self, method: str, route: str, request: web.Request
+    ) -> tuple[dict[str, str], web.Response | None]:
+        now = time.monotonic()
+        bucket, limit, per = self.buckets.get(
+            (method, route), (f'{method} {route}', *DEFAULT_BUCKET)
+        )
+        major = tuple(request.match_info.get(name) for name in MAJOR_PARAMETERS)
+        window = self._windows.get((bucket, major))
+        if window is None:
+            window = self._windows[(bucket, major)] = _Window(limit, per)
+
+        exempt = route.startswith('/interactions') or (
+            'Authorization' not in request.headers
+        )
+        if not exempt and not self._global.take(now):
+            retry_after = round(1 / self.global_limit, 3)
+            return {}, self._rate_limited(
+                'global',
+                retry_after,
+                {
+                    'X-RateLimit-Global': 'true',
+                    'X-RateLimit-Scope': 'global',
+                    'Retry-After': str(retry_after),
+                },
+            )
+
+        allowed = window.take(now)
+        reset_after = round(window.reset_at - now, 3)
+        headers = {
+            'X-RateLimit-Limit': str(window.limit),
+            'X-RateLimit-Remaining': str(window.remaining),
+            'X-RateLimit-Reset': str(round(time.time() + reset_after, 3)),
+            'X-RateLimit-Reset-After': str(reset_after),
+            'X-RateLimit-Bucket': bucket,
+        }
+
+        if allowed:
+            return headers, None
+
+        headers['X-RateLimit-Scope'] = 'user'
+        headers['Retry-After'] = str(reset_after)
+        return headers, self._rate_limited('user', reset_after, headers)
+
+    def _rate_limited(
+        self, scope: str, retry_after: float, headers: dict[str, str]
+    ) -> web.Response:
+        self.rate_limited[scope] = self.rate_limited.get(scope, 0) + 1
+        return self._json(
+            {
+                'message': 'You are being rate limited.',
+                'retry_after': retry_after,
+                'global': scope == 'global',
+            },
+            429,
+            headers,
+        )
+
+    async def _inject(
+        self, method: str, route: str, request: web.Request
+    ) -> web.Response | None:
+        for fault in list(self.faults):
+            if not fault.matches(method, route):
+                continue
+
+            fault.injected += 1
+            if fault.times is not None and fault.injected >= fault.times:
+                self.faults.remove(fault)
+
+            if fault.delay:
+                await asyncio.sleep(fault.delay)
+
+            if fault.drop:
+                request.transport.close()
+                # never makes it, the connection is gone
+                return web.Response(status=500)
+            elif fault.status == 429:
+                headers = {'Retry-After': '1'}
+                if fault.scope is not None:
+                    headers['X-RateLimit-Scope'] = fault.scope
+                return self._rate_limited(fault.scope or 'user', 1, headers)
+            elif fault.status is not None:
+                return self._json(
+                    {'message': web.Response(status=fault.status).reason, 'code': 0},
+                    fault.status,
+                )
+        return None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Handler) -> web.Response:
+        self.requests += 1
+        route = request.match_info.route.resource.canonical
+        method = request.method
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        response = await self._inject(method, route, request)
+        if response is None:
+            response = await self._respond(method, route, request, handler)
+
+        self.statuses[response.status] = self.statuses.get(response.status, 0) + 1
+        return response
+
+    async def _respond(
+        self, method: str, route: str, request: web.Request, handler: Handler
+    ) -> web.Response:
+        authorized = request.headers.get('Authorization', '').startswith('Bot ')
+        if not authorized and not route.startswith(('/interactions', '/webhooks')):
+            return self._json({'message': '401: Unauthorized', 'code': 0}, 401)
+
+        headers, limited = self._rate_limit(method, route, request)
+        if limited is not None:
+            return limited
+
+        try:
+            data = await handler(request)
+        except _APIError as exc:
+            return self._json(exc.data, exc.status, headers)
+
+        if data is None:
+            return web.Response(status=204, headers=headers)
+        return self._json(data, headers=headers)
+
+    # routes
+
+    def _routes(self) -> list[tuple[str, str, Handler]]:
+        return [
+            ('GET', '/gateway', self._get_gateway),
+            ('GET', '/gateway/bot', self._get_gateway_bot),
+            ('GET', '/users/@me', self._get_current_user),
+            ('GET', '/users/{user_id}', self._get_user),
+            ('GET', '/guilds/{guild_id}', self._get_guild),
+            ('GET', '/guilds/{guild_id}/channels', self._get_guild_channels),
+            ('GET', '/guilds/{guild_id}/roles', self._get_roles),
+            ('POST', '/guilds/{guild_id}/roles', self._create_role),
+            ('GET', '/guilds/{guild_id}/members/{user_id}', self._get_member),
+            ('PATCH', '/guilds/{guild_id}/members/{user_id}', self._modify_member),
+            (
+                'PUT',
+                '/guilds/{guild_id}/members/{user_id}/roles/{role_id}',
+                self._add_member_role,
+            ),
+            (
+                'DELETE',
+                '/guilds/{guild_id}/members/{user_id}/roles/{role_id}',
+                self._remove_member_role,
+            ),
+            ('GET', '/channels/{channel_id}', self._get_channel),
+            ('PATCH', '/channels/{channel_id}', self._modify_channel),
+            ('GET', '/channels/{channel_id}/messages', self._get_messages),
+            ('POST', '/channels/{channel_id}/messages', self._create_message),
+            (
+                'POST',
+                '/channels/{channel_id}/messages/bulk-delete',
+                self._bulk_delete_messages,
+            ),
+            (
+                'GET',
+                '/channels/{channel_id}/messages/{message_id}',
+                self._get_message,
+            ),
+            (
+                'PATCH',
+                '/channels/{channel_id}/messages/{message_id}',
+                self._edit_message,
+            ),
+            (
+                'DELETE',
+                '/channels/{channel_id}/messages/{message_id}',
+                self._delete_message,
+            ),
+            (
+                'PUT',
+                '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me',
+                self._add_reaction,
+            ),
+            (
+                'DELETE',
+                '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me',
+                self._remove_reaction,
+            ),
+            (
+                'POST',
+                '/interactions/{interaction_id}/{interaction_token}/callback',
+                self._interaction_callback,
+            ),
+            (
+                'POST',
+                '/webhooks/{webhook_id}/{webhook_token}',
+                self._execute_webhook,
+            ),
+        ]
+
+    async def _body(self, request: web.Request) -> dict[str, Any]:
+        if request.content_type.startswith('multipart/'):
+            form = await request.post()
+            payload = form.get('payload_json')
+            return loads(payload) if payload else {}
+        elif request.can_read_body:
+            return loads(await request.read())
+        return {}
+
+    def _guild(self, request: web.Request) -> dict[str, Any]:
+        guild = self.guilds.get(request.match_info['guild_id'])
+        if guild is None:
+            raise self._error(404, 'Unknown Guild', 10004)
+        return guild
+
+    def _channel(self, request: web.Request) -> dict[str, Any]:
+        channel = self.channels.get(request.match_info['channel_id'])
+        if channel is None:
+            raise self._error(404, 'Unknown Channel', 10003)
+        return channel
+
+    def _message(self, request: web.Request) -> dict[str, Any]:
+        channel = self._channel(request)
+        message = self.messages[channel['id']].get(request.match_info['message_id'])
+        if message is None:
+            raise self._error(404, 'Unknown Message', 10008)
+        return message
+
+    def _member(self, request: web.Request) -> dict[str, Any]:
+        guild = self._guild(request)
+        member = self.members[guild['id']].get(request.match_info['user_id'])
+        if member is None:
+            raise self._error(404, 'Unknown Member', 10007)
+        return member
+
+    async def _get_gateway(self, request: web.Request) -> dict[str, Any]:
+        return {'url': 'wss://gateway.discord.gg'}
+
+    async def _get_gateway_bot(self, request: web.Request) -> dict[str, Any]:
+        return {
+            'url': 'wss://gateway.discord.gg',
+            'shards': 1,
+            'session_start_limit': {
+                'total': 1000,
+                'remaining': 1000,
+                'reset_after': 0,
+                'max_concurrency': 1,
+            },
+        }
+
+    async def _get_current_user(self, request: web.Request) -> dict[str, Any]:
+        return self.user
+
+    async def _get_user(self, request: web.Request) -> dict[str, Any]:
+        user = self.users.get(request.match_info['user_id'])
+        if user is None:
+            raise self._error(404, 'Unknown User', 10013)
+        return user
+
+    async def _get_guild(self, request: web.Request) -> dict[str, Any]:
+        guild = self._guild(request)
+        return {**guild, 'roles': list(self.roles[guild['id']].values())}
+
+    async def _get_guild_channels(self, request: web.Request) -> list[dict[str, Any]]:
+        guild = self._guild(request)
+        return [c for c in self.channels.values() if c.get('guild_id') == guild['id']]
+
+    async def _get_roles(self, request: web.Request) -> list[dict[str, Any]]:
+        return list(self.roles[self._guild(request)['id']].values())
+
+    async def _create_role(self, request: web.Request) -> dict[str, Any]:
+        guild = self._guild(request)
+        body = await self._body(request)
+        return self.add_role(guild['id'], body.get('name', 'new role'))
+
+    async def _get_member(self, request: web.Request) -> dict[str, Any]:
+        return self._member(request)
+
+    async def _modify_member(self, request: web.Request) -> dict[str, Any]:
+        member = self._member(request)
+        body = await self._body(request)
+        roles = self.roles[request.match_info['guild_id']]
+
+        if 'roles' in body:
+            if any(role not in roles for role in body['roles']):
+                raise self._error(400, 'Invalid Form Body', 50035)
+            member['roles'] = list(body['roles'])
+        if 'nick' in body:
+            member['nick'] = body['nick']
+        return member
+
+    async def _add_member_role(self, request: web.Request) -> None:
+        member = self._member(request)
+        role_id = request.match_info['role_id']
+        if role_id not in self.roles[request.match_info['guild_id']]:
+            raise self._error(404, 'Unknown Role', 10011)
+        if role_id not in member['roles']:
+            member['roles'].append(role_id)
+
+    async def _remove_member_role(self, request: web.Request) -> None:
+        member = self._member(request)
+        role_id = request.match_info['role_id']
+        if role_id not in self.roles[request.match_info['guild_id']]:
+            raise self._error(404, 'Unknown Role', 10011)
+        if role_id in member['roles']:
+            member['roles'].remove(role_id)
+
+    async def _get_channel(self, request: web.Request) -> dict[str, Any]:
+        return self._channel(request)
+
+    async def _modify_channel(self, request: web.Request) -> dict[str, Any]:
+        channel = self._channel(request)
+        body = await self._body(request)
+        channel.update({key: value for key, value in body.items() if key in channel})
+        return channel
+
+    async def _get_messages(self, request: web.Request) -> list[dict[str, Any]]:
+        channel = self._channel(request)
+        limit = min(int(request.query.get('limit', 50)), 100)
+        before = request.query.get('before')
+        after = request.query.get('after')
+        # newest first, like discord
+        messages = reversed(self.messages[channel['id']].values())
+
+        if before is not None:
+            messages = (m for m in messages if int(m['id']) < int(before))
+        if after is not None:
+            messages = [m for m in messages if int(m['id']) > int(after)][-limit:]
+
+        return list(messages)[:limit]
+
+    async def _create_message(self, request: web.Request) -> dict[str, Any]:
+        channel = self._channel(request)
+        body = await self._body(request)
+
+        if not (body.get('content') or body.get('embeds')):
+            raise self._error(400, 'Cannot send an empty message', 50006)
+
+        message = self.add_message(channel['id'], body.get('content', ''))
+        message['embeds'] = body.get('embeds', [])
+        message['tts'] = body.get('tts', False)
+        return message
+
+    async def _get_message(self, request: web.Request) -> dict[str, Any]:
+        return self._message(request)
+
+    async def _edit_message(self, request: web.Request) -> dict[str, Any]:
+        message = self._message(request)
+        body = await self._body(request)
+
+        for key in ('content', 'embeds', 'flags', 'components'):
+            if key in body:
+                message[key] = body[key]
+        message['edited_timestamp'] = self._now()
+        return message
+
+    async def _delete_message(self, request: web.Request) -> None:
+        message = self._message(request)
+        del self.messages[message['channel_id']][message['id']]
+
+    async def _bulk_delete_messages(self, request: web.Request) -> None:
+        channel = self._channel(request)
+        ids = (await self._body(request)).get('messages', [])
+
+        if not 2 <= len(ids) <= 100:
+            raise self._error(
+                400, 'You must provide at least 2 and at most 100 messages', 50016
+            )
+
+        oldest = (int(time.time() - BULK_DELETE_AGE) * 1000 - DISCORD_EPOCH) << 22
+        if any(int(id) < oldest for id in ids):
+            raise self._error(
+                400,
+                'You can only bulk delete messages that are under 14 days old.',
+                50034,
+            )
+
+        for id in ids:
+            self.messages[channel['id']].pop(id, None)
+
+    def _reaction(self, request: web.Request) -> tuple[list[dict[str, Any]], str]:
+        return self._message(request)['reactions'], request.match_info['emoji']
+
+    async def _add_reaction(self, request: web.Request) -> None:
+        reactions, emoji = self._reaction(request)
+
+        for reaction in reactions:
+            if reaction['emoji']['name'] == emoji:
+                if not reaction['me']:
+                    reaction['count'] += 1
+                    reaction['me'] = True
+                return
+
+        reactions.append({'count': 1, 'me': True, 'emoji': {'id': None, 'name': emoji}})
+
+    async def _remove_reaction(self, request: web.Request) -> None:
+        reactions, emoji = self._reaction(request)
+
+        for reaction in reactions:
+            if reaction['emoji']['name'] == emoji and reaction['me']:
+                reaction['count'] -= 1
+                reaction['me'] = False
+                if not reaction['count']:
+                    reactions.remove(reaction)
+                return
+
+    async def _interaction_callback(self, request: web.Request) -> None:
+        key = (
+            request.match_info['interaction_id'],
+            request.match_info['interaction_token'],
+        )
+        if key in self.interaction_responses:
+            raise self._error(400, 'Interaction has already been acknowledged.', 40060)
+        self.interaction_responses[key] = [await self._body(request)]
+
+    async def _execute_webhook(self, request: web.Request) -> dict[str, Any]:
+        body = await self._body(request)
+        token = request.match_info['webhook_token']
+
+        for (
+            interaction_id,
+            interaction_token,
+        ), responses in self.interaction_responses.items():
+            if interaction_token == token:
+                responses.append(body)
+                break
+
+        return {
+            'id': self.snowflake(),
+            'channel_id': '0',
+            'webhook_id': request.match_info['webhook_id'],
+            'content': body.get('content', ''),
+            'embeds': body.get('embeds', []),
+        }
@@ -0,0 +1,305 @@
+# cython: language_level=3
+# Copyright (c) 2021-present Pycord Development
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+"""
+msgspec Structs mirroring the TypedDicts of the hottest payloads.
+
+Payloads decoded into these skip building dicts, and are validated while
+being decoded. Structs can be indexed like the dicts models expect, so
+models are built from either the same way.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Union
+
+import msgspec
+from msgspec import UNSET, UnsetType
+
+__all__ = (
+    'Payload',
+    'User',
+    'GuildMember',
+    'Message',
+    'Guild',
+    'Interaction',
+    'decode_payload',
+    'decode_response',
+)
+
+_log = logging.getLogger(__name__)
+
+
+class Payload(msgspec.Struct, omit_defaults=True, gc=False):
+    """The base of every Struct, giving them the read side of the dict interface."""
+
+    # getattr and UNSET are bound as defaults, models index payloads a lot
+    def __getitem__(self, key: str, _getattr=getattr, _unset=UNSET) -> Any:
+        value = _getattr(self, key, _unset)
+
+        if value is _unset:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None, _getattr=getattr, _unset=UNSET) -> Any:
+        value = _getattr(self, key, _unset)
+        return default if value is _unset else value
+
+    def __contains__(self, key: str, _getattr=getattr, _unset=UNSET) -> bool:
+        return _getattr(self, key, _unset) is not _unset
+
+    def keys(self) -> list[str]:
+        return [
+            field
+            for field in self.__struct_fields__
+            if getattr(self, field) is not UNSET
+        ]
+
+
+# every field may be left out, so a missing one raises the same KeyError
+# when indexed that a dict would, instead of failing the whole payload
+class User(Payload):
+    id: Union[str, UnsetType] = UNSET
+    username: Union[str, UnsetType] = UNSET
+    discriminator: Union[str, UnsetType] = UNSET
+    global_name: Union[str, None, UnsetType] = UNSET
+    avatar: Union[str, None, UnsetType] = UNSET
+    bot: Union[bool, UnsetType] = UNSET
+    system: Union[bool, UnsetType] = UNSET
+    mfa_enabled: Union[bool, UnsetType] = UNSET
+    banner: Union[str, None, UnsetType] = UNSET
+    accent_color: Union[int, None, UnsetType] = UNSET
+    locale: Union[str, UnsetType] = UNSET
+    verified: Union[bool, UnsetType] = UNSET
+    email: Union[str, None, UnsetType] = UNSET
+    flags: Union[int, UnsetType] = UNSET
+    premium_type: Union[int, UnsetType] = UNSET
+    public_flags: Union[int, UnsetType] = UNSET
+
+
+class GuildMember(Payload):
+    user: Union[User, UnsetType] = UNSET
+    nick: Union[str, None, UnsetType] = UNSET
+    avatar: Union[str, None, UnsetType] = UNSET
+    roles: Union[list[str], UnsetType] = UNSET
+    joined_at: Union[str, None, UnsetType] = UNSET
+    premium_since: Union[str, None, UnsetType] = UNSET
+    deaf: Union[bool, UnsetType] = UNSET
+    mute: Union[bool, UnsetType] = UNSET
+    flags: Union[int, UnsetType] = UNSET
+    pending: Union[bool, UnsetType] = UNSET
+    permissions: Union[str, UnsetType] = UNSET
+    communication_disabled_until: Union[str, None, UnsetType] = UNSET
+
+
+class GuildMemberAdd(GuildMember):
+    guild_id: Union[str, UnsetType] = UNSET
+
+
+class GuildMembersChunk(Payload):
+    guild_id: Union[str, UnsetType] = UNSET
+    members: Union[list[GuildMember], UnsetType] = UNSET
+    chunk_index: Union[int, UnsetType] = UNSET
+    chunk_count: Union[int, UnsetType] = UNSET
+    not_found: Union[list[Any], UnsetType] = UNSET
+    presences: Union[list[Any], UnsetType] = UNSET
+    nonce: Union[str, UnsetType] = UNSET
+
+
+class Message(Payload):
+    id: Union[str, UnsetType] = UNSET
+    channel_id: Union[str, UnsetType] = UNSET
+    guild_id: Union[str, UnsetType] = UNSET
+    author: Union[User, UnsetType] = UNSET
+    member: Union[GuildMember, UnsetType] = UNSET
+    content: Union[str, UnsetType] = UNSET
+    timestamp: Union[str, UnsetType] = UNSET
+    edited_timestamp: Union[str, None, UnsetType] = UNSET
+    tts: Union[bool, UnsetType] = UNSET
+    mention_everyone: Union[bool, UnsetType] = UNSET
+    mentions: Union[list[User], UnsetType] = UNSET
+    mention_roles: Union[list[str], UnsetType] = UNSET
+    mention_channels: Union[list[Any], UnsetType] = UNSET
+    attachments: Union[list[Any], UnsetType] = UNSET
+    embeds: Union[list[Any], UnsetType] = UNSET
+    reactions: Union[list[Any], UnsetType] = UNSET
+    nonce: Union[int, str, None, UnsetType] = UNSET
+    pinned: Union[bool, UnsetType] = UNSET
+    webhook_id: Union[str, None, UnsetType] = UNSET
+    type: Union[int, UnsetType] = UNSET
+    activity: Union[Any, UnsetType] = UNSET
+    application: Union[Any, UnsetType] = UNSET
+    application_id: Union[str, UnsetType] = UNSET
+    message_reference: Union[Any, UnsetType] = UNSET
+    flags: Union[int, UnsetType] = UNSET
+    referenced_message: Union[Message, None, UnsetType] = UNSET
+    interaction: Union[Any, UnsetType] = UNSET
+    thread: Union[Any, UnsetType] = UNSET
+    components: Union[list[Any], UnsetType] = UNSET
+    sticker_items: Union[list[Any], UnsetType] = UNSET
+    stickers: Union[list[Any], UnsetType] = UNSET
+    position: Union[int, UnsetType] = UNSET
+
+
+class Guild(Payload):
+    id: Union[str, UnsetType] = UNSET
+    name: Union[str, UnsetType] = UNSET
+    icon: Union[str, None, UnsetType] = UNSET
+    icon_hash: Union[str, None, UnsetType] = UNSET
+    splash: Union[str, None, UnsetType] = UNSET
+    discovery_splash: Union[str, None, UnsetType] = UNSET
+    owner: Union[bool, UnsetType] = UNSET
+    owner_id: Union[str, UnsetType] = UNSET
+    permissions: Union[str, UnsetType] = UNSET
+    afk_channel_id: Union[str, None, UnsetType] = UNSET
+    afk_timeout: Union[int, UnsetType] = UNSET
+    widget_enabled: Union[bool, UnsetType] = UNSET
+    widget_channel_id: Union[str, None, UnsetType] = UNSET
+    verification_level: Union[int, UnsetType] = UNSET
+    default_message_notifications: Union[int, UnsetType] = UNSET
+    explicit_content_filter: Union[int, UnsetType] = UNSET
+    roles: Union[list[Any], UnsetType] = UNSET
+    emojis: Union[list[Any], UnsetType] = UNSET
+    features: Union[list[str], UnsetType] = UNSET
+    mfa_level: Union[int, UnsetType] = UNSET
+    application_id: Union[str, None, UnsetType] = UNSET
+    system_channel_id: Union[str, None, UnsetType] = UNSET
+    system_channel_flags: Union[int, UnsetType] = UNSET
+    rules_channel_id: Union[str, None, UnsetType] = UNSET
+    max_presences: Union[int, None, UnsetType] = UNSET
+    max_members: Union[int, UnsetType] = UNSET
+    vanity_url_code: Union[str, None, UnsetType] = UNSET
+    description: Union[str, None, UnsetType] = UNSET
+    banner: Union[str, None, UnsetType] = UNSET
+    premium_tier: Union[int, UnsetType] = UNSET
+    premium_subscription_count: Union[int, UnsetType] = UNSET
+    preferred_locale: Union[str, UnsetType] = UNSET
+    public_updates_channel_id: Union[str, None, UnsetType] = UNSET
+    max_video_channel_users: Union[int, UnsetType] = UNSET
+    approximate_member_count: Union[int, UnsetType] = UNSET
+    approximate_presence_count: Union[int, UnsetType] = UNSET
+    welcome_screen: Union[Any, UnsetType] = UNSET
+    nsfw_level: Union[int, UnsetType] = UNSET
+    stickers: Union[list[Any], UnsetType] = UNSET
+    premium_progress_bar_enabled: Union[bool, UnsetType] = UNSET
+    # only sent in GUILD_CREATE
+    joined_at: Union[str, UnsetType] = UNSET
+    large: Union[bool, UnsetType] = UNSET
+    unavailable: Union[bool, UnsetType] = UNSET
+    member_count: Union[int, UnsetType] = UNSET
+    voice_states: Union[list[Any], UnsetType] = UNSET
+    members: Union[list[GuildMember], UnsetType] = UNSET
+    channels: Union[list[Any], UnsetType] = UNSET
+    threads: Union[list[Any], UnsetType] = UNSET
+    presences: Union[list[Any], UnsetType] = UNSET
+    stage_instances: Union[list[Any], UnsetType] = UNSET
+    guild_scheduled_events: Union[list[Any], UnsetType] = UNSET
+
+
+class Interaction(Payload):
+    id: Union[str, UnsetType] = UNSET
+    application_id: Union[str, UnsetType] = UNSET
+    type: Union[int, UnsetType] = UNSET
+    data: Union[Any, UnsetType] = UNSET
+    guild_id: Union[str, UnsetType] = UNSET
+    channel: Union[Any, UnsetType] = UNSET
+    channel_id: Union[str, UnsetType] = UNSET
+    member: Union[GuildMember, UnsetType] = UNSET
+    user: Union[User, UnsetType] = UNSET
+    token: Union[str, UnsetType] = UNSET
+    version: Union[int, UnsetType] = UNSET
+    message: Union[Message, UnsetType] = UNSET
+    app_permissions: Union[str, UnsetType] = UNSET
+    locale: Union[str, UnsetType] = UNSET
+    guild_locale: Union[str, UnsetType] = UNSET
+
+
+class _GatewayPayload(msgspec.Struct, gc=False):
+    op: int
+    d: msgspec.Raw = msgspec.Raw(b'null')
+    s: Union[int, None] = None
+    t: Union[str, None] = None
+
+
+_payload_decoder = msgspec.json.Decoder(_GatewayPayload)
+_decoder = msgspec.json.Decoder()
+
+DISPATCH_DECODERS: dict[str, msgspec.json.Decoder] = {
+    'MESSAGE_CREATE': msgspec.json.Decoder(Message),
+    'GUILD_CREATE': msgspec.json.Decoder(Guild),
+    'GUILD_MEMBER_ADD': msgspec.json.Decoder(GuildMemberAdd),
+    'GUILD_MEMBERS_CHUNK': msgspec.json.Decoder(GuildMembersChunk),
+    'INTERACTION_CREATE': msgspec.json.Decoder(Interaction),
+}
+# (method, route path) -> decoder of its response
+RESPONSE_DECODERS: dict[tuple[str, str], msgspec.json.Decoder] = {
+    ('GET', '/users/@me'): msgspec.json.Decoder(User),
+    ('GET', '/users/{user_id}'): msgspec.json.Decoder(User),
+    ('GET', '/guilds/{guild_id}'): msgspec.json.Decoder(Guild),
+    ('GET', '/guilds/{guild_id}/members'): msgspec.json.Decoder(list[GuildMember]),
+    ('GET', '/guilds/{guild_id}/members/{user_id}'): msgspec.json.Decoder(GuildMember),
+    ('GET', '/channels/{channel_id}/messages'): msgspec.json.Decoder(list[Message]),
+    ('POST', '/channels/{channel_id}/messages'): msgspec.json.Decoder(Message),
+    ('GET', '/channels/{channel_id}/messages/{message_id}'): msgspec.json.Decoder(
+        Message
+    ),
+    ('PATCH', '/channels/{channel_id}/messages/{message_id}'): msgspec.json.Decoder(
+        Message
+    ),
+}
+
+
+def _decode(decoder: msgspec.json.Decoder, data: bytes | str) -> Any:
+    try:
+        return decoder.decode(data)
+    except msgspec.ValidationError as exc:
+        # Discord sent something the Structs didn't expect, which shouldn't
+        # cost us the payload
+        _log.debug(f'falling back to untyped decoding: {exc}')
+        return _decoder.decode(data)
+
+
+def decode_payload(data: bytes | str) -> dict[str, Any]:
+    """
+    Decodes a gateway payload, decoding hot dispatches into Structs.
+
+    Returns
+    -------
+    dict[:class:`str`, Any]
+        The payload, with ``d`` being a Struct for the dispatches
+        in :data:`DISPATCH_DECODERS`.
+    """
+    payload = _payload_decoder.decode(data)
+    decoder = DISPATCH_DECODERS.get(payload.t)
+
+    return {
+        'op': payload.op,
+        'd': _decoder.decode(payload.d)
+        if decoder is None
+        else _decode(decoder, payload.d),
+        's': payload.s,
+        't': payload.t,
+    }
+
+
+def decode_response(method: str, path: str, data: bytes) -> Any:
+    """Decodes a REST response, into Structs for the routes in :data:`RESPONSE_DECODERS`."""
+    decoder = RESPONSE_DECODERS.get((method, path))
+    return _decoder.decode(data) if decoder is None else _decode(decoder, data)
@@ -60,17 +60,35 @@ T = TypeVar('T')
 
 
 async def _text_or_json(cr: ClientResponse) -> str | dict[str, Any]:
+    # the body is read once, and only decoded to text when it isn't json
+    data = await cr.read()
     if cr.content_type == 'application/json':
-        return await cr.json(encoding='utf-8', loads=loads)
-    return await cr.text('utf-8')
+        return loads(data)
+    return data.decode('utf-8')
 
 
-def loads(data: Any) -> Any:
-    return msgspec.json.decode(data.encode()) if msgspec else json.loads(data)
+def _encode_unsupported(obj: Any) -> Any:
+    # Snowflakes subclass int, which msgspec only encodes exactly. Discord sends
+    # ids as strings, so they're sent back the same way
+    if isinstance(obj, int):
+        return str(obj)
+    raise NotImplementedError(f'Encoding objects of type {type(obj)} is unsupported')
+
+
+_encoder = msgspec.json.Encoder(enc_hook=_encode_unsupported) if msgspec else None
+
+
+def loads(data: bytes | str) -> Any:
+    return msgspec.json.decode(data) if msgspec else json.loads(data)
 
 
 def dumps(data: Any) -> str:
-    return msgspec.json.encode(data).decode('utf-8') if msgspec else json.dumps(data)
+    return _encoder.encode(data).decode('utf-8') if msgspec else json.dumps(data)
+
+
+def dumps_bytes(data: Any) -> bytes:
+    """Like :func:`dumps`, without the round trip through :class:`str` when msgspec is installed."""
+    return _encoder.encode(data) if msgspec else json.dumps(data).encode('utf-8')
 
 
 def parse_errors(errors: dict[str, Any], key: str | None = None) -> dict[str, str]:
@@ -37,10 +37,17 @@ if TYPE_CHECKING:
 
 
 class Webhook:
-    def __init__(self, id: int, token: str) -> None:
+    def __init__(
+        self,
+        id: int,
+        token: str,
+        http: HTTPClient | None = None,
+        priority: int = 0,
+    ) -> None:
         self.id = Snowflake(id)
         self.token = token
-        self._http = HTTPClient()
+        self._http = http or HTTPClient()
+        self._priority = priority
 
     async def send(
         self,
@@ -87,6 +94,7 @@ class Webhook:
                 sticker_ids=sticker_ids,
                 flags=flags,
             ),
+            priority=self._priority,
         )
 
 
@@ -41,11 +41,12 @@ packages = [
     'pycord.api.routers',
     'pycord.ext',
     'pycord.ext.gears',
+    'pycord.testing',
 ]
 
 extra_requires = {
     'speed': [
-        'msgspec~=0.9.1',  # Faster alternative to the normal json module.
+        'msgspec~=0.18',  # Faster alternative to the normal json module.
         'aiodns~=3.0',  # included in aiohttp speed.
         'Brotli~=1.0.9',  # included in aiohttp speed.
         'ciso8601~=2.2.0',  # Faster datetime parsing.
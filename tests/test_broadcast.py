@@ -0,0 +1,65 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from pycord import HTTPClient
+from pycord.snowflake import Snowflake
+from pycord.testing import FakeREST
+
+
+def test_broadcast_reaches_every_channel_once():
+    rest = FakeREST(global_limit=200)
+    channels = [rest.add_channel()['id'] for _ in range(60)]
+    missing = rest.snowflake()
+
+    async def main():
+        async with rest:
+            api = HTTPClient('token', base_url=rest.url, global_limit=200)
+            results = [
+                result
+                async for result in api.broadcast(
+                    [*channels, channels[0], missing], {'content': 'hello'}
+                )
+            ]
+            await api.close_session()
+            return results
+
+    results = asyncio.run(main())
+    failed = [result for result in results if not result.ok]
+    assert len(results) == 61
+    assert [result.channel_id for result in failed] == [missing]
+    assert all(len(rest.messages[channel]) == 1 for channel in channels)
+    assert rest.rate_limited == {}
+
+
+# checkpoints may come back as plain ints, such as when loaded from a database
+@pytest.mark.parametrize('checkpoint', [list, lambda ids: [int(id) for id in ids]])
+def test_broadcast_resumes_from_completed(checkpoint):
+    rest = FakeREST(global_limit=200)
+    channels = [Snowflake(rest.add_channel()['id']) for _ in range(30)]
+
+    async def main():
+        async with rest:
+            api = HTTPClient('token', base_url=rest.url, global_limit=200)
+            completed = []
+
+            async with aclosing(
+                api.broadcast(channels, {'content': 'hello'}, concurrency=5)
+            ) as results:
+                async for result in results:
+                    completed.append(result.channel_id)
+                    if len(completed) == 10:
+                        break
+
+            resumed = [
+                result.channel_id
+                async for result in api.broadcast(
+                    channels, {'content': 'hello'}, completed=checkpoint(completed)
+                )
+            ]
+            await api.close_session()
+            return completed, resumed
+
+    completed, resumed = asyncio.run(main())
+    assert sorted(completed + resumed) == sorted(channels)
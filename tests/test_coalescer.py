@@ -0,0 +1,48 @@
+import asyncio
+
+from pycord import HTTPClient
+from pycord.testing import FakeREST, Fault
+
+
+def test_edits_are_coalesced():
+    edit = ('PATCH', '/channels/{channel_id}/messages/{message_id}')
+    rest = FakeREST(buckets={edit: ('edits', 2, 0.3)})
+    channel_id = rest.add_channel()['id']
+    message_id = rest.add_message(channel_id, 'progress: 0')['id']
+    # slower than edits are made, so there's always another one pending
+    rest.inject(Fault(None, delay=0.05, method='PATCH'))
+
+    async def main():
+        async with rest:
+            api = HTTPClient('token', base_url=rest.url)
+            results = []
+
+            async def update(progress: int) -> None:
+                message = await api.edit_message(
+                    channel_id,
+                    message_id,
+                    content=f'progress: {progress}',
+                    coalesce=True,
+                )
+                seen = int(message['content'].split()[-1])
+                results.append((progress, seen, len(tasks)))
+
+            tasks = []
+            for progress in range(1, 51):
+                tasks.append(asyncio.create_task(update(progress)))
+                await asyncio.sleep(0.01)
+            await asyncio.gather(*tasks)
+
+            assert api.edits.pending == 0
+            await api.close_session()
+            return results
+
+    results = asyncio.run(main())
+    # callers see their own edit or a later one, taking far fewer than 50 requests
+    assert all(seen >= progress for progress, seen, _ in results)
+    assert results[-1][:2] == (50, 50)
+    # while edits are still being made, those already sent don't wait for them
+    assert results[0][2] < 50
+    assert rest.messages[channel_id][message_id]['content'] == 'progress: 50'
+    assert rest.statuses[200] <= 6
+    assert rest.rate_limited == {}
@@ -0,0 +1,55 @@
+import asyncio
+
+from aiohttp import web
+
+from pycord import ConnectionPool, HTTPClient, Route
+
+
+async def serve(peers: set) -> tuple[web.AppRunner, str]:
+    async def respond(request: web.Request) -> web.Response:
+        peers.add(request.transport.get_extra_info('peername'))
+        # keeps warm up requests from finishing before the others started
+        await asyncio.sleep(0.05)
+        return web.json_response({'url': 'wss://gateway.discord.gg'})
+
+    app = web.Application()
+    app.router.add_get('/gateway', respond)
+    app.router.add_get('/users/@me', respond)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://127.0.0.1:{port}'
+
+
+def test_warm_connections_are_reused():
+    async def main() -> None:
+        peers = set()
+        runner, url = await serve(peers)
+        pool = ConnectionPool(warm_connections=3)
+        api = HTTPClient('token', base_url=url, pool=pool)
+
+        assert await api.warm_up() == 3
+        assert len(peers) == 3
+        (usage,) = pool.utilization.values()
+        assert usage == {'acquired': 0, 'idle': 3, 'limit': 100}
+
+        await asyncio.gather(
+            *(api.request('GET', Route('/users/@me')) for _ in range(3))
+        )
+        # every request went over a connection opened by the warm up
+        assert len(peers) == 3
+
+        gateway = pool.session(gateway=True)
+        assert gateway.connector is pool.gateway_connector
+        assert gateway.connector is not pool.connector
+
+        await gateway.close()
+        await api.close_session()
+        # the pool was given to the client, so it's left open
+        assert not pool.connector.closed
+        await pool.close()
+        await runner.cleanup()
+
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+import asyncio
+
+from pycord.events import ChannelPinsUpdate, Event
+from pycord.snowflake import Snowflake
+from pycord.state import State
+
+PINS = {'channel_id': '2', 'guild_id': '1'}
+
+
+class Loaded(Event):
+    _name = 'CHANNEL_PINS_UPDATE'
+    loads = 0
+
+    async def _async_load(self, data, state) -> None:
+        Loaded.loads += 1
+
+
+def test_dispatch_table():
+    async def main() -> None:
+        state = State()
+        manager = state.event_manager
+        received = []
+
+        async def listener(event) -> None:
+            received.append(event)
+
+        # nothing is registered for it, so there's nothing to do
+        await manager.publish('TYPING_START', {})
+        # registered, but nothing listens and it doesn't cache anything
+        assert ChannelPinsUpdate._stateless
+        await manager.publish('CHANNEL_PINS_UPDATE', PINS)
+
+        manager.add_event(Loaded, listener)
+        waiter = manager.wait_for(ChannelPinsUpdate)
+        await manager.publish('CHANNEL_PINS_UPDATE', PINS)
+        await manager.drain()
+
+        pins = await waiter
+        assert pins.channel_id == 2
+        assert Loaded.loads == 1
+        assert [type(event) for event in received] == [Loaded]
+        assert manager._dispatch['CHANNEL_PINS_UPDATE'] == [ChannelPinsUpdate, Loaded]
+
+    asyncio.run(main())
+
+
+def test_lazy_loading():
+    async def main() -> None:
+        state = State(max_messages=0)
+        manager = state.event_manager
+        channels = state.store.sift('channels')
+        await channels.save([Snowflake(1)], Snowflake(5), 'channel')
+
+        # none of these would load, were they built
+        await manager.publish('MESSAGE_CREATE', {})
+        await manager.publish('CHANNEL_DELETE', {'id': '5', 'guild_id': '1'})
+        await manager.publish('CHANNEL_PINS_UPDATE', PINS)
+        assert await channels.get_one([Snowflake(1)], Snowflake(5)) is None
+        assert manager.skip_ratio == 1
+
+        waiter = manager.wait_for(ChannelPinsUpdate)
+        await manager.publish('CHANNEL_PINS_UPDATE', PINS)
+        await waiter
+        assert (manager.dispatched, manager.skipped) == (4, 3)
+
+    asyncio.run(main())
+
+
+def test_wait_for():
+    async def main() -> None:
+        manager = State().event_manager
+        pins = ChannelPinsUpdate
+
+        # thousands of flows each waiting on their own channel
+        waiters = {
+            channel_id: manager.wait_for(pins, channel_id=channel_id)
+            for channel_id in range(1000)
+        }
+        checked = manager.wait_for(
+            pins, check=lambda event: event.guild_id == 7, channel_id=Snowflake(2)
+        )
+        expired = manager.wait_for(pins, timeout=0.01, channel_id=1)
+        cancelled = manager.wait_for(pins, user_id=3)
+        cancelled.cancel()
+
+        await manager.publish('CHANNEL_PINS_UPDATE', PINS)
+        await manager.publish(
+            'CHANNEL_PINS_UPDATE', {'channel_id': '2', 'guild_id': '7'}
+        )
+
+        assert (await waiters[2]).guild_id == 1
+        assert (await checked).guild_id == 7
+        assert not any(waiter.done() for id, waiter in waiters.items() if id != 2)
+        try:
+            await expired
+        except asyncio.TimeoutError:
+            pass
+        else:
+            raise AssertionError('wait_for did not time out')
+
+        # everything that's stopped waiting is gone
+        index = manager.wait_fors[pins]
+        assert len(index) == 999
+        assert ('channel_id', 2) not in index
+        assert ('user_id', 3) not in index
+
+    asyncio.run(main())
@@ -0,0 +1,269 @@
+import asyncio
+
+from aiohttp import ClientSession
+
+from pycord.gateway import (
+    HandoffServer,
+    Notifier,
+    PassThrough,
+    ReconnectPolicy,
+    Recorder,
+    Shard,
+    ShardManager,
+)
+from pycord.gateway.handoff import _receive
+from pycord.state import State
+from pycord.testing import FakeGateway
+
+DISPATCHES = [
+    (0.0, 'TYPING_START', {'channel_id': '2', 'user_id': '3', 'timestamp': 0}),
+    (0.1, 'TYPING_START', {'channel_id': '2', 'user_id': '4', 'timestamp': 0}),
+    (0.2, 'TYPING_START', {'channel_id': '2', 'user_id': '5', 'timestamp': 0}),
+]
+
+
+async def wait_until(predicate) -> None:
+    async def poll() -> None:
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), 5)
+
+
+def create_manager(url: str, policy: ReconnectPolicy | None = None) -> ShardManager:
+    state = State(
+        gateway_url=url, reconnect_policy=policy or ReconnectPolicy(base=0.01)
+    )
+    # nothing is listening, this keeps READY from touching the REST API
+    state.event_manager.events.clear()
+    state.shard_concurrency = PassThrough(10, 5)
+    manager = ShardManager(state, [0], 1)
+    manager.session = ClientSession()
+    return manager
+
+
+async def connect_shard(
+    url: str, recorder: Recorder | None = None, manager: ShardManager | None = None
+) -> Shard:
+    manager = manager or create_manager(url)
+    shard = Shard(
+        len(manager.shards),
+        manager._state,
+        manager.session,
+        Notifier(manager),
+        recorder=recorder,
+    )
+    manager.shards.append(shard)
+    await shard.connect(token='token')
+    return shard
+
+
+async def close_shard(shard: Shard) -> None:
+    shard._receive_task.cancel()
+    await shard._ws.close()
+    await shard._session.close()
+
+
+def test_record_and_replay(tmp_path):
+    path = tmp_path / 'shard-0.bin'
+
+    async def main() -> None:
+        async with FakeGateway(dispatches=DISPATCHES, speed=None) as gateway:
+            recorder = Recorder(path)
+            shard = await connect_shard(gateway.url, recorder)
+            await wait_until(lambda: gateway.replays_finished == 1)
+            await wait_until(lambda: shard._sequence == 4)
+            recorder.close()
+            assert shard.session_id == 'fake-1'
+            await close_shard(shard)
+
+        replay = FakeGateway(recording=path, speed=None)
+        assert [t for _, t, _ in replay.dispatches] == ['TYPING_START'] * 3
+        assert replay.ready['user']['username'] == 'pycord'
+
+    asyncio.run(main())
+
+
+def test_recordings_are_closed_on_shutdown(tmp_path):
+    async def main() -> None:
+        async with FakeGateway(dispatches=DISPATCHES, speed=None) as gateway:
+            manager = create_manager(gateway.url)
+            manager.record = str(tmp_path / 'shard-{shard_id}.bin')
+            shard = manager.create_shard(0)
+            manager.add_shard(shard)
+            await shard.connect(token='token')
+            await wait_until(lambda: shard._sequence == 4)
+
+            shard._receive_task.cancel()
+            await shard._ws.close()
+            await manager.close()
+            assert shard.recorder._file.closed
+
+        replay = FakeGateway(recording=tmp_path / 'shard-0.bin', speed=None)
+        assert [t for _, t, _ in replay.dispatches] == ['TYPING_START'] * 3
+
+    asyncio.run(main())
+
+
+def test_reconnect_resumes_session():
+    async def main() -> None:
+        async with FakeGateway(dispatches=DISPATCHES, speed=None) as gateway:
+            shard = await connect_shard(gateway.url)
+            await wait_until(lambda: gateway.replays_finished == 1)
+            await gateway.sessions[0].reconnect()
+            await wait_until(lambda: gateway.resumes == 1)
+            await wait_until(lambda: shard._sequence == 5)
+            assert gateway.sessions[0].resumed
+            assert gateway.identifies == 1
+            assert gateway.connections == 2
+            await close_shard(shard)
+
+    asyncio.run(main())
+
+
+def test_heartbeats_are_acknowledged():
+    async def main() -> None:
+        async with FakeGateway(heartbeat_interval=0.05) as gateway:
+            shard = await connect_shard(gateway.url)
+            await wait_until(lambda: gateway.sessions[0].heartbeats >= 3)
+            # every heartbeat was acknowledged in time, so it never went zombie
+            assert gateway.connections == 1
+            assert len(shard._notifier.manager.heartbeats) == 1
+            await close_shard(shard)
+
+    asyncio.run(main())
+
+
+def test_reconnect_storm_is_paced():
+    async def main() -> None:
+        async with FakeGateway() as gateway:
+            policy = ReconnectPolicy(base=0.01, concurrency=2)
+            manager = create_manager(gateway.url, policy)
+            shards = [
+                await connect_shard(gateway.url, manager=manager) for _ in range(6)
+            ]
+            await wait_until(lambda: all(shard.session_id for shard in shards))
+            await gateway.close_sessions(4000)
+            await wait_until(lambda: gateway.resumes == 6)
+            assert policy.reconnects == 6
+            assert policy.attempts == 12
+            assert policy.connecting == policy.waiting == 0
+            for shard in shards[:-1]:
+                shard._receive_task.cancel()
+                await shard._ws.close()
+            await close_shard(shards[-1])
+
+    asyncio.run(main())
+
+
+class CachedGuild:
+    def __init__(self, id: int, state: State) -> None:
+        self.id = id
+        self._state = state
+
+
+def test_handoff_resumes_shards(tmp_path):
+    path = str(tmp_path / 'handoff.sock')
+
+    async def main() -> None:
+        async with FakeGateway() as gateway:
+            old = create_manager(gateway.url)
+            old.amount = 2
+            old._state.token = 'token'
+            old._state.shard_managers.append(old)
+            old._state._session_start_limit = {'max_concurrency': 2}
+            shards = [await connect_shard(gateway.url, manager=old) for _ in range(2)]
+            await wait_until(lambda: all(shard.session_id for shard in shards))
+            # guild 1 << 22 is on shard 1
+            guild = CachedGuild(1 << 22, old._state)
+            await old._state.store.sift('guilds').save([guild.id], guild.id, guild)
+
+            server = HandoffServer(old._state, path)
+            await server.start()
+
+            new = create_manager(gateway.url)
+            new.amount = 2
+            new._state.token = 'token'
+            taken = await new.take_over(path)
+            await server.done
+
+            assert sorted(taken) == [0, 1]
+            assert old.shards == []
+            assert gateway.identifies == 2
+            assert gateway.resumes == 2
+            assert {shard.session_id for shard in new.shards} == {'fake-1', 'fake-2'}
+
+            cached = await new._state.store.sift('guilds').get_one([guild.id], guild.id)
+            assert cached._state is new._state
+
+            for shard in new.shards[:-1]:
+                shard._receive_task.cancel()
+                await shard._ws.close()
+            await close_shard(new.shards[-1])
+            await old.session.close()
+
+    asyncio.run(main())
+
+
+def test_failed_handoff_keeps_shards(tmp_path):
+    path = str(tmp_path / 'handoff.sock')
+
+    async def main() -> None:
+        async with FakeGateway() as gateway:
+            old = create_manager(gateway.url)
+            old.amount = 2
+            old._state.token = 'token'
+            old._state.shard_managers.append(old)
+            old._state._session_start_limit = {'max_concurrency': 2}
+            shards = [await connect_shard(gateway.url, manager=old) for _ in range(2)]
+            await wait_until(lambda: all(shard.session_id for shard in shards))
+
+            server = HandoffServer(old._state, path, ack_timeout=5)
+            await server.start()
+
+            # the new process dies after being sent its first bucket
+            reader, writer = await asyncio.open_unix_connection(path)
+            assert (await _receive(reader, old._state))[0] == 'ready'
+            kind, bucket = await _receive(reader, old._state)
+            assert kind == 'bucket'
+            assert [session['id'] for session in bucket['shards']] == [0]
+            writer.close()
+
+            # so the old process resumes it, and keeps serving everything
+            await wait_until(lambda: gateway.resumes == 1)
+            assert old.shards == shards
+            assert not server.done.done()
+            assert gateway.identifies == 2
+
+            server.close()
+            for shard in shards[:-1]:
+                shard._receive_task.cancel()
+                await shard._ws.close()
+            await close_shard(shards[-1])
+
+    asyncio.run(main())
+
+
+def test_queued_identifies_do_not_starve_resumes():
+    async def main() -> None:
+        async with FakeGateway() as gateway:
+            policy = ReconnectPolicy(base=0.01, concurrency=1)
+            manager = create_manager(gateway.url, policy)
+            # one identify per minute, which the first shard uses up
+            manager._state.shard_concurrency = PassThrough(1, 60)
+            resuming = await connect_shard(gateway.url, manager=manager)
+            await wait_until(lambda: resuming.session_id is not None)
+
+            identifying = asyncio.create_task(
+                connect_shard(gateway.url, manager=manager)
+            )
+            await wait_until(lambda: len(manager.shards) == 2)
+
+            await asyncio.wait_for(resuming.reconnect(), 5)
+            await wait_until(lambda: gateway.resumes == 1)
+            assert policy.waiting == 0
+
+            identifying.cancel()
+            await close_shard(resuming)
+
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+import asyncio
+from urllib.parse import quote
+
+import pytest
+
+from pycord import HTTPClient, Route
+from pycord.api.execution import RetryPolicy
+from pycord.errors import HTTPException, NotFound
+from pycord.testing import FakeREST, Fault
+
+
+def run(rest: FakeREST, requests, **kwargs):
+    async def main():
+        async with rest:
+            api = HTTPClient(
+                'token',
+                base_url=rest.url,
+                retry_policy=RetryPolicy(base=0.01),
+                **kwargs,
+            )
+            try:
+                return await requests(api)
+            finally:
+                await api.close_session()
+
+    return asyncio.run(main())
+
+
+def test_messages_round_trip():
+    rest = FakeREST()
+    guild = rest.add_guild()
+    channel_id = next(iter(rest.messages))
+    old = rest.add_message(channel_id, 'old', age=15 * 24 * 60 * 60)
+
+    async def requests(api: HTTPClient):
+        sent = [
+            await api.create_message(channel_id, content=str(idx)) for idx in range(3)
+        ]
+        await api.edit_message(channel_id, sent[0]['id'], content='edited')
+        await api.request(
+            'PUT',
+            Route(
+                '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me',
+                channel_id=channel_id,
+                message_id=sent[1]['id'],
+                emoji=quote('👍'),
+            ),
+        )
+        await api.bulk_delete_messages(channel_id, [m['id'] for m in sent[1:]])
+
+        with pytest.raises(HTTPException):
+            await api.bulk_delete_messages(channel_id, [old['id'], sent[0]['id']])
+        with pytest.raises(NotFound):
+            await api.get_guild_member(guild['id'], '2')
+
+        return await api.request(
+            'GET', Route('/channels/{channel_id}/messages', channel_id=channel_id)
+        )
+
+    messages = run(rest, requests)
+    assert [m['content'] for m in messages] == ['edited', 'old']
+    assert rest.statuses == {200: 5, 204: 2, 400: 1, 404: 1}
+
+
+def test_rate_limits_are_followed():
+    bucket = ('POST', '/channels/{channel_id}/messages')
+    rest = FakeREST(buckets={bucket: ('messages', 2, 0.2)})
+    channel_id = rest.add_channel()['id']
+
+    async def requests(api: HTTPClient):
+        await asyncio.gather(
+            *(api.create_message(channel_id, content='hi') for _ in range(6))
+        )
+
+    run(rest, requests)
+    assert len(rest.messages[channel_id]) == 6
+    # the limiter learns the bucket from the first response, and waits for it after
+    assert rest.rate_limited.get('user', 0) <= 1
+
+
+def test_faults_are_injected():
+    rest = FakeREST()
+    channel_id = rest.add_channel()['id']
+    fault = rest.inject(Fault(503, method='GET', times=2))
+
+    async def requests(api: HTTPClient):
+        return await api.get_channel(channel_id)
+
+    assert run(rest, requests)['id'] == channel_id
+    assert fault.injected == 2
+    assert rest.faults == []
+    assert rest.statuses == {503: 2, 200: 1}
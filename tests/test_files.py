@@ -0,0 +1,69 @@
+import asyncio
+
+from aiohttp import web
+
+from pycord import HTTPClient, Route
+from pycord.file import BytesFile, StreamFile, SysFile
+
+
+def test_files_are_streamed_again_on_retry(tmp_path):
+    path = tmp_path / 'upload.bin'
+    path.write_bytes(b'x' * 100_000)
+
+    async def chunks():
+        for _ in range(3):
+            yield b'y' * 1000
+
+    async def main() -> list[list[tuple[str, str | None, int]]]:
+        received = []
+
+        async def upload(request: web.Request) -> web.Response:
+            reader = await request.multipart()
+            received.append(
+                [
+                    (part.name, part.filename, len(await part.read()))
+                    async for part in reader
+                ]
+            )
+
+            if len(received) == 1:
+                return web.json_response(
+                    {'retry_after': 0.01, 'global': False},
+                    status=429,
+                    headers={'X-RateLimit-Scope': 'user'},
+                )
+            return web.json_response({'id': '1'})
+
+        app = web.Application()
+        app.router.add_post('/channels/{channel_id}/messages', upload)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        api = HTTPClient('token', base_url=f'http://127.0.0.1:{port}')
+        files = [
+            SysFile(str(path)),
+            BytesFile('hello.txt', b'hello', spoiler=True),
+            StreamFile('stream.bin', chunks),
+        ]
+        await api.request(
+            'POST',
+            Route('/channels/{channel_id}/messages', channel_id=1),
+            {'content': 'files'},
+            files=files,
+        )
+
+        await api.close_session()
+        await runner.cleanup()
+        return received
+
+    received = asyncio.run(main())
+    expected = [
+        ('payload_json', None, 19),
+        ('files[0]', 'upload.bin', 100_000),
+        ('files[1]', 'SPOILER_hello.txt', 5),
+        ('files[2]', 'stream.bin', 3000),
+    ]
+    assert received == [expected, expected]
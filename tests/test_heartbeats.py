@@ -0,0 +1,56 @@
+import asyncio
+
+from pycord.gateway.heartbeat import HeartbeatScheduler
+
+from .test_passthrough import run
+
+INTERVAL = 0.2
+
+
+class FakeShard:
+    def __init__(self, id: int, blocked: bool = False) -> None:
+        self.id = id
+        self._heartbeat_interval = INTERVAL
+        self._awaiting_ack = False
+        self.blocked = blocked
+        self.beats = 0
+
+    async def send_heartbeat(self) -> None:
+        self.beats += 1
+        if self.blocked:
+            # stuck behind its rate limiter, or a socket that won't drain
+            await asyncio.Event().wait()
+
+    async def reconnect(self, code: int) -> None:
+        raise AssertionError('no heartbeat went unacknowledged')
+
+
+def test_reconnects_keep_one_heartbeat_chain():
+    async def main() -> None:
+        scheduler = HeartbeatScheduler(tick=0.01, ack_timeout=INTERVAL)
+        shard = FakeShard(0)
+        blocked = FakeShard(1, blocked=True)
+        scheduler.add(blocked, jitter=False)
+
+        # every reconnect removes and adds the shard again
+        for _ in range(3):
+            scheduler.add(shard, jitter=False)
+            await asyncio.sleep(INTERVAL / 2)
+            scheduler.remove(shard)
+        scheduler.add(shard, jitter=False)
+        shard.beats = 0
+
+        await asyncio.sleep(INTERVAL * 5 + INTERVAL / 2)
+        scheduler.remove(shard)
+        scheduler.remove(blocked)
+        for task in scheduler._sending:
+            task.cancel()
+
+        # old timers from before each reconnect would add more chains, and
+        # awaiting the blocked shard's heartbeat would hold up everyone else's
+        assert shard.beats == 5
+        # nothing is kept for shards which were removed
+        assert len(scheduler) == 0
+        assert scheduler._generations == {}
+
+    run(main())
@@ -0,0 +1,63 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from pycord.commands.application import Context
+
+INTERACTION = {
+    'id': '1',
+    'application_id': '2',
+    'type': 2,
+    'token': 'token',
+    'version': 1,
+    'data': {'id': '3', 'name': 'slow', 'type': 1},
+}
+
+
+class FakeHTTP:
+    def __init__(self) -> None:
+        self.responses = []
+        self.followups = []
+
+    async def create_interaction_response(
+        self, interaction_id, interaction_token, response, deadline=None
+    ) -> None:
+        await asyncio.sleep(0.01)
+        self.responses.append(response['type'])
+
+    async def request(self, method, route, data=None, **kwargs) -> None:
+        self.followups.append((route.path, route.webhook_id, data['content']))
+
+
+def create_context() -> tuple[Context, FakeHTTP]:
+    http = FakeHTTP()
+    return Context(INTERACTION, SimpleNamespace(http=http), response=True), http
+
+
+@pytest.mark.parametrize('delay', [0.05, 0.005])
+def test_slow_handlers_are_deferred(delay):
+    async def main() -> None:
+        ctx, http = create_context()
+        ctx.auto_defer(after=0.02)
+        # the defer is either long done, or still on its way
+        await asyncio.sleep(delay + 0.02)
+        await ctx.send('done')
+
+        assert http.responses == [5]
+        assert http.followups == [('/webhooks/{webhook_id}/{webhook_token}', 2, 'done')]
+
+    asyncio.run(main())
+
+
+def test_fast_handlers_are_not_deferred():
+    async def main() -> None:
+        ctx, http = create_context()
+        ctx.auto_defer(after=0.02)
+        await ctx.send('done')
+        await asyncio.sleep(0.05)
+
+        assert http.responses == [4]
+        assert http.followups == []
+
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+import asyncio
+
+from aiohttp import web
+
+from pycord import HTTPClient, Route, RouteMetrics
+from pycord.api.metrics import Histogram
+from pycord.utils import dumps_bytes
+
+
+async def serve() -> tuple[web.AppRunner, str]:
+    requests = 0
+
+    async def handle(request: web.Request) -> web.Response:
+        nonlocal requests
+        requests += 1
+
+        if requests == 1:
+            return web.json_response(
+                {'message': 'You are being rate limited.', 'retry_after': 0.01},
+                status=429,
+                headers={'X-RateLimit-Scope': 'user'},
+            )
+        return web.json_response({'id': '1'}, headers={'X-RateLimit-Bucket': 'abcd'})
+
+    app = web.Application()
+    app.router.add_post('/channels/{channel_id}/messages', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://127.0.0.1:{port}'
+
+
+def test_requests_are_recorded_per_route():
+    async def main() -> None:
+        runner, url = await serve()
+        metrics = RouteMetrics()
+        api = HTTPClient('token', base_url=url, metrics=metrics)
+        events = []
+
+        def broken(trace) -> None:
+            raise RuntimeError('hooks failing must not fail requests')
+
+        api.request_hooks.extend(
+            [lambda trace: events.append(('request', trace.attempt)), broken]
+        )
+        api.response_hooks.append(
+            lambda trace: events.append(('response', trace.status, trace.bucket))
+        )
+
+        await api.request(
+            'POST',
+            Route('/channels/{channel_id}/messages', channel_id=1),
+            {'content': 'hi'},
+        )
+        await api.close_session()
+        await runner.cleanup()
+
+        assert events == [
+            ('request', 0),
+            ('response', 429, None),
+            ('request', 1),
+            ('response', 200, 'abcd'),
+        ]
+
+        stats = metrics.snapshot()['POST /channels/{channel_id}/messages']
+        assert stats['requests'] == 2
+        assert stats['retries'] == 1
+        assert stats['statuses'] == {429: 1, 200: 1}
+        assert stats['rate_limits'] == {'user': 1}
+        assert stats['bytes_sent'] == 2 * len(dumps_bytes({'content': 'hi'}))
+        assert stats['bytes_received'] > 0
+        assert 0 < stats['latency']['p50'] <= stats['latency']['max']
+
+    asyncio.run(main())
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for ms in range(1, 101):
+        histogram.add(ms / 1000)
+
+    # percentiles are only as precise as the buckets they fall in
+    assert 0.05 <= histogram.percentile(50) <= 0.05 * 1.25
+    assert 0.099 <= histogram.percentile(99) <= 0.1
+    assert histogram.max == 0.1
@@ -0,0 +1,97 @@
+import asyncio
+from contextlib import aclosing
+
+from pycord import HTTPClient
+from pycord.errors import NotFound
+from pycord.snowflake import Snowflake
+from pycord.testing import FakeREST
+
+
+def run(rest: FakeREST, requests):
+    async def main():
+        async with rest:
+            api = HTTPClient('token', base_url=rest.url)
+            try:
+                return await requests(api)
+            finally:
+                await api.close_session()
+
+    return asyncio.run(main())
+
+
+def test_role_changes_are_merged():
+    rest = FakeREST()
+    guild_id = rest.add_guild()['id']
+    roles = [rest.add_role(guild_id, f'role-{idx}')['id'] for idx in range(5)]
+    member = rest.add_member(guild_id, {'id': '2', 'username': 'member'})
+    member['roles'] = [roles[0]]
+
+    async def requests(api: HTTPClient):
+        results = await asyncio.gather(
+            *(api.roles.add(guild_id, '2', role) for role in roles[1:]),
+            api.roles.remove(guild_id, '2', roles[0]),
+            # the same member and role, so only the removal is sent
+            api.roles.remove(Snowflake(guild_id), 2, Snowflake(roles[4])),
+            api.roles.add(guild_id, '2', rest.snowflake()),
+            return_exceptions=True,
+        )
+        # only the change to the unknown role failed
+        assert [type(result) for result in results] == [type(None)] * 6 + [NotFound]
+
+    run(rest, requests)
+    assert sorted(member['roles']) == sorted(roles[1:4])
+    # every role is sent on its own, so nothing else changed in between is lost
+    assert rest.requests == 6
+
+
+def test_bulk_role_changes_resume():
+    route = '/guilds/{guild_id}/members/{user_id}/roles/{role_id}'
+    rest = FakeREST(buckets={('PUT', route): ('member-roles', 10, 0.1)})
+    guild_id = rest.add_guild()['id']
+    role = rest.add_role(guild_id)['id']
+    ids = [str(idx) for idx in range(2, 32)]
+    for id in ids:
+        rest.add_member(guild_id, {'id': id, 'username': 'member'})
+
+    async def requests(api: HTTPClient):
+        completed = []
+        async with aclosing(api.roles.bulk(guild_id, ids, add=[role])) as results:
+            async for result in results:
+                assert result.ok
+                completed.append(result.id)
+                if len(completed) == 5:
+                    break
+
+        # as loaded back from a checkpoint
+        completed = [int(id) for id in completed]
+
+        async for result in api.roles.bulk(
+            guild_id, ids, add=[role], completed=completed
+        ):
+            assert int(result.id) not in completed
+            completed.append(int(result.id))
+        return completed
+
+    assert sorted(run(rest, requests)) == sorted(map(int, ids))
+    assert all(role in rest.members[guild_id][id]['roles'] for id in ids)
+    assert rest.rate_limited == {}
+
+
+def test_reactions_keep_their_order():
+    rest = FakeREST()
+    channel_id = rest.add_channel()['id']
+    message = rest.add_message(channel_id, 'poll')
+    emojis = ['1️⃣', '2️⃣', '3️⃣', '4️⃣']
+
+    async def requests(api: HTTPClient):
+        await asyncio.gather(
+            *(api.reactions.add(channel_id, message['id'], emoji) for emoji in emojis),
+            # changed again before being sent, so only removed
+            api.reactions.remove(channel_id, message['id'], '4️⃣'),
+        )
+        assert api.reactions.pending == 0
+
+    run(rest, requests)
+    assert [r['emoji']['name'] for r in message['reactions']] == emojis[:3]
+    # adds and removals only share a bucket once the first removal finds out
+    assert rest.statuses[204] == 4
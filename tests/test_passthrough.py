@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from pycord.errors import RateLimitTimeout
+from pycord.gateway.passthrough import PassThrough
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """An event loop whose clock only moves forward when it would otherwise sleep."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._now = 0.0
+        select = self._selector.select
+
+        def virtual_select(timeout: float | None = None):
+            events = select(0)
+            if not events and timeout:
+                self._now += timeout
+            return events
+
+        self._selector.select = virtual_select
+
+    def time(self) -> float:
+        return self._now
+
+
+def run(coro):
+    loop = VirtualClockLoop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_window_limits_acquisitions():
+    async def main():
+        limiter = PassThrough(2, 10)
+        loop = asyncio.get_running_loop()
+        times = []
+
+        for _ in range(5):
+            await limiter.acquire()
+            times.append(loop.time())
+
+        return times
+
+    assert run(main()) == [0, 0, 10, 10, 20]
+
+
+def test_waiters_are_fifo():
+    async def main():
+        limiter = PassThrough(1, 5)
+        order = []
+
+        async def worker(n: int) -> None:
+            await limiter.acquire()
+            order.append(n)
+
+        await asyncio.gather(*(worker(n) for n in range(6)))
+        return order
+
+    assert run(main()) == list(range(6))
+
+
+def test_priority_uses_reserved_capacity():
+    async def main():
+        limiter = PassThrough(3, 60, reserved=1)
+        await limiter.acquire()
+        await limiter.acquire()
+
+        with pytest.raises(RateLimitTimeout):
+            await limiter.acquire(timeout=0)
+
+        await limiter.acquire(priority=True, timeout=0)
+        return limiter.current
+
+    assert run(main()) == 0
+
+
+def test_priority_skips_queue():
+    async def main():
+        limiter = PassThrough(1, 5)
+        order = []
+
+        async def worker(name: str, priority: bool) -> None:
+            await limiter.acquire(priority=priority)
+            order.append(name)
+
+        await limiter.acquire()
+        tasks = [asyncio.create_task(worker(f'n{n}', False)) for n in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(worker('hb', True)))
+        await asyncio.gather(*tasks)
+        return order
+
+    assert run(main()) == ['hb', 'n0', 'n1', 'n2']
+
+
+def test_timeout_does_not_consume_capacity():
+    async def main():
+        limiter = PassThrough(1, 10)
+        loop = asyncio.get_running_loop()
+        await limiter.acquire()
+
+        with pytest.raises(RateLimitTimeout):
+            await limiter.acquire(timeout=3)
+
+        assert loop.time() == 3
+        await limiter.acquire()
+        return loop.time(), limiter.pending
+
+    assert run(main()) == (10, 0)
+
+
+def test_cancelled_waiter_is_skipped():
+    async def main():
+        limiter = PassThrough(1, 10)
+        loop = asyncio.get_running_loop()
+        await limiter.acquire()
+
+        first = asyncio.create_task(limiter.acquire())
+        second = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(1)
+        first.cancel()
+        await second
+        return loop.time()
+
+    assert run(main()) == 10
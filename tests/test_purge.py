@@ -0,0 +1,45 @@
+import asyncio
+
+from pycord.api import RateLimiter
+from pycord.channel import TextChannel
+from pycord.snowflake import Snowflake
+from pycord.state import State
+from pycord.testing import FakeREST
+
+DAY = 24 * 60 * 60
+
+
+def test_purge_partitions_by_age():
+    bulk_delete = ('POST', '/channels/{channel_id}/messages/bulk-delete')
+    delete = ('DELETE', '/channels/{channel_id}/messages/{message_id}')
+    rest = FakeREST(
+        global_limit=500,
+        buckets={bulk_delete: ('bulk-delete', 5, 1), delete: ('deletes', 50, 1)},
+    )
+    channel = rest.add_channel(rest.add_guild(channels=0)['id'])
+    old = [rest.add_message(channel['id'], 'old', age=20 * DAY) for _ in range(10)]
+    kept = rest.add_message(channel['id'], 'keep', age=DAY)
+    young = [rest.add_message(channel['id'], str(idx)) for idx in range(250)]
+
+    async def main():
+        async with rest:
+            state = State(http_base_url=rest.url, rate_limiter=RateLimiter(500))
+            state.bot_init('token', clustered=False)
+            text = TextChannel(channel, state)
+            history = text.history(None, after=Snowflake(old[-1]['id']))
+            assert [message.content async for message in history][-2:] == ['0', 'keep']
+            deleted = await text.purge(
+                None, check=lambda message: message.content != 'keep'
+            )
+            await state.http.close_session()
+            await state.connection_pool.close()
+            return deleted
+
+    deleted = asyncio.run(main())
+    assert len(deleted) == 260
+    assert [str(message.id) for message in deleted] == [
+        message['id'] for message in reversed(old + young)
+    ]
+    assert list(rest.messages[channel['id']]) == [kept['id']]
+    # 100, 100, 50 young messages and 10 old ones
+    assert rest.statuses[204] == 13
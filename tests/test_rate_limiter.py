@@ -0,0 +1,390 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from pycord import HTTPClient, Route
+from pycord.api.execution import (
+    Bucket,
+    CircuitBreaker,
+    RateLimitCoordinator,
+    RateLimiter,
+    SharedRateLimiter,
+    breaker as breaker_module,
+    shared,
+)
+from pycord.errors import CircuitOpen, DeadlineExceeded
+from pycord.snowflake import Snowflake
+
+LIMIT = 5
+RESET_AFTER = 0.2
+
+
+class Server:
+    """A Discord API stand-in with one fixed-window bucket per route and guild."""
+
+    def __init__(self) -> None:
+        self.windows: dict[str, tuple[float, int]] = {}
+        self.requests = 0
+        self.rate_limited = 0
+        self.max_in_window = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        key = f'{request.method} {request.match_info["guild_id"]}'
+        now = time.monotonic()
+        reset_at, used = self.windows.get(key, (0, 0))
+
+        if now >= reset_at:
+            reset_at, used = now + RESET_AFTER, 0
+
+        headers = {
+            'X-RateLimit-Bucket': 'abcd',
+            'X-RateLimit-Limit': str(LIMIT),
+            'X-RateLimit-Reset-After': f'{reset_at - now:.3f}',
+        }
+
+        if used >= LIMIT:
+            self.rate_limited += 1
+            headers['X-RateLimit-Remaining'] = '0'
+            headers['X-RateLimit-Scope'] = 'user'
+            return web.json_response(
+                {'retry_after': reset_at - now, 'global': False},
+                status=429,
+                headers=headers,
+            )
+
+        used += 1
+        self.windows[key] = (reset_at, used)
+        self.max_in_window = max(self.max_in_window, used)
+        headers['X-RateLimit-Remaining'] = str(LIMIT - used)
+        return web.json_response({'id': str(self.requests)}, headers=headers)
+
+
+async def serve(server: Server) -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_route('*', '/guilds/{guild_id}/channels', server.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://127.0.0.1:{port}'
+
+
+def test_buckets_are_never_exhausted():
+    async def main() -> Server:
+        server = Server()
+        runner, url = await serve(server)
+        api = HTTPClient('token', base_url=url)
+
+        await asyncio.gather(
+            *(
+                api.request(
+                    'POST',
+                    Route('/guilds/{guild_id}/channels', guild_id=guild_id),
+                    {'name': 'rate-limit-test'},
+                )
+                for guild_id in (1, 2)
+                for _ in range(15)
+            )
+        )
+
+        await api.close_session()
+        await runner.cleanup()
+        return server
+
+    server = asyncio.run(main())
+    assert server.requests == 30
+    assert server.rate_limited == 0
+    assert server.max_in_window == LIMIT
+
+
+def test_bucket_state_survives_restarts(tmp_path):
+    path = tmp_path / 'rate-limits.json'
+    route = Route('/guilds/{guild_id}/channels', guild_id=Snowflake(1))
+
+    async def main() -> tuple[Server, int]:
+        server = Server()
+        runner, url = await serve(server)
+
+        old = HTTPClient('token', base_url=url)
+        for _ in range(LIMIT):
+            await old.request('POST', route, {'name': 'rate-limit-test'})
+        old._rate_limiter.save(path)
+        await old.close_session()
+
+        # a fresh process would have sent one request to find out about the bucket
+        new = HTTPClient('token', base_url=url)
+        assert new._rate_limiter.restore(path) == 1
+        await asyncio.gather(
+            *(new.request('POST', route, {'name': 'restarted'}) for _ in range(3))
+        )
+        await new.close_session()
+
+        await asyncio.sleep(RESET_AFTER)
+        expired = HTTPClient('token', base_url=url)._rate_limiter.restore(path)
+        await runner.cleanup()
+        return server, expired
+
+    server, expired = asyncio.run(main())
+    assert server.requests == LIMIT + 3
+    assert server.rate_limited == 0
+    assert expired == 0
+
+
+def test_tokens_are_not_exported():
+    webhook = Route(
+        '/webhooks/{webhook_id}/{webhook_token}', webhook_id=1, webhook_token='secret'
+    )
+    channel = Route('/channels/{channel_id}/messages', channel_id=Snowflake(2))
+
+    async def main() -> dict:
+        limiter = RateLimiter()
+        for route in (webhook, channel):
+            bucket = await limiter.acquire('POST', route)
+            limiter.update(
+                'POST',
+                route,
+                bucket,
+                {
+                    'X-RateLimit-Limit': '5',
+                    'X-RateLimit-Remaining': '4',
+                    'X-RateLimit-Reset-After': '10',
+                    'X-RateLimit-Bucket': route.path,
+                },
+            )
+        return limiter.export()
+
+    state = asyncio.run(main())
+    assert [bucket['major_parameters'] for bucket in state['buckets']] == [
+        [None, 2, None, None, None]
+    ]
+    assert 'secret' not in str(state)
+
+
+def test_processes_share_buckets_through_coordinator(tmp_path):
+    path = str(tmp_path / 'rate-limits.sock')
+
+    async def main() -> Server:
+        server = Server()
+        runner, url = await serve(server)
+
+        async with RateLimitCoordinator(path):
+            # each client stands in for a separate process sharing the token
+            clients = [
+                HTTPClient('token', base_url=url, rate_limiter=SharedRateLimiter(path))
+                for _ in range(3)
+            ]
+            await asyncio.gather(
+                *(
+                    api.request(
+                        'POST',
+                        Route('/guilds/{guild_id}/channels', guild_id=1),
+                        {'name': 'rate-limit-test'},
+                    )
+                    for api in clients
+                    for _ in range(6)
+                )
+            )
+
+            for api in clients:
+                api._rate_limiter.close()
+                await api.close_session()
+
+        await runner.cleanup()
+        return server
+
+    server = asyncio.run(main())
+    assert server.requests == 18
+    assert server.rate_limited == 0
+
+
+def test_coordinator_outlives_bad_clients(tmp_path, caplog):
+    path = str(tmp_path / 'rate-limits.sock')
+    route = Route('/guilds/{guild_id}/channels', guild_id=1)
+
+    async def main() -> Server:
+        server = Server()
+        runner, url = await serve(server)
+        # nothing's serving yet, so requests are rate limited locally
+        api = HTTPClient('token', base_url=url, rate_limiter=SharedRateLimiter(path))
+        await asyncio.gather(
+            *(api.request('POST', route, {'name': 'local'}) for _ in range(LIMIT + 1))
+        )
+
+        async with RateLimitCoordinator(path):
+            reader, writer = await asyncio.open_unix_connection(path)
+            # an update for a request the coordinator doesn't know about
+            shared._send(writer, ['update', 7, 'POST', route.path, [None] * 5, {}])
+            shared._send(writer, ['acquire', 8, 'POST', route.path, [None] * 5, 0])
+            acquired = await asyncio.wait_for(shared._receive(reader), 5)
+            assert acquired == ['acquired', 8]
+            writer.close()
+
+        api._rate_limiter.close()
+        await api.close_session()
+        await runner.cleanup()
+        return server
+
+    server = asyncio.run(main())
+    assert server.requests == LIMIT + 1
+    assert server.rate_limited == 0
+    assert 'rate limiting locally' in caplog.text
+
+
+def test_priorities_go_first_and_deadlines_expire():
+    async def main() -> None:
+        bucket = Bucket()
+        bucket.update(
+            {
+                'X-RateLimit-Limit': '1',
+                'X-RateLimit-Remaining': '0',
+                'X-RateLimit-Reset-After': '0.05',
+            }
+        )
+        order = []
+
+        async def request(name: str, priority: int = 0) -> None:
+            await bucket.acquire(priority)
+            order.append(name)
+            bucket.update(
+                {
+                    'X-RateLimit-Limit': '1',
+                    'X-RateLimit-Remaining': '0',
+                    'X-RateLimit-Reset-After': '0.05',
+                }
+            )
+
+        tasks = [asyncio.create_task(request(f'job {n}')) for n in range(2)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(request('interaction', 100)))
+
+        loop = asyncio.get_running_loop()
+        with pytest.raises(DeadlineExceeded):
+            # the bucket only resets after the deadline
+            await bucket.acquire(100, deadline=loop.time() + 0.01)
+
+        await asyncio.gather(*tasks)
+        assert order == ['interaction', 'job 0', 'job 1']
+
+        with pytest.raises(DeadlineExceeded):
+            # ahead of it in the queue for longer than it can wait
+            await asyncio.gather(
+                request('job 2'),
+                bucket.acquire(deadline=loop.time() + 0.06),
+            )
+        assert bucket.pending == 0
+
+    asyncio.run(main())
+
+
+def test_unrelated_routes_are_not_equal():
+    assert Route('/guilds/{guild_id}', guild_id=1) == Route(
+        '/guilds/{guild_id}', guild_id=1
+    )
+    assert Route('/guilds/{guild_id}', guild_id=1) != Route(
+        '/guilds/{guild_id}', guild_id=2
+    )
+    assert Route('/users/@me') != Route('/gateway/bot')
+    assert len({Route('/users/@me'), Route('/users/@me')}) == 1
+
+
+def test_snowflake_and_int_routes_share_a_bucket():
+    path = '/channels/{channel_id}/messages'
+    routes = [
+        Route(path, channel_id=Snowflake(123456789012345678)),
+        Route(path, channel_id=123456789012345678),
+        Route(path, channel_id='123456789012345678'),
+    ]
+    assert len(set(routes)) == 1
+
+    async def main() -> None:
+        limiter = RateLimiter()
+        buckets = {id(limiter.get_bucket('POST', route)) for route in routes}
+        assert len(buckets) == 1
+
+    asyncio.run(main())
+
+
+def test_circuit_breaker_sheds_by_priority():
+    breaker = CircuitBreaker(shed_threshold=2, open_threshold=3)
+    route = Route('/users/@me')
+
+    breaker.record('GET', route, 429, 'shared')
+    breaker.record('GET', route, 401)
+    breaker.record('GET', route, 429, 'user')
+    assert breaker.state == 'shedding'
+
+    with pytest.raises(CircuitOpen):
+        breaker.check('GET', route, priority=-1)
+    breaker.check('GET', route)
+
+    breaker.record('GET', route, 403)
+    assert breaker.state == 'open'
+
+    with pytest.raises(CircuitOpen):
+        breaker.check('GET', route)
+    breaker.check('GET', route, priority=1)
+
+
+def test_circuit_breaker_fails_broken_routes():
+    breaker = CircuitBreaker(route_failures=2)
+    broken = Route('/channels/{channel_id}/messages', channel_id=1)
+    other = Route('/channels/{channel_id}/messages', channel_id=2)
+
+    breaker.record('GET', broken, 404)
+    breaker.check('GET', broken)
+    breaker.record('GET', broken, 404)
+
+    with pytest.raises(CircuitOpen):
+        breaker.check('GET', broken)
+    breaker.check('GET', other)
+    assert breaker.failing_routes == [('GET', broken.path, broken.major_parameters)]
+    # other methods are limited separately
+    breaker.check('POST', broken)
+
+    breaker.record('GET', broken, 200)
+    breaker.check('GET', broken)
+
+    # a message being gone says nothing about the channel's other messages
+    message = Route(
+        '/channels/{channel_id}/messages/{message_id}', channel_id=1, message_id=3
+    )
+    breaker.record('DELETE', message, 404)
+    breaker.record('DELETE', message, 404)
+    breaker.check('DELETE', message)
+    assert breaker.failing_routes == []
+
+
+def test_circuit_breaker_probes_one_request_at_a_time(monkeypatch):
+    now = 0.0
+    monkeypatch.setattr(breaker_module, 'monotonic', lambda: now)
+    breaker = CircuitBreaker(route_failures=1, route_cooldown=10)
+    broken = Route('/channels/{channel_id}/messages', channel_id=1)
+
+    breaker.record('GET', broken, 404)
+    with pytest.raises(CircuitOpen):
+        breaker.check('GET', broken)
+
+    # half open, only one request may see whether it still fails
+    now = 11.0
+    breaker.check('GET', broken)
+    with pytest.raises(CircuitOpen):
+        breaker.check('GET', broken)
+
+    # which it does, so the route is failed for another cooldown
+    breaker.record('GET', broken, 404)
+    now = 15.0
+    with pytest.raises(CircuitOpen):
+        breaker.check('GET', broken)
+
+    # a probe without a response lets another one through
+    now = 22.0
+    breaker.check('GET', broken)
+    breaker.release('GET', broken)
+    breaker.check('GET', broken)
+    breaker.record('GET', broken, 200)
+    breaker.check('GET', broken)
+    breaker.check('GET', broken)
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from aiohttp import ClientResponse, web
+
+from pycord import HTTPClient, RequestCache, Route
+from pycord.errors import NotFound
+
+
+async def serve(counts: dict[str, int]) -> tuple[web.AppRunner, str]:
+    async def guild(request: web.Request) -> web.Response:
+        guild_id = request.match_info['guild_id']
+        counts[guild_id] = counts.get(guild_id, 0) + 1
+        # give concurrent requests time to pile up behind this one
+        await asyncio.sleep(0.05)
+
+        if guild_id == '404':
+            return web.json_response(
+                {'message': 'Unknown Guild', 'code': 10004}, status=404
+            )
+        return web.json_response({'id': guild_id, 'name': str(counts[guild_id])})
+
+    app = web.Application()
+    app.router.add_route('*', '/guilds/{guild_id}', guild)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://127.0.0.1:{port}'
+
+
+def test_gets_are_coalesced_and_cached():
+    async def main() -> None:
+        counts = {}
+        runner, url = await serve(counts)
+        cache = RequestCache(ttl=60)
+        api = HTTPClient('token', base_url=url, cache=cache)
+        route = Route('/guilds/{guild_id}', guild_id=1)
+
+        responses = await asyncio.gather(
+            *(api.request('GET', route) for _ in range(10))
+        )
+        assert counts['1'] == 1
+        assert all(response is responses[0] for response in responses)
+        assert cache.metrics == {'hits': 0, 'misses': 1, 'coalesced': 9, 'size': 1}
+
+        assert (await api.request('GET', route))['name'] == '1'
+        assert cache.hits == 1
+
+        cache.dispatched('GUILD_UPDATE', {'id': '1'})
+        assert (await api.request('GET', route))['name'] == '2'
+
+        await api.request('PATCH', route, {'name': 'renamed'})
+        assert (await api.request('GET', route))['name'] == '4'
+        assert counts['1'] == 4
+
+        await api.close_session()
+        await runner.cleanup()
+
+    asyncio.run(main())
+
+
+def test_not_found_is_cached():
+    async def main() -> None:
+        counts = {}
+        runner, url = await serve(counts)
+        api = HTTPClient('token', base_url=url, cache=RequestCache())
+        route = Route('/guilds/{guild_id}', guild_id=404)
+
+        errors = []
+        for _ in range(3):
+            with pytest.raises(NotFound) as info:
+                await api.request('GET', route)
+            errors.append(info.value)
+
+        assert counts['404'] == 1
+        # every hit raises a new error, which doesn't hold on to the response
+        assert len({id(error) for error in errors}) == 3
+        assert {str(error) for error in errors} == {
+            '404 Not Found (code: 10004): Unknown Guild'
+        }
+        assert not isinstance(errors[-1]._response, ClientResponse)
+
+        await api.close_session()
+        await runner.cleanup()
+
+    asyncio.run(main())
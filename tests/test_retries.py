@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+from aiohttp import ServerDisconnectedError, web
+
+from pycord import HTTPClient, Route
+from pycord.api.execution import RetryPolicy
+from pycord.errors import HTTPException, InternalError
+
+
+class FlakyServer:
+    """Fails the first ``failures`` requests to each path, then succeeds."""
+
+    def __init__(self, failures: int, status: int | str | None) -> None:
+        self.failures = failures
+        # None drops the connection instead of responding,
+        # 'truncated' drops it partway through the body
+        self.status = status
+        self.requests: dict[str, int] = {}
+
+    async def handle(self, request: web.Request) -> web.Response:
+        count = self.requests[request.path] = self.requests.get(request.path, 0) + 1
+
+        if count > self.failures:
+            return web.json_response({'id': '1'})
+        elif self.status == 'truncated':
+            # the headers arrive, but the body is cut off
+            response = web.StreamResponse(headers={'Content-Length': '100'})
+            await response.prepare(request)
+            await response.write(b'{"id": ')
+            request.transport.close()
+            return response
+        elif self.status is None:
+            # the response never makes it
+            request.transport.close()
+            return web.Response(status=500)
+        elif self.status == 429:
+            return web.json_response(
+                {'message': 'You are being rate limited.', 'retry_after': 0.01},
+                status=429,
+                headers={'X-RateLimit-Scope': 'user'},
+            )
+        return web.json_response({'message': 'Bad Gateway'}, status=self.status)
+
+
+async def serve(server: FlakyServer) -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_route('*', '/channels/{channel_id}', server.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://127.0.0.1:{port}'
+
+
+def run(server: FlakyServer, policy: RetryPolicy, requests):
+    async def main():
+        runner, url = await serve(server)
+        api = HTTPClient('token', base_url=url, retry_policy=policy)
+
+        try:
+            return await requests(api)
+        finally:
+            await api.close_session()
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+def channel(id: int) -> Route:
+    return Route('/channels/{channel_id}', channel_id=id)
+
+
+@pytest.mark.parametrize('status', [502, 503, None, 'truncated'])
+def test_idempotent_requests_are_retried(status):
+    server = FlakyServer(2, status)
+    policy = RetryPolicy(base=0.01)
+    retried = []
+    policy.add_hook(
+        lambda method, route, attempt, reason, delay: retried.append(attempt)
+    )
+
+    assert run(server, policy, lambda api: api.request('GET', channel(1))) == {
+        'id': '1'
+    }
+    assert server.requests == {'/channels/1': 3}
+    if status is not None:
+        # aiohttp itself retries once when a reused connection was dropped
+        assert retried == [0, 1]
+
+
+@pytest.mark.parametrize(
+    'status, error', [(502, InternalError), (None, ServerDisconnectedError)]
+)
+def test_unsafe_requests_are_not_retried(status, error):
+    server = FlakyServer(1, status)
+
+    with pytest.raises(error):
+        run(server, RetryPolicy(base=0.01), lambda api: api.request('POST', channel(1)))
+    assert server.requests == {'/channels/1': 1}
+
+
+def test_rate_limited_requests_raise_once_exhausted():
+    server = FlakyServer(10, 429)
+
+    with pytest.raises(HTTPException) as info:
+        run(
+            server, RetryPolicy(attempts=3), lambda api: api.request('POST', channel(1))
+        )
+    assert info.value.status == 429
+    assert server.requests == {'/channels/1': 3}
+
+
+def test_retries_stay_within_budget():
+    server = FlakyServer(1, 503)
+    policy = RetryPolicy(base=0.01, budget=0, min_retries=1)
+
+    async def requests(api: HTTPClient) -> None:
+        await api.request('GET', channel(1))
+        with pytest.raises(InternalError):
+            await api.request('GET', channel(2))
+
+    run(server, policy, requests)
+    assert policy.metrics == {'retries': 1, 'exhausted': 0, 'over_budget': 1}
+
+
+def test_failing_retry_hooks_are_logged(caplog):
+    server = FlakyServer(1, 503)
+    policy = RetryPolicy(base=0.01)
+
+    def hook(method, route, attempt, reason, delay) -> None:
+        raise RuntimeError('broken hook')
+
+    policy.add_hook(hook)
+
+    assert run(server, policy, lambda api: api.request('GET', channel(1))) == {
+        'id': '1'
+    }
+    assert server.requests == {'/channels/1': 2}
+    assert 'retry hook' in caplog.text
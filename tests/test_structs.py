@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+import pytest
+
+msgspec = pytest.importorskip('msgspec')
+
+from pycord.member import Member
+from pycord.message import Message
+from pycord.state import State
+from pycord.types.structs import decode_payload, decode_response
+
+USER = {'id': '2', 'username': 'pycord', 'discriminator': '0', 'avatar': None}
+MESSAGE = {
+    'id': '1',
+    'channel_id': '3',
+    'author': USER,
+    'content': 'hi',
+    'timestamp': '2023-01-01T00:00:00+00:00',
+    'edited_timestamp': None,
+    'tts': False,
+    'mention_everyone': False,
+    'mentions': [{**USER, 'member': {'roles': []}}],
+    'mention_roles': [],
+    'attachments': [],
+    'embeds': [],
+    'pinned': False,
+    'type': 0,
+}
+
+
+def dispatch(t: str, d: dict) -> str:
+    return json.dumps({'op': 0, 's': 1, 't': t, 'd': d})
+
+
+def test_models_build_from_structs():
+    async def main() -> None:
+        state = State()
+        payload = decode_payload(dispatch('MESSAGE_CREATE', MESSAGE))
+        assert payload['s'] == 1
+        assert isinstance(payload['d'], msgspec.Struct)
+
+        typed = Message(payload['d'], state)
+        untyped = Message(MESSAGE, state)
+        for attr in ('id', 'channel_id', 'content', 'timestamp', 'nonce', 'flags'):
+            assert getattr(typed, attr) == getattr(untyped, attr)
+        assert typed.author.name == 'pycord'
+        assert [user.id for user in typed.mentions] == [2]
+
+    asyncio.run(main())
+
+
+def test_struct_mapping_interface():
+    member = decode_response(
+        'GET',
+        '/guilds/{guild_id}/members/{user_id}',
+        json.dumps({'user': USER, 'roles': ['4'], 'joined_at': None}).encode(),
+    )
+    assert member['roles'] == ['4']
+    assert 'nick' not in member
+    assert member.get('nick', 'default') == 'default'
+    assert member.keys() == ['user', 'roles', 'joined_at']
+    with pytest.raises(KeyError):
+        member['deaf']
+
+
+def test_unexpected_payloads_fall_back_to_dicts():
+    payload = decode_payload(dispatch('MESSAGE_CREATE', {**MESSAGE, 'tts': 'yes'}))
+    assert payload['d']['tts'] == 'yes'
+    assert isinstance(payload['d'], dict)
+
+    # events without a Struct are decoded as usual
+    assert decode_payload(dispatch('TYPING_START', {'user_id': '2'}))['d'] == {
+        'user_id': '2'
+    }